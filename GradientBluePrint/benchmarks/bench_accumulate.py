@@ -0,0 +1,54 @@
+"""
+Peak memory (tracemalloc) of one batch gradient of a compiled `Neuron` MLP:
+the per-sample (n_params, batch) gradients reduced afterwards, against the
+reduction accumulated in place into `flat_parameters().grad`. The program's own
+(n_nodes, batch) work buffers are allocated before measuring. What remains on the
+accumulated side are the temporaries of single instructions (a dot product's
+(fan_in, batch) slices), which do not depend on the number of parameters.
+
+    python benchmarks/bench_accumulate.py
+"""
+import sys, os
+import time
+import tracemalloc
+import numpy as np
+
+# Add the GradientBluePrint directory to the Python path
+sys.path.append(os.path.dirname(sys.path[0]))
+
+from src.NNS.Neural_Network import MLP
+from src.Cost_functions.Cost_functions import CostFunction
+
+
+def measure(step):
+    tracemalloc.start()
+    start = time.perf_counter()
+    step()
+    elapsed = time.perf_counter() - start
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return peak / 2 ** 20, elapsed
+
+
+if __name__ == '__main__':
+    model = MLP(16, [32, 32, 1], ['tanh', 'tanh', 'linear'])
+    flat = model.flat_parameters()
+    program = model.compile()
+    cost = CostFunction.sse
+    print(f"16-32-32-1 MLP, {len(flat)} parameters")
+    for batch in [256, 1024, 4096]:
+        rng = np.random.default_rng(0)
+        X, y = rng.normal(size=(batch, 16)), rng.normal(size=batch)
+        program.per_sample_gradients(X, y, cost, 'sum', out=flat.grad)  # allocate the work buffers
+
+        def per_sample():
+            _, gradients = program.per_sample_gradients(X, y, cost)
+            flat.grad += gradients.sum(axis=0)
+
+        def accumulated():
+            program.per_sample_gradients(X, y, cost, 'sum', out=flat.grad)
+
+        m_list, t_list = measure(per_sample)
+        m_flat, t_flat = measure(accumulated)
+        print(f"batch {batch:5d}: per-sample {m_list:8.2f} MiB {t_list * 1e3:7.1f} ms -> "
+              f"accumulated {m_flat:8.2f} MiB {t_flat * 1e3:7.1f} ms")
@@ -0,0 +1,48 @@
+"""
+Cold start of a saved model: `pickle` against `load(path, mmap=False)` (reads the
+parameter array) and `load(path, mmap=True)` (maps it; pages are read on first use).
+Dense MLPs of growing size, and a `Neuron` MLP, whose load is dominated by building
+one `Parameter` per weight.
+
+    python benchmarks/bench_checkpoint.py
+"""
+import sys, os
+import time
+import pickle
+import tempfile
+
+# Add the GradientBluePrint directory to the Python path
+sys.path.append(os.path.dirname(sys.path[0]))
+
+from src.NNS.Neural_Network import MLP
+
+
+def timed(function, repeat=3):
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+if __name__ == '__main__':
+    with tempfile.TemporaryDirectory() as directory:
+        path, pickled = os.path.join(directory, 'model.ckpt'), os.path.join(directory, 'model.pkl')
+        for input_dim, sizes, dense in [(256, [512, 512, 10], True), (1024, [2048, 2048, 10], True),
+                                        (2048, [4096, 4096, 10], True), (16, [64, 64, 1], False)]:
+            model = MLP(input_dim, sizes, ['relu', 'relu', 'linear'], dense=dense)
+            model.save(path)
+            with open(pickled, 'wb') as f:
+                pickle.dump(model, f)
+
+            def from_pickle():
+                with open(pickled, 'rb') as f:
+                    return pickle.load(f)
+
+            t_pickle = timed(from_pickle)
+            t_read = timed(lambda: MLP.load(path, mmap=False))
+            t_mmap = timed(lambda: MLP.load(path, mmap=True))
+            n = len(model.flat_parameters())
+            print(f"{'Dense' if dense else 'Neuron'} MLP {input_dim}-{'-'.join(map(str, sizes))} ({n:9d} parameters): "
+                  f"pickle {t_pickle * 1e3:8.2f} ms, load {t_read * 1e3:8.2f} ms, load(mmap) {t_mmap * 1e3:8.2f} ms")
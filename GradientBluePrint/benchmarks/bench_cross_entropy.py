@@ -0,0 +1,62 @@
+"""
+Categorical cross-entropy over k classes: softmax followed by -log(t_label) against
+the fused `Activations.softmax_cross_entropy` node.
+
+The fused node computes log-sum-exp directly from the logits (no overflow for large
+logits, no softmax node in the graph) and back-propagates in one O(k) loop. The last
+column is the per-sample gradients of a batch for multiclass LogisticRegression
+through the compiled program, which hands the logits to the fused loss instead of
+back-propagating through its k softmax outputs.
+
+    python benchmarks/bench_cross_entropy.py
+"""
+import sys, os
+import time
+import numpy as np
+
+# Add the GradientBluePrint directory to the Python path
+sys.path.append(os.path.dirname(sys.path[0]))
+
+from src.Gradient.Gradient import Variable
+from src.NNS.Activation_Functions import Activations
+from src.Regression.Logistic_Regression import LogisticRegression
+
+
+def unfused(values, label):
+    logits = [Variable(v) for v in values]
+    loss = -Activations.softmax(logits)[label].log()
+    loss.backward()
+    return loss.data
+
+
+def fused(values, label):
+    logits = [Variable(v) for v in values]
+    loss = Activations.softmax_cross_entropy(logits, label)
+    loss.backward()
+    return loss.data
+
+
+def timed(f, *args, repeat=20):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        f(*args)
+    return (time.perf_counter() - start) / repeat
+
+
+def compiled_epoch(k, batch=256, input_dim=16):
+    model = LogisticRegression(input_dim, multiclass=True, k=k)
+    X = np.random.randn(batch, input_dim)
+    y = np.random.randint(0, k, size=(batch, 1))
+    model.compile()
+    start = time.perf_counter()
+    model.compile().per_sample_gradients(X, y, model.costFunction, reduction='mean')
+    return time.perf_counter() - start
+
+
+if __name__ == '__main__':
+    for k in [10, 100, 1000]:
+        values = np.random.randn(k) * 5
+        assert np.isclose(unfused(values, 3), fused(values, 3))
+        t_unfused, t_fused = timed(unfused, values, 3), timed(fused, values, 3)
+        print(f"k={k:5d}: softmax + log {t_unfused * 1e3:9.3f} ms, fused {t_fused * 1e3:7.3f} ms "
+              f"({t_unfused / t_fused:6.1f}x), compiled batch of 256 {compiled_epoch(k) * 1e3:8.1f} ms")
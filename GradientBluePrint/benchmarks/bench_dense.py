@@ -0,0 +1,50 @@
+"""
+One training step (forward, squared-error gradient, backward, update) of a 3-layer
+MLP built from `Layer`s of scalar `Neuron`s (through its compiled program) and from
+array-backed `Dense` layers (one matmul per layer and direction).
+
+    python benchmarks/bench_dense.py
+"""
+import sys, os
+import time
+import numpy as np
+
+# Add the GradientBluePrint directory to the Python path
+sys.path.append(os.path.dirname(sys.path[0]))
+
+from src.NNS.Neural_Network import MLP
+from src.Cost_functions.Cost_functions import CostFunction
+from src.Optimizers.optimizers import Optimizers
+
+
+def neuron_step(model, X, y, learning_rate=0.001):
+    program = model.compile()
+    _, gradients = program.per_sample_gradients(X, y, CostFunction.sse, reduction='sum')
+    for gradient, p in zip(gradients, model.parameters()):
+        p.grad += gradient
+    Optimizers.batch_gradient_descent(model.parameters(), learning_rate, len(X))
+
+
+def dense_step(model, X, y, learning_rate=0.001):
+    output = model.forward(X)
+    model.backward(2 * (output - y.reshape(output.shape)))
+    Optimizers.batch_gradient_descent(model.parameters(), learning_rate, len(X))
+
+
+def timed(step, model, X, y, repeat=5):
+    step(model, X, y)  # compiles the Neuron MLP once
+    start = time.perf_counter()
+    for _ in range(repeat):
+        step(model, X, y)
+    return (time.perf_counter() - start) / repeat
+
+
+if __name__ == '__main__':
+    for hidden, batch in [(32, 256), (64, 1024)]:
+        X, y = np.random.randn(batch, 16), np.random.randn(batch)
+        sizes, activations = [hidden, hidden, 1], ['tanh', 'tanh', 'linear']
+        t_neuron = timed(neuron_step, MLP(16, sizes, activations), X, y)
+        t_dense = timed(dense_step, MLP(16, sizes, activations, dense=True), X, y)
+        print(f"16-{hidden}-{hidden}-1, batch {batch:5d}: Neuron MLP {t_neuron * 1e3:9.2f} ms/step, "
+              f"Dense MLP {t_dense * 1e3:7.2f} ms/step ({t_neuron / t_dense:6.1f}x), "
+              f"{batch / t_dense:12.0f} samples/sec")
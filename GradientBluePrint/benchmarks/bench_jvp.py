@@ -0,0 +1,58 @@
+"""
+Full input Jacobian of an n-input, m-output MLP: forward mode against reverse mode.
+
+Reverse mode builds the graph once and runs one backward() per output (m passes);
+forward mode runs one `jvp` per input (n sweeps), or a single sweep carrying all n
+directions as an array tangent. Forward mode wins when n is small and m is large.
+
+    python benchmarks/bench_jvp.py
+"""
+import sys, os
+import time
+import numpy as np
+
+# Add the GradientBluePrint directory to the Python path
+sys.path.append(os.path.dirname(sys.path[0]))
+
+from src.Gradient.Gradient import Variable
+from src.Gradient.Dual import jvp
+from src.NNS.Neural_Network import MLP
+
+
+def reverse_jacobian(model, x):
+    inputs = [Variable(x_i) for x_i in x]
+    outputs = model(inputs)
+    rows = []
+    for output in outputs:
+        for v in inputs:
+            v.grad = 0.0
+        output.backward(retain_graph=True)
+        rows.append([v.grad for v in inputs])
+    return np.array(rows)
+
+
+def forward_jacobian(model, x):
+    return np.array([jvp(model, x, e)[1] for e in np.eye(len(x))]).T
+
+
+def vector_forward_jacobian(model, x):
+    return jvp(model, x, np.eye(len(x)))[1]
+
+
+def timed(f, repeat=3):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        result = f()
+    return (time.perf_counter() - start) / repeat, result
+
+
+if __name__ == '__main__':
+    for n, m in [(2, 256), (8, 64), (64, 8), (256, 2)]:
+        model = MLP(n, [64, m], ['tanh', 'linear'])
+        x = np.random.randn(n)
+        t_reverse, J = timed(lambda: reverse_jacobian(model, x))
+        t_forward, J_forward = timed(lambda: forward_jacobian(model, x))
+        t_vector, J_vector = timed(lambda: vector_forward_jacobian(model, x))
+        assert np.allclose(J, J_forward) and np.allclose(J, J_vector)
+        print(f"n={n:3d} m={m:3d}: reverse {t_reverse * 1e3:8.1f} ms ({m} backward), "
+              f"forward {t_forward * 1e3:8.1f} ms ({n} jvp), one vector sweep {t_vector * 1e3:8.1f} ms")
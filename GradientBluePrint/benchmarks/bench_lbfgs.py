@@ -0,0 +1,70 @@
+"""
+Full-batch L-BFGS against SGD and Adam on the smooth convex objectives of
+LinearRegression (ill-conditioned features) and LogisticRegression: iterations
+(epochs), loss evaluations and wall-clock time until the objective is within
+1e-6 of its optimum, which L-BFGS itself defines by running to convergence first.
+
+    python benchmarks/bench_lbfgs.py
+"""
+import sys, os
+import io
+import time
+import contextlib
+import numpy as np
+
+# Add the GradientBluePrint directory to the Python path
+sys.path.append(os.path.dirname(sys.path[0]))
+
+from src.Regression.Linear_Regression import LinearRegression
+from src.Regression.Logistic_Regression import LogisticRegression
+from src.Optimizers.optimizers import OPTIMIZERS, LBFGS
+
+MAX_EPOCHS = 3000
+TOLERANCE = 1e-6
+
+
+def objective(model, X, y, regularization_term):
+    """Full-batch mean loss plus the regularization term, as fit minimizes it."""
+    losses, _ = model.compile().per_sample_gradients(X, y, model.costFunction, 'mean')
+    return losses.mean() + model.regularizer(regularization_term).data
+
+
+def run(build, X, y, name, learning_rate, regularization_term, target):
+    """Epochs and seconds until objective <= target, one fit epoch at a time."""
+    np.random.seed(0)
+    model = build()
+    optimizer = OPTIMIZERS[name.lower()](model.flat_parameters(), learning_rate)
+    elapsed = 0.0
+    for epoch in range(1, MAX_EPOCHS + 1):
+        start = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()):
+            model.fit(X, y, learning_rate=learning_rate, num_epochs=1, batch_size=None,
+                      optimizer=optimizer, regularization_term=regularization_term)
+        elapsed += time.perf_counter() - start
+        if objective(model, X, y, regularization_term) <= target:
+            return epoch, elapsed, optimizer
+        if isinstance(optimizer, LBFGS) and optimizer.converged:
+            break
+    return None, elapsed, optimizer
+
+
+if __name__ == '__main__':
+    rng = np.random.default_rng(0)
+    X = rng.normal(size=(4096, 16)) * np.logspace(-1, 0, 16)  # feature scales from 0.1 to 1
+    y_linear = X @ rng.normal(size=16) + rng.normal(size=4096)
+    y_logistic = (X @ rng.normal(size=16) / 5 + rng.normal(size=4096) > 0).astype(int).reshape(-1, 1)
+    problems = [('LinearRegression', lambda: LinearRegression(16), y_linear, {'SGD': 0.3, 'Adam': 0.05}),
+                ('LogisticRegression', lambda: LogisticRegression(16), y_logistic, {'SGD': 1.0, 'Adam': 0.05})]
+
+    for title, build, y, rates in problems:
+        np.random.seed(0)
+        reference = build()
+        with contextlib.redirect_stdout(io.StringIO()):
+            reference.fit(X, y, num_epochs=500, optimizer='lbfgs', regularization_term=0.05)
+        target = objective(reference, X, y, 0.05) + TOLERANCE
+        print(f"{title}, objective within {TOLERANCE:g} of {target - TOLERANCE:.6f}")
+        for name, learning_rate in [('LBFGS', 1.0)] + list(rates.items()):
+            epochs, seconds, optimizer = run(build, X, y, name, learning_rate, 0.05, target)
+            evaluations = f", {optimizer.evaluations:4d} evaluations" if isinstance(optimizer, LBFGS) else ""
+            reached = f"{epochs:5d} epochs" if epochs else f"not reached in {MAX_EPOCHS} epochs"
+            print(f"  {name:6s} lr={learning_rate:<6g} {reached}{evaluations}, {seconds:7.3f} s")
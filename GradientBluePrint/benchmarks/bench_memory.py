@@ -0,0 +1,55 @@
+"""
+Peak resident memory across training epochs with the cyclic garbage collector off.
+
+Variables carry no closures and Tensor closures never reference their own output,
+so every epoch's graph is reclaimed by reference counting alone as soon as the
+next epoch rebinds `loss`; backward(retain_graph=False) additionally unlinks the
+graph while `loss` is still alive. Peak RSS should stay flat after the first epoch.
+
+    python benchmarks/bench_memory.py
+"""
+import sys, os
+import gc
+import resource
+import numpy as np
+
+# Add the GradientBluePrint directory to the Python path
+sys.path.append(os.path.dirname(sys.path[0]))
+
+from src.Gradient.Gradient import Variable
+from src.Gradient.Tensor import Tensor
+from src.NNS.Neural_Network import MLP
+from src.Optimizers.optimizers import Optimizers
+
+
+def peak_rss_mib():
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024  # ru_maxrss is in KiB on Linux
+
+
+def scalar_epochs(epochs=5, batch=64):
+    """Scalar Variable graph: the whole batch loss as one graph per epoch."""
+    model = MLP(8, [16, 1], ['tanh', 'linear'])
+    X, y = np.random.randn(batch, 8), np.random.randn(batch)
+    for epoch in range(epochs):
+        loss = sum(((model(list(x)) - y_) ** 2 for x, y_ in zip(X, y)), Variable(0))
+        loss.backward()
+        Optimizers.batch_gradient_descent(model.parameters(), 0.01, batch)
+        yield epoch, loss.data
+
+
+def tensor_epochs(epochs=5, batch=4096):
+    """Batched Tensor graph: a few large arrays per epoch."""
+    model = MLP(64, [128, 128, 1], ['tanh', 'tanh', 'linear'])
+    X, y = Tensor(np.random.randn(batch, 64)), np.random.randn(batch)
+    for epoch in range(epochs):
+        loss = ((model(X) - y) ** 2).mean()
+        loss.backward()
+        Optimizers.batch_gradient_descent(model.parameters(), 0.001, 1)
+        yield epoch, float(loss.data)
+
+
+if __name__ == '__main__':
+    gc.disable()
+    for name, epochs in [('scalar graph', scalar_epochs), ('tensor graph', tensor_epochs)]:
+        for epoch, loss in epochs():
+            print(f"{name}: epoch {epoch}, loss {loss:10.4f}, peak RSS {peak_rss_mib():8.1f} MiB")
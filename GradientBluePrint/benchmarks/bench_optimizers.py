@@ -0,0 +1,78 @@
+"""
+Wall-clock time and epochs until the training loss reaches a target, for SGD and
+the stateful optimizers, on an ill-conditioned linear regression and on a `Dense`
+MLP. Every optimizer starts from the same initial parameters.
+
+    python benchmarks/bench_optimizers.py
+"""
+import sys, os
+import io
+import time
+import contextlib
+import numpy as np
+
+# Add the GradientBluePrint directory to the Python path
+sys.path.append(os.path.dirname(sys.path[0]))
+
+from src.Regression.Linear_Regression import LinearRegression
+from src.NNS.Neural_Network import MLP
+from src.Optimizers.optimizers import OPTIMIZERS
+
+MAX_EPOCHS = 2000
+
+
+def time_to_target(model, loss, epoch, target):
+    """Runs one epoch at a time until loss() <= target; returns (seconds, epochs)."""
+    elapsed = 0.0
+    for epochs in range(1, MAX_EPOCHS + 1):
+        start = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()):
+            epoch()
+        elapsed += time.perf_counter() - start
+        if loss() <= target:
+            return elapsed, epochs
+    return float('inf'), MAX_EPOCHS
+
+
+def linear(X, y, name, learning_rate, target):
+    np.random.seed(0)
+    model = LinearRegression(X.shape[1])
+    # an instance keeps its state across the one-epoch fit calls
+    optimizer = OPTIMIZERS[name.lower()](model.flat_parameters(), learning_rate)
+    return time_to_target(
+        model, lambda: np.mean((model.predict(X) - y) ** 2),
+        lambda: model.fit(X, y, learning_rate=learning_rate, num_epochs=1, batch_size=256,
+                          optimizer=optimizer, regularization_term=0.0),
+        target)
+
+
+def mlp(X, y, name, learning_rate, target):
+    np.random.seed(0)
+    model = MLP(X.shape[1], [64, 64, 1], ['tanh', 'tanh', 'linear'], dense=True)
+    optimizer = OPTIMIZERS[name.lower()](model.flat_parameters(), learning_rate)
+    return time_to_target(
+        model, lambda: np.mean((model.predict(X) - y) ** 2),
+        lambda: model.fit(X, y, optimizer=optimizer, batch_size=64, epochs=1, learning_rate=learning_rate),
+        target)
+
+
+if __name__ == '__main__':
+    rng = np.random.default_rng(0)
+    X = rng.normal(size=(4096, 16)) * np.logspace(0, 1.5, 16)  # feature scales from 1 to ~30
+    y = X @ rng.normal(size=16) + 1.0
+    Xs = rng.normal(size=(2048, 8))
+    ys = np.sin(Xs[:, 0]) + Xs[:, 1] * Xs[:, 2]
+
+    runs = [('LinearRegression, MSE <= 1e-2', linear, X, y, 1e-2,
+             {'SGD': 1e-3, 'Momentum': 1e-4, 'Nesterov': 1e-4, 'AdaGrad': 1.0, 'RMSProp': 0.01, 'Adam': 0.2}),
+            ('Dense MLP 8-64-64-1, MSE <= 0.1', mlp, Xs, ys, 0.1,
+             {'SGD': 1e-3, 'Momentum': 1e-3, 'Nesterov': 1e-3, 'AdaGrad': 0.05, 'RMSProp': 1e-3, 'Adam': 1e-3})]
+    for title, run, X_, y_, target, rates in runs:
+        print(title)
+        baseline = None
+        for name, learning_rate in rates.items():
+            seconds, epochs = run(X_, y_, name, learning_rate, target)
+            baseline = seconds if baseline is None else baseline
+            reached = f"{seconds:7.3f} s, {epochs:4d} epochs" if np.isfinite(seconds) else f"not reached in {epochs} epochs"
+            speedup = f"({baseline / seconds:5.1f}x SGD)" if np.isfinite(seconds) and np.isfinite(baseline) else ""
+            print(f"  {name:8s} lr={learning_rate:<7g} {reached} {speedup}")
@@ -0,0 +1,40 @@
+"""
+Data-parallel scaling of fit: one epoch of full-batch steps of a `Neuron` MLP
+(through its compiled program) and of a `Dense` MLP, with 1 (no worker processes)
+up to os.cpu_count() workers. Speedups above 1 need as many free cores as workers.
+Every setting trains a fresh model with the same seed, and only the epochs are
+timed (the per-epoch throughput `fit` reports), not the start-up of the worker
+processes and the copy of the data to shared memory.
+
+    python benchmarks/bench_parallel.py
+"""
+import sys, os
+import io
+import random
+import contextlib
+import numpy as np
+
+# Add the GradientBluePrint directory to the Python path
+sys.path.append(os.path.dirname(sys.path[0]))
+
+from src.NNS.Neural_Network import MLP
+
+
+def epoch_time(dense, X, y, n_jobs, batch_size, epochs=3):
+    random.seed(0)  # the Neuron weights
+    np.random.seed(0)  # the Dense weights and the shuffling
+    model = MLP(16, [64, 64, 1], ['tanh', 'tanh', 'linear'], dense=dense)
+    with contextlib.redirect_stdout(io.StringIO()):
+        history = model.fit(X, y, batch_size=batch_size, epochs=epochs, learning_rate=1e-4, n_jobs=n_jobs)
+    return np.mean([len(X) / epoch['samples_per_sec'] for epoch in history])
+
+
+if __name__ == '__main__':
+    cores = os.cpu_count() or 1
+    jobs = sorted({1, 2, 4, 8, 16, 32, cores} & set(range(1, cores + 1))) if cores > 1 else [1, 2]
+    for dense, n_samples, batch_size in [(False, 8192, 2048), (True, 65536, 16384)]:
+        X, y = np.random.randn(n_samples, 16), np.random.randn(n_samples)
+        times = {n_jobs: epoch_time(dense, X, y, n_jobs, batch_size) for n_jobs in jobs}
+        print(f"{'Dense' if dense else 'Neuron'} MLP 16-64-64-1, {n_samples} samples, batch {batch_size}:")
+        for n_jobs, t in times.items():
+            print(f"    n_jobs={n_jobs:2d}: {t * 1e3:9.1f} ms/epoch, speedup {times[1] / t:5.2f}x")
@@ -0,0 +1,37 @@
+"""
+One optimizer step (update, then zero the gradients) of a `Neuron` MLP over its
+list of `Variable` parameters and over its flat `ParameterBuffer`, plus the global
+gradient norm computed both ways.
+
+    python benchmarks/bench_parameters.py
+"""
+import sys, os
+import time
+import numpy as np
+
+# Add the GradientBluePrint directory to the Python path
+sys.path.append(os.path.dirname(sys.path[0]))
+
+from src.NNS.Neural_Network import MLP
+from src.Optimizers.optimizers import Optimizers
+
+
+def timed(step, repeat=20):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        step()
+    return (time.perf_counter() - start) / repeat
+
+
+if __name__ == '__main__':
+    for hidden in [16, 64, 128]:
+        sizes, activations = [hidden, hidden, 1], ['tanh', 'tanh', 'linear']
+        parameters = MLP(16, sizes, activations).parameters()
+        flat = MLP(16, sizes, activations).flat_parameters()
+        t_list = timed(lambda: Optimizers.batch_gradient_descent(parameters, 0.01, 32))
+        t_flat = timed(lambda: Optimizers.batch_gradient_descent(flat, 0.01, 32))
+        n_list = timed(lambda: np.sqrt(sum(p.grad ** 2 for p in parameters)))
+        n_flat = timed(flat.grad_norm)
+        print(f"16-{hidden}-{hidden}-1 ({len(flat):6d} parameters): step {t_list * 1e3:8.3f} ms -> "
+              f"{t_flat * 1e3:6.3f} ms ({t_list / t_flat:6.1f}x), norm {n_list * 1e3:8.3f} ms -> "
+              f"{n_flat * 1e3:6.3f} ms ({n_list / n_flat:6.1f}x)")
@@ -0,0 +1,44 @@
+"""
+Scoring a large input with predict: the former per-row list of Variables against
+the chunked predict into one ndarray, serially and on a pool of threads or
+processes, with the peak memory traced by tracemalloc.
+
+    python benchmarks/bench_predict.py
+"""
+import sys, os
+import time
+import tracemalloc
+import numpy as np
+
+# Add the GradientBluePrint directory to the Python path
+sys.path.append(os.path.dirname(sys.path[0]))
+
+from src.Gradient.Gradient import Variable
+from src.NNS.Neural_Network import MLP
+
+
+def measure(function):
+    tracemalloc.start()
+    start = time.perf_counter()
+    function()
+    elapsed = time.perf_counter() - start
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return elapsed, peak
+
+
+if __name__ == '__main__':
+    n_samples = 100_000
+    X = np.random.randn(n_samples, 16)
+    model = MLP(16, [32, 1], ['tanh', 'linear'])
+    model.compile()
+    n_jobs = max(os.cpu_count() or 1, 2)
+    cases = [('list of Variables', lambda: [Variable(v) for v in model.compile()(X)]),
+             ('chunk 8192', lambda: model.predict(X)),
+             (f'chunk 8192, {n_jobs} threads', lambda: model.predict(X, n_jobs=n_jobs)),
+             (f'chunk 8192, {n_jobs} processes',
+              lambda: model.predict(X, n_jobs=n_jobs, backend='process'))]
+    print(f"Neuron MLP 16-32-1, {n_samples} rows:")
+    for name, function in cases:
+        elapsed, peak = measure(function)
+        print(f"    {name:28s} {elapsed * 1e3:9.1f} ms, peak {peak / 2 ** 20:8.1f} MiB")
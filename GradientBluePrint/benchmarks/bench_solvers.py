@@ -0,0 +1,73 @@
+"""
+LinearRegression fitted by SGD against the closed-form solvers, then the
+streaming solvers on a memory-mapped file: wall-clock time, objective reached
+and peak traced memory (tracemalloc), which stays O(chunk_size * d + d^2)
+whatever the number of rows. The streamed weights differ from the true ones by the
+ridge shrinkage of REG.
+
+    python benchmarks/bench_solvers.py
+"""
+import sys, os
+import io
+import time
+import tempfile
+import contextlib
+import tracemalloc
+import numpy as np
+
+# Add the GradientBluePrint directory to the Python path
+sys.path.append(os.path.dirname(sys.path[0]))
+
+from src.Regression.Linear_Regression import LinearRegression
+from src.Regression.Solvers import solve_ridge, SOLVERS
+
+REG = 0.05
+
+
+def objective(w, b, X, y):
+    return np.mean((X @ w + b - y) ** 2) + REG / (2 * len(w)) * w @ w
+
+
+if __name__ == '__main__':
+    rng = np.random.default_rng(0)
+    n, d = 100_000, 32
+    X = rng.normal(size=(n, d))
+    y = X @ rng.normal(size=d) + 1.0 + 0.1 * rng.normal(size=n)
+
+    print(f"in memory, {n} x {d}")
+    np.random.seed(0)
+    model = LinearRegression(d)
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        model.fit(X, y, learning_rate=0.05, num_epochs=300, batch_size=1024, regularization_term=REG)
+    elapsed = time.perf_counter() - start
+    data = model.flat_parameters().data
+    print(f"  SGD, 300 epochs  {elapsed:7.3f} s  objective {objective(data[:-1], data[-1], X, y):.10f}")
+    for solver in SOLVERS:
+        start = time.perf_counter()
+        w, b = solve_ridge(X, y, REG, solver)
+        print(f"  {solver:16s} {time.perf_counter() - start:7.3f} s  objective {objective(w, b, X, y):.10f}")
+
+    rows = 1_000_000
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'X.dat')
+        stored = np.memmap(path, dtype=float, mode='w+', shape=(rows, d))
+        targets = np.empty(rows)
+        for lo in range(0, rows, n):
+            block = rng.normal(size=(n, d))
+            stored[lo:lo + n] = block
+            targets[lo:lo + n] = block @ np.arange(d) + 1.0
+        stored.flush()
+        del stored
+        X = np.memmap(path, dtype=float, mode='r', shape=(rows, d))
+        print(f"streamed from a {X.nbytes / 2 ** 20:.0f} MiB memory-mapped file, {rows} x {d}")
+        for solver in SOLVERS:
+            tracemalloc.start()
+            start = time.perf_counter()
+            w, b = solve_ridge(X, targets, REG, solver, chunk_size=8192)
+            elapsed = time.perf_counter() - start
+            peak = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+            print(f"  {solver:16s} {elapsed:7.3f} s  peak {peak / 2 ** 20:6.1f} MiB  "
+                  f"max |w - w_true| {np.abs(w - np.arange(d)).max():.2e}")
+        del X
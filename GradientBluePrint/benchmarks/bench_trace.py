@@ -0,0 +1,41 @@
+"""
+Per-sample gradients of a LinearRegression batch: dynamic Variable graphs versus the
+compiled `Program`.
+
+    python benchmarks/bench_trace.py
+"""
+import sys, os
+import time
+import numpy as np
+
+# Add the GradientBluePrint directory to the Python path
+sys.path.append(os.path.dirname(sys.path[0]))
+
+from src.Regression.Linear_Regression import LinearRegression
+
+
+def dynamic(model, X, y):
+    for x, y_ in zip(X, y):
+        loss = model.costFunction(model(x), y_)
+        loss.backward()
+        for p in model.parameters():
+            p.grad = 0.0
+
+
+def compiled(model, X, y):
+    program = model.compile()
+    program.forward(X)
+    _, upstream = program.loss(model.costFunction, y)
+    program.backward(upstream)
+
+
+if __name__ == '__main__':
+    for batch, d in [(256, 10), (1024, 100)]:
+        X = np.random.randn(batch, d)
+        y = X.sum(axis=1)
+        model = LinearRegression(d)
+        for name, step in [('dynamic', dynamic), ('compiled', compiled)]:
+            start = time.perf_counter()
+            step(model, X, y)
+            elapsed = time.perf_counter() - start
+            print(f"batch={batch:5d} d={d:4d} {name:>9}: {elapsed * 1e3:9.1f} ms")
@@ -0,0 +1,143 @@
+"""
+Node size and throughput of the scalar `Variable` engine.
+
+Compares the slotted, op-code dispatched `Variable` with a reference node built the
+way `Variable` used to be: a per-instance `__dict__`, a `set` of children and a new
+`_backward` closure for every operation. The last rows compare the chained weighted
+sum with the fused `Variable.dot` node the models now use.
+
+    python benchmarks/bench_variable.py
+"""
+import sys, os
+import time
+import tracemalloc
+
+# Add the GradientBluePrint directory to the Python path
+sys.path.append(os.path.dirname(sys.path[0]))
+
+from src.Gradient.Gradient import Variable, no_grad
+
+
+class ClosureVariable:
+    """The previous closure-based node, kept here only as a baseline."""
+
+    def __init__(self, data, _children=(), _op='', label=''):
+        self.data = data
+        self._prev = set(_children)
+        self._op = _op
+        self.label = label
+        self.grad = 0.0
+        self._backward = lambda: None
+
+    def __add__(self, other):
+        other = other if isinstance(other, ClosureVariable) else ClosureVariable(other)
+        output = ClosureVariable(self.data + other.data, (self, other), '+')
+
+        def _backward():
+            self.grad += 1.0 * output.grad
+            other.grad += 1.0 * output.grad
+
+        output._backward = _backward
+        return output
+
+    def __mul__(self, other):
+        other = other if isinstance(other, ClosureVariable) else ClosureVariable(other)
+        output = ClosureVariable(self.data * other.data, (self, other), '*')
+
+        def _backward():
+            self.grad += other.data * output.grad
+            other.grad += self.data * output.grad
+
+        output._backward = _backward
+        return output
+
+    def backward(self):
+        topological_graph, visited_nodes = [], set()
+
+        def build_topological_graph(v):
+            if v not in visited_nodes:
+                visited_nodes.add(v)
+                for child in v._prev:
+                    build_topological_graph(child)
+                topological_graph.append(v)
+
+        build_topological_graph(self)
+        self.grad = 1.0
+        for node in reversed(topological_graph):
+            node._backward()
+
+
+def neuron(cls, d):
+    """Builds sum(w_i * x_i, b), the graph every model __call__ produces."""
+    w = [cls(0.01 * i) for i in range(d)]
+    return sum((w_i * float(i) for i, w_i in enumerate(w)), cls(0.0))
+
+
+def fused_neuron(d):
+    """Builds Variable.dot(w, x) + b: two nodes whatever d is."""
+    w = [Variable(0.01 * i) for i in range(d)]
+    return Variable.dot(w, [float(i) for i in range(d)]) + Variable(0.0)
+
+
+def bytes_per_node(cls, d=200):
+    tracemalloc.start()
+    start = tracemalloc.take_snapshot()
+    out = neuron(cls, d)
+    used = sum(stat.size_diff for stat in tracemalloc.take_snapshot().compare_to(start, 'filename'))
+    tracemalloc.stop()
+    nodes = 4 * d + 1  # weight, constant, product and sum per feature, plus the bias
+    del out
+    return used / nodes
+
+
+def ops_per_second(cls, d=200, repeat=200):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        neuron(cls, d).backward()
+    elapsed = time.perf_counter() - start
+    return repeat * 2 * d / elapsed  # one * and one + per feature
+
+
+def fused_throughput(d=200, repeat=200):
+    """Weighted sums per second, forward + backward, chained vs fused."""
+    results = {}
+    for name, build in [('chained sum', lambda: neuron(Variable, d)), ('Variable.dot', lambda: fused_neuron(d))]:
+        tracemalloc.start()
+        graph = build()
+        graph_bytes = tracemalloc.get_traced_memory()[0]
+        tracemalloc.stop()
+        del graph
+        start = time.perf_counter()
+        for _ in range(repeat):
+            build().backward()
+        results[name] = (repeat / (time.perf_counter() - start), graph_bytes)
+    return results
+
+
+def inference(d=200, repeat=200):
+    """Forward-only MLP-style neuron with and without graph recording."""
+    results = {}
+    for name, context in [('recording', None), ('no_grad', no_grad)]:
+        tracemalloc.start()
+        start = time.perf_counter()
+        for _ in range(repeat):
+            if context is None:
+                out = neuron(Variable, d)
+            else:
+                with context():
+                    out = neuron(Variable, d)
+        elapsed = time.perf_counter() - start
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+        results[name] = (elapsed / repeat, peak)
+    return results
+
+
+if __name__ == '__main__':
+    for name, cls in [('closure Variable', ClosureVariable), ('slotted Variable', Variable)]:
+        print(f"{name:>18}: {bytes_per_node(cls):7.1f} bytes/node, "
+              f"{ops_per_second(cls) / 1e3:8.1f} k ops/sec (forward + backward)")
+    for name, (rate, graph_bytes) in fused_throughput().items():
+        print(f"{name:>18}: {rate:9.1f} neurons/sec (d=200, forward + backward), graph {graph_bytes / 1024:7.1f} KiB")
+    for name, (latency, peak) in inference().items():
+        print(f"{name:>18}: {latency * 1e6:9.1f} us/forward, peak {peak / 1024:8.1f} KiB")
@@ -5,7 +5,50 @@ parent_directory = sys.path[0]  # Assumes the script is in the parent directory
 # Add the parent directory to the Python path
 sys.path.append(os.path.dirname(os.path.dirname(parent_directory)))
 
-from src.Gradient.Gradient import Variable
+from src.Gradient.Gradient import Variable, Op, is_grad_enabled
+from src.Gradient.Tensor import Tensor
+from src.NNS.Activation_Functions import Activations
+from src.NNS import Activation_Kernels as kernels
+import numpy as np
+
+
+def _batch_loss(y_hat, losses, gradient, reduction, sample_weight, op):
+    """
+    Wraps per-sample losses into one Tensor node. Its backward applies the
+    closed-form per-sample gradient `gradient` (same shape as y_hat) scaled by the
+    reduction and the sample weights, so no per-sample graph is ever built.
+    """
+    assert reduction in ('mean', 'sum', 'none'), "reduction must be 'mean', 'sum' or 'none'"
+    batch = losses.shape[0]
+    if sample_weight is None:
+        scale = np.ones(batch) / batch if reduction == 'mean' else None
+    else:
+        scale = np.asarray(sample_weight, dtype=float).reshape(batch)
+        if reduction == 'mean':
+            scale = scale / scale.sum()
+    weighted = losses if scale is None else losses * scale
+    data = weighted if reduction == 'none' else weighted.sum()
+    output = Tensor(data, _children=(y_hat, ), _op=op)
+
+    def _backward(grad):
+        g = grad if scale is None else scale * grad  # a scalar, or one value per sample
+        if np.ndim(g):
+            g = g.reshape((batch, ) + (1, ) * (gradient.ndim - 1))
+        y_hat.grad += gradient * g
+
+    if is_grad_enabled():
+        output._backward = _backward
+    return output
+
+
+def _targets(y, shape):
+    """Targets as a float array of the given shape: (batch,) from (batch,) or (batch, 1), or (batch, n_outputs)."""
+    return np.asarray(y, dtype=float).reshape(shape)
+
+
+def _per_sample(losses):
+    """Elementwise losses of a (batch, n_outputs) prediction summed over the outputs."""
+    return losses if losses.ndim == 1 else losses.sum(axis=tuple(range(1, losses.ndim)))
 
 class CostFunction:
     @staticmethod
@@ -18,8 +61,37 @@ class CostFunction:
     
     @staticmethod    
     def categorical_cross_entropy_loss(y_hat, y):
+        """
+        Computes -log(y_hat[label]). When y_hat is the output of `Activations.softmax`
+        the loss is computed from its logits with the fused
+        `Activations.softmax_cross_entropy` node, which is stable for large logits
+        and back-propagates in O(k); the softmax nodes are left out of the graph.
+
+        Parameters:
+            y_hat (list): Predicted class probabilities.
+            y (array_like): True label, as [class_index].
+
+        Returns:
+            Variable: Cross-entropy loss.
+        """
+        if all(p._code == Op.SOFTMAX and p._arg[1] is y_hat[0]._arg[1] for p in y_hat):
+            return Activations.softmax_cross_entropy(y_hat[0]._children, y[0])
         loss = y_hat[y[0]].log()
         return -loss
+
+    @staticmethod
+    def softmax_cross_entropy_loss(logits, y):
+        """
+        Computes the categorical cross-entropy of softmax(logits) in one fused node.
+
+        Parameters:
+            logits (list): Unnormalized class scores.
+            y (array_like): True label, as [class_index].
+
+        Returns:
+            Variable: Cross-entropy loss.
+        """
+        return Activations.softmax_cross_entropy(logits, y[0])
     
     @staticmethod
     def sse(y_hat, y):
@@ -33,11 +105,149 @@ class CostFunction:
 
         Parameters:
             y_hat (Variable): Predicted output.
-            y_true (Variable): True labels.
+            y_true (float): True label, -1 or 1.
+
+        Returns:
+            Hinge loss, max(0, 1 - y_true * y_hat).
+        """
+        # max(0, 1 - y * y_hat): the relu node also zeroes the (sub)gradient where the margin is met
+        loss = Activations.relu(1 - y_hat * y_true)
+        return loss
+    # ------------------------- batch versions -------------------------
+    # Each takes the predictions of a whole batch as a Tensor (or array) and returns a
+    # single Tensor node holding the mean, the sum or ('none') every sample's loss.
+    # The backward pass is one vectorized closed-form expression.
+
+    @staticmethod
+    def batch_log_loss(y_hat, y, reduction='mean', sample_weight=None):
+        """
+        Computes the binary cross-entropy of a batch.
+
+        Parameters:
+            y_hat (Tensor): Predicted probabilities, shape (batch,) or (batch, n_outputs).
+            y (array_like): Labels, 0 or 1, shaped like y_hat; (batch, 1) for (batch,).
+            reduction (str, optional): 'mean', 'sum' or 'none'. Defaults to 'mean'.
+            sample_weight (array_like, optional): One weight per sample.
 
         Returns:
-            Hinge loss.
+            Tensor: The reduced loss.
         """
-        loss =  (1 - y_hat) * y_true
-        loss.data = loss.data if loss.data >= 0 else 0
-        return loss
\ No newline at end of file
+        y_hat = y_hat if isinstance(y_hat, Tensor) else Tensor(y_hat)
+        p = y_hat.data
+        positive = _targets(y, p.shape) == 1
+        q = np.where(positive, p, 1 - p)  # probability given to the true label
+        return _batch_loss(y_hat, _per_sample(-np.log(q)), np.where(positive, -1 / q, 1 / q),
+                           reduction, sample_weight, 'log loss')
+
+    @staticmethod
+    def batch_sse(y_hat, y, reduction='mean', sample_weight=None):
+        """
+        Computes the squared errors of a batch.
+
+        Parameters:
+            y_hat (Tensor): Predictions, shape (batch,) or (batch, n_outputs); a sample's
+                loss is the sum of its squared errors.
+            y (array_like): Targets, shaped like y_hat; (batch, 1) for (batch,).
+            reduction (str, optional): 'mean', 'sum' or 'none'. Defaults to 'mean'.
+            sample_weight (array_like, optional): One weight per sample.
+
+        Returns:
+            Tensor: The reduced loss.
+        """
+        y_hat = y_hat if isinstance(y_hat, Tensor) else Tensor(y_hat)
+        error = y_hat.data - _targets(y, y_hat.data.shape)
+        return _batch_loss(y_hat, _per_sample(error ** 2), 2 * error, reduction, sample_weight, 'sse')
+
+    @staticmethod
+    def batch_hinge_loss(y_hat, y, reduction='mean', sample_weight=None):
+        """
+        Computes the hinge loss max(0, 1 - y * y_hat) of a batch. The subgradient is
+        -y where the margin is violated and 0 elsewhere.
+
+        Parameters:
+            y_hat (Tensor): Decision values, shape (batch,) or (batch, n_outputs).
+            y (array_like): Labels, -1 or 1, shaped like y_hat; (batch, 1) for (batch,).
+            reduction (str, optional): 'mean', 'sum' or 'none'. Defaults to 'mean'.
+            sample_weight (array_like, optional): One weight per sample.
+
+        Returns:
+            Tensor: The reduced loss.
+        """
+        y_hat = y_hat if isinstance(y_hat, Tensor) else Tensor(y_hat)
+        y = _targets(y, y_hat.data.shape)
+        margin = 1 - y * y_hat.data
+        return _batch_loss(y_hat, _per_sample(np.maximum(margin, 0.0)), np.where(margin > 0, -y, 0.0),
+                           reduction, sample_weight, 'hinge')
+
+    @staticmethod
+    def batch_categorical_cross_entropy_loss(y_hat, y, reduction='mean', sample_weight=None):
+        """
+        Computes -log(y_hat[label]) for a batch of predicted class probabilities.
+
+        Parameters:
+            y_hat (Tensor): Probabilities, shape (batch, k).
+            y (array_like): Class indices, shape (batch,) or (batch, 1).
+            reduction (str, optional): 'mean', 'sum' or 'none'. Defaults to 'mean'.
+            sample_weight (array_like, optional): One weight per sample.
+
+        Returns:
+            Tensor: The reduced loss.
+        """
+        y_hat = y_hat if isinstance(y_hat, Tensor) else Tensor(y_hat)
+        rows = np.arange(y_hat.shape[0])
+        labels = _targets(y, len(rows)).astype(int)
+        p = y_hat.data[rows, labels]
+        gradient = np.zeros_like(y_hat.data)
+        gradient[rows, labels] = -1 / p
+        return _batch_loss(y_hat, -np.log(p), gradient, reduction, sample_weight, 'categorical cross entropy')
+
+    @staticmethod
+    def batch_softmax_cross_entropy_loss(logits, y, reduction='mean', sample_weight=None):
+        """
+        Computes the categorical cross-entropy of softmax(logits) for a batch with the
+        log-sum-exp trick. The gradient is softmax(logits) - onehot(label).
+
+        Parameters:
+            logits (Tensor): Unnormalized class scores, shape (batch, k).
+            y (array_like): Class indices, shape (batch,) or (batch, 1).
+            reduction (str, optional): 'mean', 'sum' or 'none'. Defaults to 'mean'.
+            sample_weight (array_like, optional): One weight per sample.
+
+        Returns:
+            Tensor: The reduced loss.
+        """
+        logits = logits if isinstance(logits, Tensor) else Tensor(logits)
+        z = logits.data
+        rows = np.arange(z.shape[0])
+        labels = _targets(y, len(rows)).astype(int)
+        shifted = z - z.max(axis=1, keepdims=True)
+        losses = np.log(np.exp(shifted).sum(axis=1)) - shifted[rows, labels]
+        gradient = kernels.softmax(z, axis=1)
+        gradient[rows, labels] -= 1
+        return _batch_loss(logits, losses, gradient, reduction, sample_weight, 'softmax cross entropy')
+
+    @staticmethod
+    def batched(cost_function, from_logits=False):
+        """
+        Looks up the batch version of a per-sample cost function.
+
+        Parameters:
+            cost_function (callable): A per-sample `CostFunction` method.
+            from_logits (bool, optional): The batch version will receive the logits
+                of a softmax rather than probabilities. Defaults to False.
+
+        Returns:
+            callable or None: The batch version, or None if there is none.
+        """
+        if from_logits:
+            return _FROM_LOGITS.get(cost_function)
+        return _BATCHED.get(cost_function)
+
+
+_BATCHED = {CostFunction.log_loss: CostFunction.batch_log_loss,
+            CostFunction.sse: CostFunction.batch_sse,
+            CostFunction.hinge_loss: CostFunction.batch_hinge_loss,
+            CostFunction.categorical_cross_entropy_loss: CostFunction.batch_categorical_cross_entropy_loss,
+            CostFunction.softmax_cross_entropy_loss: CostFunction.batch_softmax_cross_entropy_loss}
+_FROM_LOGITS = {CostFunction.categorical_cross_entropy_loss: CostFunction.batch_softmax_cross_entropy_loss,
+                CostFunction.softmax_cross_entropy_loss: CostFunction.batch_softmax_cross_entropy_loss}
@@ -0,0 +1,190 @@
+import sys, os
+import math
+import numpy as np
+
+# Get the parent directory
+parent_directory = sys.path[0]  # Assumes the script is in the parent directory
+
+# Add the parent directory to the Python path
+sys.path.append(os.path.dirname(os.path.dirname(parent_directory)))
+
+from src.Gradient.Gradient import Variable, no_grad
+
+
+def _split(value):
+    """(value, tangent) of a Dual, a Variable (a constant in forward mode) or a number."""
+    if isinstance(value, Dual):
+        return value.data, value.tangent
+    if isinstance(value, Variable):
+        return value.data, 0.0
+    return value, 0.0
+
+
+class Dual(Variable):
+    """
+    A dual number `data + tangent * eps` (with eps ** 2 == 0) for forward-mode
+    automatic differentiation. Each operation computes its value exactly like
+    `Variable` and pushes the tangent through the chain rule at the same time, so one
+    forward sweep gives the directional derivative of every output. No graph is
+    recorded.
+
+    `Dual` is a subclass of `Variable`, so it can be fed to any model or `Activations`
+    function: the model's `Variable` parameters act as constants (zero tangent), and
+    mixed expressions such as `w * x` or `Variable.dot(w, x)` evaluate in forward mode.
+
+    The tangent may be a float or an ndarray; an ndarray of k values carries k
+    directions through the same sweep.
+    """
+    __slots__ = ('tangent',)
+
+    def __init__(self, data, tangent=0.0, label=''):
+        """
+        Parameters:
+            data (float): Value.
+            tangent (float or ndarray, optional): Derivative of the value along the
+                chosen direction(s). Defaults to 0.0.
+            label (str, optional): Name of the value.
+        """
+        super().__init__(data, label=label)
+        self.tangent = tangent
+
+    def __add__(self, other):
+        b, tb = _split(other)
+        return Dual(self.data + b, self.tangent + tb)
+
+    def __radd__(self, other):
+        a, ta = _split(other)
+        return Dual(a + self.data, ta + self.tangent)
+
+    def __sub__(self, other):
+        b, tb = _split(other)
+        return Dual(self.data - b, self.tangent - tb)
+
+    def __rsub__(self, other):
+        a, ta = _split(other)
+        return Dual(a - self.data, ta - self.tangent)
+
+    def __mul__(self, other):
+        b, tb = _split(other)
+        return Dual(self.data * b, self.tangent * b + self.data * tb)
+
+    def __rmul__(self, other):
+        a, ta = _split(other)
+        return Dual(a * self.data, ta * self.data + a * self.tangent)
+
+    def __truediv__(self, other):
+        return self * _split_pow(other, -1)
+
+    def __rtruediv__(self, other):
+        return other * self ** -1
+
+    def __neg__(self):
+        return self * -1
+
+    def __pow__(self, other):
+        assert isinstance(other, (int, float)), "Only supporting int/float powers for now"
+        assert (self.data != 0.0 or (self.data ==0.0 and other > 0.0)), "0.0 can only be raised to a positive power"
+        return Dual(self.data ** other, other * self.data ** (other - 1) * self.tangent)
+
+    def exp(self):
+        t = math.exp(self.data)
+        return Dual(t, t * self.tangent)
+
+    def log(self):
+        return Dual(math.log(self.data), self.tangent / self.data)
+
+    def sigmoid(self):
+        n = self.data
+        t = 1 / (1 + math.exp(-n)) if n >= 0 else math.exp(n) / (1 + math.exp(n))
+        return Dual(t, t * (1 - t) * self.tangent)
+
+    def tanh(self):
+        t = math.tanh(self.data)
+        return Dual(t, (1 - t ** 2) * self.tangent)
+
+    def relu(self):
+        n = self.data
+        return Dual(n if n > 0 else 0, self.tangent * (n > 0))
+
+    def leaky_relu(self):
+        n = self.data
+        return Dual(n if n > 0 else 0.01 * n, self.tangent * (1.0 if n > 0 else 0.01))
+
+    @staticmethod
+    def softmax(values):
+        """Softmax of a list of Duals (and Variables / numbers), as a list of Duals."""
+        n, dn = zip(*map(_split, values))
+        m = max(n)
+        exp_n = [math.exp(x - m) for x in n]
+        sum_exp_n = sum(exp_n)
+        t = [x / sum_exp_n for x in exp_n]
+        mean_tangent = sum(t_j * dn_j for t_j, dn_j in zip(t, dn))
+        return [Dual(t_i, t_i * (dn_i - mean_tangent)) for t_i, dn_i in zip(t, dn)]
+
+    @staticmethod
+    def sum(terms):
+        data, tangent = 0.0, 0.0
+        for term in terms:
+            a, ta = _split(term)
+            data += a
+            tangent = tangent + ta
+        return Dual(data, tangent)
+
+    @staticmethod
+    def dot(weights, inputs):
+        data, tangent = 0.0, 0.0
+        for w, x in zip(weights, inputs):
+            a, ta = _split(w)
+            b, tb = _split(x)
+            data += a * b
+            tangent = tangent + ta * b + a * tb
+        return Dual(data, tangent)
+
+    def __repr__(self):
+        return f"Dual(data={self.data}, tangent={self.tangent})"
+
+
+def _split_pow(value, exponent):
+    """value ** exponent for a Dual, Variable or number, as a Dual or a number."""
+    if isinstance(value, Dual):
+        return value ** exponent
+    value = _split(value)[0]
+    assert (value!=0), "Division by 0 is undefined"
+    return value ** exponent
+
+
+def _unpack(output, shape):
+    """(values, tangents) of the output of a function evaluated on Duals."""
+    if isinstance(output, (list, tuple)):
+        pairs = [_unpack(o, shape) for o in output]
+        return np.array([p[0] for p in pairs]), np.array([p[1] for p in pairs])
+    value, tangent = _split(output)
+    return float(value), np.zeros(shape) + tangent if shape else float(tangent)
+
+
+def jvp(f, x, v):
+    """
+    Computes the Jacobian-vector product J_f(x) @ v with one forward sweep, where f
+    maps an array of inputs to a value or a list of values (e.g. a model's __call__).
+    Reverse mode needs one backward() per output to get the same information, so
+    this is the cheaper choice when there are fewer directions than outputs.
+
+    Parameters:
+        f (callable): Function of a (len(x),) object ndarray of Dual inputs, built
+            from Variable / Activations operations.
+        x (array_like): Point of evaluation, shape (n,).
+        v (array_like): Direction, shape (n,), or k directions as an (n, k) array.
+
+    Returns:
+        tuple: f(x) and J_f(x) @ v. A scalar f gives floats (an (k,) ndarray for
+            several directions), a list-valued f gives arrays of shape (m,) and
+            (m,) or (m, k).
+    """
+    x = np.asarray(x, dtype=float)
+    v = np.asarray(v, dtype=float)
+    assert v.shape[:1] == x.shape, "v must have one row per input"
+    with no_grad():
+        inputs = np.empty(len(x), dtype=object)  # an object array, so models may use x.T or x @ w
+        inputs[:] = [Dual(float(x_i), v_i if v.ndim > 1 else float(v_i)) for x_i, v_i in zip(x, v)]
+        output = f(inputs)
+    return _unpack(output, v.shape[1:])
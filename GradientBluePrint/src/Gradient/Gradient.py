@@ -6,65 +6,199 @@ parent_directory = sys.path[0]  # Assumes the script is in the parent directory
 sys.path.append(os.path.dirname(os.path.dirname(parent_directory)))
 
 from src.Helpers.DrawGraph import draw_dot
+from contextlib import ContextDecorator
+from enum import IntEnum
+import threading
+from operator import attrgetter
 import math
 
 
+class Op(IntEnum):
+    """
+    Op-codes for the operation that produced a Variable. A node stores its op-code
+    instead of a per-node `_backward` closure; the chain-rule step for each op-code
+    lives once in the `_BACKWARD` dispatch table below.
+    """
+    NONE = 0
+    ADD = 1
+    SUB = 2
+    MUL = 3
+    POW = 4
+    EXP = 5
+    LOG = 6
+    SIGMOID = 7
+    TANH = 8
+    RELU = 9
+    LEAKY_RELU = 10
+    SOFTMAX = 11
+    SUM = 12
+    DOT = 13
+    SOFTMAX_CROSS_ENTROPY = 14
+    FREED = 15  # an intermediate node whose graph was released by backward()
+
+
+_OP_SYMBOLS = {Op.NONE: '', Op.ADD: '+', Op.SUB: '-', Op.MUL: '*', Op.POW: '**', Op.EXP: 'exp', Op.LOG: 'log',
+               Op.SIGMOID: 'sigmoid', Op.TANH: 'tanh', Op.RELU: 'relu', Op.LEAKY_RELU: 'leaky relu',
+               Op.SOFTMAX: 'softmax', Op.SUM: 'sum', Op.DOT: 'dot',
+               Op.SOFTMAX_CROSS_ENTROPY: 'softmax cross entropy', Op.FREED: 'freed'}
+_OP_CODES = {symbol: code for code, symbol in _OP_SYMBOLS.items()}
+
+_grad_mode = threading.local()  # per thread: whether operations record the graph, see no_grad
+
+
+def is_grad_enabled():
+    """
+    Returns True when operations on Variables record the computational graph in the
+    calling thread.
+    """
+    return getattr(_grad_mode, 'enabled', True)
+
+
+class no_grad(ContextDecorator):
+    """
+    Context manager and decorator for inference. Inside it, every Variable (and
+    Tensor) operation, including the `Activations`, only computes its value: the
+    result has no children, no op and nothing to back-propagate, so no graph is
+    kept alive. The mode is per thread, so concurrent predicts do not switch
+    recording off for the other threads.
+
+    Example:
+        with no_grad():
+            y_hat = model(x)
+
+        @no_grad()
+        def predict(self, X): ...
+    """
+    _enabled = False
+
+    def _recreate_cm(self):
+        # a fresh instance per decorated call, so nested or concurrent calls keep their own state
+        return type(self)()
+
+    def __enter__(self):
+        self._previous = is_grad_enabled()
+        _grad_mode.enabled = self._enabled
+        return self
+
+    def __exit__(self, *exc):
+        _grad_mode.enabled = self._previous
+        return False
+
+
+class enable_grad(no_grad):
+    """
+    Re-enables graph recording inside a `no_grad` block, e.g. to trace a model.
+    """
+    _enabled = True
+
+
+def topological_sort(root, children=attrgetter('_children')):
+    """
+    Orders the graph ending at `root` so every node comes after all the nodes it
+    was computed from. The depth-first search keeps its own stack instead of
+    recursing, so graphs deeper than Python's recursion limit can be sorted.
+
+    Parameters:
+        root: Output node of the graph.
+        children (callable, optional): Returns the child nodes of a node.
+
+    Returns:
+        list: Nodes in topological order, `root` last.
+    """
+    topological_graph = []
+    visited_nodes = set()
+    stack = [(root, False)]
+    while stack:
+        node, expanded = stack.pop()
+        if expanded:
+            topological_graph.append(node)
+        elif node not in visited_nodes:
+            visited_nodes.add(node)
+            stack.append((node, True))
+            stack.extend((child, False) for child in children(node) if child not in visited_nodes)
+    return topological_graph
+
+
+def _subclass_override(name, values):
+    """
+    The static method `name` of a Variable subclass among `values` that redefines
+    it (e.g. `Dual.dot`), so fused ops evaluate in that subclass's mode; else None.
+    """
+    for value in values:
+        if type(value) is not Variable and isinstance(value, Variable):
+            method = getattr(type(value), name)
+            if method is not getattr(Variable, name):
+                return method
+    return None
+
+
 class Variable:
-    def __init__(self, data, _children=(), _op = '', label = ''):
+    __slots__ = ('data', 'grad', '_children', '_code', '_arg', 'label', '_tape')
+
+    def __init__(self, data, _children=(), _op=Op.NONE, label='', _arg=None):
         """
         @ data: float  # input data
-        @ _children: set, To keep track of all connections, basically to keep track of what variables are producing what Variables
-        @ _op: str, To keep track of mathematical expression of each operation
+        @ _children: tuple, To keep track of all connections, basically to keep track of what variables are producing what Variables
+        @ _op: Op (or its symbol), To keep track of mathematical expression of each operation
+        @ _arg: extra constant the op needs in the backward pass (the exponent of `**`, ...)
         """
-        
+
         self.data = data
-        self._prev = set(_children)
-        self._op = _op
+        if getattr(_grad_mode, 'enabled', True):
+            self._children = tuple(_children)
+            self._code = _op if isinstance(_op, Op) else _OP_CODES[_op]
+            self._arg = _arg
+        else:
+            # inside no_grad: a plain value, not connected to anything
+            self._children = ()
+            self._code = Op.NONE
+            self._arg = None
         self.label = label
         self.grad = 0.0 # derivative of the value with respect to an _childern
-        self._backward = lambda: None # this is responsible for the chain-rule value - a function that by default does nothing
-        
+        self._tape = None # cached topological order, see backward(cache_tape=True)
+
+    @property
+    def _prev(self):
+        """
+        The set of Variables this Variable was computed from.
+        """
+        return set(self._children)
+
+    @property
+    def _op(self):
+        """
+        The mathematical expression of the operation, as a string.
+        """
+        if self._code == Op.POW:
+            return f'**{self._arg}'
+        return _OP_SYMBOLS[self._code]
+
+    def _backward(self):
+        """
+        Applies the chain-rule step of this Variable's operation to its children.
+        """
+        _BACKWARD[self._code](self)
+
     def __add__(self, other):
         """
         To add two Variable objects
         """
-        other = other if isinstance(other, Variable) else Variable(other) 
-        output = Variable(self.data + other.data, _children=(self, other), _op = '+')
-
-        def _backward():
-            self.grad += 1.0 * output.grad
-            other.grad += 1.0 * output.grad
-            
-        output._backward = _backward
-        return output
+        other = other if isinstance(other, Variable) else Variable(other)
+        return Variable(self.data + other.data, (self, other), Op.ADD)
 
     def __sub__(self, other):
         """
         To subtract two Variable objects
         """
-        other = other if isinstance(other, Variable) else Variable(other) 
-        output = Variable(self.data - other.data, _children=(self, other), _op = '-')
-
-        def _backward():
-            self.grad += 1.0 * output.grad
-            other.grad += 1.0 * output.grad
-            
-        output._backward = _backward
-        return output
-        
+        other = other if isinstance(other, Variable) else Variable(other)
+        return Variable(self.data - other.data, (self, other), Op.SUB)
+
     def __mul__(self, other):
         """
         To multiply two Variable objects
         """
-        other = other if isinstance(other, Variable) else Variable(other) 
-        output = Variable(self.data * other.data, _children=(self, other), _op = '*')
-        
-        def _backward():
-            self.grad += other.data * output.grad
-            other.grad += self.data * output.grad
-            
-        output._backward = _backward
-        return output
+        other = other if isinstance(other, Variable) else Variable(other)
+        return Variable(self.data * other.data, (self, other), Op.MUL)
 
     def __pow__(self, other):
         """
@@ -72,61 +206,135 @@ class Variable:
         """
         assert isinstance(other, (int, float)), "Only supporting int/float powers for now"
         assert (self.data != 0.0 or (self.data ==0.0 and other > 0.0)), "0.0 can only be raised to a positive power"
-        output = Variable(self.data ** other, _children=(self,), _op=f'**{other}')
+        return Variable(self.data ** other, (self,), Op.POW, _arg=other)
+
+    @staticmethod
+    def sum(terms):
+        """
+        To add any number of Variables (and numbers) in a single node. Unlike the
+        builtin `sum`, which chains one `+` node per term, the result has one node
+        whatever the number of terms, and its backward pass is a single O(n) loop.
+
+        Parameters:
+            terms (iterable): Variables and/or numbers.
+
+        Returns:
+            Variable: The sum.
+        """
+        terms = list(terms)
+        override = _subclass_override('sum', terms)
+        if override is not None:
+            return override(terms)
+        children, constant = [], 0.0
+        for term in terms:
+            if isinstance(term, Variable):
+                children.append(term)
+            else:
+                constant += term
+        data = constant
+        for child in children:
+            data += child.data
+        return Variable(data, children, Op.SUM, _arg=constant)
+
+    @staticmethod
+    def dot(weights, inputs):
+        """
+        To compute sum(w_i * x_i) in a single node, e.g. the weighted sum of a neuron.
+        Numeric inputs are kept as constants of the node instead of being wrapped in
+        Variables, so the graph grows by one node regardless of the length.
 
-        def _backward():
-            self.grad += other * (self.data ** (other - 1)) * output.grad
-            
-        output._backward = _backward
-        return output            
-            
+        Parameters:
+            weights (iterable): Variables (or numbers).
+            inputs (iterable): Numbers or Variables, the same length as weights.
+
+        Returns:
+            Variable: The dot product.
+        """
+        weights, inputs = list(weights), list(inputs)
+        assert len(weights) == len(inputs), "weights and inputs must have the same length"
+        override = _subclass_override('dot', weights + inputs)
+        if override is not None:
+            return override(weights, inputs)
+        if not all(isinstance(w, Variable) for w in weights):
+            weights, inputs = inputs, weights
+        weights = [w if isinstance(w, Variable) else Variable(w) for w in weights]
+        data = 0.0
+        if any(isinstance(x, Variable) for x in inputs):
+            # both sides receive gradients: the children are the weights followed by the inputs
+            inputs = [x if isinstance(x, Variable) else Variable(x) for x in inputs]
+            for w, x in zip(weights, inputs):
+                data += w.data * x.data
+            return Variable(data, weights + inputs, Op.DOT)
+        for w, x in zip(weights, inputs):
+            data += w.data * x
+        return Variable(data, weights, Op.DOT, _arg=tuple(inputs))
 
     def exp(self):
         """
         To calculate the exp of a variable.
         """
-        x = self.data
-        output = Variable(math.exp(x), _children=(self, ), _op='exp')
+        return Variable(math.exp(self.data), (self, ), Op.EXP)
 
-        def _backward():
-            self.grad += output.grad * output.data
-        output._backward = _backward
-        return output
-      
     def log(self):
         """
         To calculate the log of a variable.
         """
-        x = self.data
-        output = Variable(math.log(x), _children=(self, ), _op='log')
-        
-        def _backward():
-            self.grad += output.grad * (x ** -1)
-        output._backward = _backward
-        return output
-
+        return Variable(math.log(self.data), (self, ), Op.LOG)
 
-    def backward(self):
+    def backward(self, cache_tape=False, retain_graph=False, create_graph=False):
         """
         To perform a backward propagation, this function will
-        fist convert the network to a topological graph then
+        fist convert the network to a topological graph (the tape) then
         in order will perform a back propagation.
+
+        Parameters:
+            cache_tape (bool, optional): Keep the tape on this Variable so later
+                backward() calls on the same graph only replay the chain-rule
+                steps instead of sorting the graph again. Implies retain_graph.
+                Defaults to False.
+            retain_graph (bool, optional): Keep the graph for another backward pass.
+                By default the child links of every intermediate node are dropped once
+                the gradients are propagated, so the graph is freed as soon as the
+                caller lets go of its nodes; a later backward() that reaches one of
+                them raises a RuntimeError. Defaults to False.
+            create_graph (bool, optional): Compute the gradients with Variable
+                operations, so every `.grad` is itself a Variable with a graph that
+                can be differentiated again (see `hvp`). Implies retain_graph.
+                Defaults to False.
         """
-        topological_graph = []
-        visited_nodes = set()
-        
-        def build_topological_graph(v):
-            if v not in visited_nodes:
-                visited_nodes.add(v)
-                for child in v._prev:
-                    build_topological_graph(child)
-                topological_graph.append(v)
-        
-        build_topological_graph(self)
+        tape = self._tape
+        if tape is None:
+            tape = topological_sort(self)
+            if cache_tape:
+                self._tape = tape
+
+        # gradients of intermediate nodes are recomputed from scratch on every pass
+        for node in tape:
+            if node._children:
+                node.grad = 0.0
+            elif node._code == Op.FREED:
+                _freed_backward(node)  # before any leaf gradient is touched
+
+        if create_graph:
+            with enable_grad():
+                self.grad = Variable(1.0)
+                for node in reversed(tape):
+                    # a plain 0.0 means the node does not reach self: nothing to propagate
+                    if isinstance(node.grad, Variable):
+                        _GRAPH_BACKWARD[node._code](node)
+            return
 
         self.grad = 1.0
-        for node in reversed(topological_graph):
-            node._backward()
+        for node in reversed(tape):
+            _BACKWARD[node._code](node)
+
+        if not (retain_graph or cache_tape):
+            self._tape = None
+            for node in tape:
+                if node._children:
+                    node._children = ()
+                    node._code = Op.FREED
+                    node._arg = None
 
     def __draw__(self):
         """
@@ -144,8 +352,9 @@ class Variable:
         """
         Return a / b where 2/3 is .66 rather than 0. This is also known as “true” division.
         """
+        other = other if isinstance(other, Variable) else Variable(other)
         assert (other.data!=0), "Division by 0 is undefined"
-        
+
         return self * other**-1
 
     def __neg__(self):
@@ -182,4 +391,247 @@ class Variable:
         return self * other
 
     # def __eq__(self, other):
-    #     return self.data == other.data
\ No newline at end of file
+    #     return self.data == other.data
+
+
+# ------------------------------ backward dispatch ------------------------------
+# One chain-rule step per op-code. Each function receives the output node and adds
+# its contribution to the gradients of the node's children.
+
+def _leaf_backward(node):
+    return None
+
+def _freed_backward(node):
+    raise RuntimeError("graph already freed; pass retain_graph=True to the first backward() "
+                       "to back-propagate through it again")
+
+def _add_backward(node):
+    a, b = node._children
+    a.grad += 1.0 * node.grad
+    b.grad += 1.0 * node.grad
+
+def _sub_backward(node):
+    a, b = node._children
+    a.grad += 1.0 * node.grad
+    b.grad -= 1.0 * node.grad
+
+def _mul_backward(node):
+    a, b = node._children
+    a.grad += b.data * node.grad
+    b.grad += a.data * node.grad
+
+def _pow_backward(node):
+    a, = node._children
+    a.grad += node._arg * (a.data ** (node._arg - 1)) * node.grad
+
+def _exp_backward(node):
+    a, = node._children
+    a.grad += node.grad * node.data
+
+def _log_backward(node):
+    a, = node._children
+    a.grad += node.grad * (a.data ** -1)
+
+def _sigmoid_backward(node):
+    a, = node._children
+    a.grad += node.data * (1 - node.data) * node.grad
+
+def _tanh_backward(node):
+    a, = node._children
+    a.grad += (1 - node.data ** 2) * node.grad
+
+def _relu_backward(node):
+    a, = node._children
+    a.grad += (1 if node.data > 0 else 0) * node.grad
+
+def _leaky_relu_backward(node):
+    a, = node._children
+    a.grad += (1 if node.data > 0 else 0.01) * node.grad
+
+def _softmax_backward(node):
+    # output i of a softmax depends on every input j: dt_i/dx_j = t_i * (delta_ij - t_j)
+    i, t = node._arg
+    for j, x in enumerate(node._children):
+        x.grad += t[i] * ((i == j) - t[j]) * node.grad
+
+def _softmax_cross_entropy_backward(node):
+    # d(-log t_label)/dx_j = t_j - delta_{j, label}: one pass over the logits
+    label, t = node._arg
+    for j, x in enumerate(node._children):
+        x.grad += (t[j] - (j == label)) * node.grad
+
+def _sum_backward(node):
+    for child in node._children:
+        child.grad += node.grad
+
+def _dot_backward(node):
+    g = node.grad
+    if node._arg is None:
+        n = len(node._children) // 2
+        for w, x in zip(node._children[:n], node._children[n:]):
+            if w is x:  # a square such as dot(w, w): one update of 2 * w * g
+                w.grad += 2.0 * w.data * g
+            else:
+                w.grad += x.data * g
+                x.grad += w.data * g
+    else:
+        for w, x in zip(node._children, node._arg):
+            w.grad += x * g
+
+
+_BACKWARD = [None] * len(Op)
+_BACKWARD[Op.NONE] = _leaf_backward
+_BACKWARD[Op.ADD] = _add_backward
+_BACKWARD[Op.SUB] = _sub_backward
+_BACKWARD[Op.MUL] = _mul_backward
+_BACKWARD[Op.POW] = _pow_backward
+_BACKWARD[Op.EXP] = _exp_backward
+_BACKWARD[Op.LOG] = _log_backward
+_BACKWARD[Op.SIGMOID] = _sigmoid_backward
+_BACKWARD[Op.TANH] = _tanh_backward
+_BACKWARD[Op.RELU] = _relu_backward
+_BACKWARD[Op.LEAKY_RELU] = _leaky_relu_backward
+_BACKWARD[Op.SOFTMAX] = _softmax_backward
+_BACKWARD[Op.SUM] = _sum_backward
+_BACKWARD[Op.DOT] = _dot_backward
+_BACKWARD[Op.SOFTMAX_CROSS_ENTROPY] = _softmax_cross_entropy_backward
+_BACKWARD[Op.FREED] = _freed_backward
+
+
+# The same chain rules written with Variable operations on the children themselves
+# (not their .data), so that backward(create_graph=True) records the gradient's graph.
+
+def _add_graph_backward(node):
+    a, b = node._children
+    a.grad += node.grad
+    b.grad += node.grad
+
+def _sub_graph_backward(node):
+    a, b = node._children
+    a.grad += node.grad
+    b.grad -= node.grad
+
+def _mul_graph_backward(node):
+    a, b = node._children
+    a.grad += b * node.grad
+    b.grad += a * node.grad
+
+def _pow_graph_backward(node):
+    a, = node._children
+    a.grad += node._arg * a ** (node._arg - 1) * node.grad
+
+def _exp_graph_backward(node):
+    a, = node._children
+    a.grad += node.grad * node
+
+def _log_graph_backward(node):
+    a, = node._children
+    a.grad += node.grad * a ** -1
+
+def _sigmoid_graph_backward(node):
+    a, = node._children
+    a.grad += node * (1 - node) * node.grad
+
+def _tanh_graph_backward(node):
+    a, = node._children
+    a.grad += (1 - node ** 2) * node.grad
+
+def _relu_graph_backward(node):
+    a, = node._children
+    a.grad += (1 if node.data > 0 else 0) * node.grad
+
+def _leaky_relu_graph_backward(node):
+    a, = node._children
+    a.grad += (1 if node.data > 0 else 0.01) * node.grad
+
+def _softmax_graph_backward(node):
+    # the outputs t_j are only stored as numbers, so rebuild them from the logits
+    i, _ = node._arg
+    m = max(x.data for x in node._children)  # a constant shift, for overflow only
+    exps = [(x - m).exp() for x in node._children]
+    total = Variable.sum(exps)
+    t = [e / total for e in exps]
+    for j, x in enumerate(node._children):
+        x.grad += t[i] * ((i == j) - t[j]) * node.grad
+
+def _softmax_cross_entropy_graph_backward(node):
+    label, _ = node._arg
+    m = max(x.data for x in node._children)  # a constant shift, for overflow only
+    exps = [(x - m).exp() for x in node._children]
+    total = Variable.sum(exps)
+    for j, (x, e) in enumerate(zip(node._children, exps)):
+        x.grad += (e / total - (j == label)) * node.grad
+
+def _sum_graph_backward(node):
+    for child in node._children:
+        child.grad += node.grad
+
+def _dot_graph_backward(node):
+    g = node.grad
+    if node._arg is None:
+        n = len(node._children) // 2
+        for w, x in zip(node._children[:n], node._children[n:]):
+            if w is x:
+                w.grad += 2.0 * w * g
+            else:
+                w.grad += x * g
+                x.grad += w * g
+    else:
+        for w, x in zip(node._children, node._arg):
+            w.grad += x * g
+
+
+_GRAPH_BACKWARD = [None] * len(Op)
+_GRAPH_BACKWARD[Op.NONE] = _leaf_backward
+_GRAPH_BACKWARD[Op.ADD] = _add_graph_backward
+_GRAPH_BACKWARD[Op.SUB] = _sub_graph_backward
+_GRAPH_BACKWARD[Op.MUL] = _mul_graph_backward
+_GRAPH_BACKWARD[Op.POW] = _pow_graph_backward
+_GRAPH_BACKWARD[Op.EXP] = _exp_graph_backward
+_GRAPH_BACKWARD[Op.LOG] = _log_graph_backward
+_GRAPH_BACKWARD[Op.SIGMOID] = _sigmoid_graph_backward
+_GRAPH_BACKWARD[Op.TANH] = _tanh_graph_backward
+_GRAPH_BACKWARD[Op.RELU] = _relu_graph_backward
+_GRAPH_BACKWARD[Op.LEAKY_RELU] = _leaky_relu_graph_backward
+_GRAPH_BACKWARD[Op.SOFTMAX] = _softmax_graph_backward
+_GRAPH_BACKWARD[Op.SUM] = _sum_graph_backward
+_GRAPH_BACKWARD[Op.DOT] = _dot_graph_backward
+_GRAPH_BACKWARD[Op.SOFTMAX_CROSS_ENTROPY] = _softmax_cross_entropy_graph_backward
+_GRAPH_BACKWARD[Op.FREED] = _freed_backward
+
+
+def hvp(loss, params, v):
+    """
+    Computes the Hessian-vector product H @ v of `loss` with respect to `params`
+    without forming the Hessian: one backward(create_graph=True) gives the gradient
+    as a graph, and one backward() of the scalar (gradient . v) differentiates it
+    again. Both passes are linear in the size of the graph.
+
+    The graph of `loss` is released afterwards and the `.grad` of `params` is left
+    as it was before the call.
+
+    Parameters:
+        loss (Variable): Scalar output of the graph.
+        params (list): Variables to differentiate with respect to.
+        v (array_like): Direction, one number per parameter.
+
+    Returns:
+        list: (H @ v)_i for every parameter, as floats.
+    """
+    params = list(params)
+    assert len(params) == len(v), "v must have one value per parameter"
+    saved = [p.grad for p in params]
+    for p in params:
+        p.grad = 0.0
+    loss.backward(create_graph=True)
+    gradients = [p.grad for p in params]
+    for p in params:
+        p.grad = 0.0
+    with enable_grad():
+        directional = Variable.dot(gradients, [float(v_i) for v_i in v])
+    if directional._children:  # otherwise the loss is linear in params and H @ v is zero
+        directional.backward()
+    result = [p.grad for p in params]
+    for p, grad in zip(params, saved):
+        p.grad = grad
+    return result
@@ -0,0 +1,287 @@
+import sys, os
+import traceback
+import weakref
+import threading
+import multiprocessing as mp
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+from multiprocessing.shared_memory import SharedMemory
+import numpy as np
+
+# Get the parent directory
+parent_directory = sys.path[0]  # Assumes the script is in the parent directory
+
+# Add the parent directory to the Python path
+sys.path.append(os.path.dirname(os.path.dirname(parent_directory)))
+
+from src.Gradient.Gradient import no_grad
+from src.Gradient.Tensor import Tensor
+from src.Gradient.Parameters import skip_init
+from src.Cost_functions.Cost_functions import CostFunction
+
+
+class DataParallel:
+    def __init__(self, model, X, y, cost_function, n_jobs):
+        """
+        Data-parallel gradients for `fit(..., n_jobs=N)`. Starts N worker processes,
+        each holding a replica of `model`, and places the data, the parameters, the
+        current minibatch and the results in shared memory. Every call shards the
+        minibatch across the workers; each one computes the summed gradient of its
+        shard into its own row of a shared (N, n_params) array, and the rows are
+        reduced in the parent. Only small control messages go through the pipes:
+        no array is ever pickled after start-up.
+
+        The replicas are rebuilt from `get_config()` and read their parameters from
+        the shared array, so the parent copies its `flat_parameters().data` there
+        once per step and the workers see the update.
+
+        Parameters:
+            model: A model with `get_config()`, `flat_parameters()` and either
+                `compile()` or a `Dense` MLP's `forward` / `backward`.
+            X (array_like): Training inputs, (n_samples, input_dim).
+            y (array_like): Training targets, one row per sample.
+            cost_function (callable): The per-sample `CostFunction` of the model. It is
+                sent to the workers, so it must be picklable (not a lambda) where
+                processes are spawned rather than forked.
+            n_jobs (int): Number of worker processes.
+        """
+        self.n_jobs = n_jobs
+        self.flat = model.flat_parameters()
+        X = np.asarray(X, dtype=float)
+        y = np.asarray(y)
+        y = y.astype(float) if y.dtype.kind not in 'iu' else y.astype(np.int64)
+        n_samples, n_params = X.shape[0], len(self.flat)
+        specs = {'X': (X.shape, X.dtype), 'y': (y.shape, y.dtype),
+                 'parameters': ((n_params,), np.float64), 'batch': ((n_samples,), np.int64),
+                 'gradients': ((n_jobs, n_params), np.float64), 'losses': ((n_samples,), np.float64)}
+        self._blocks = {key: SharedMemory(create=True, size=max(int(np.prod(shape)) * np.dtype(dtype).itemsize, 1))
+                        for key, (shape, dtype) in specs.items()}
+        self._arrays = {key: np.ndarray(shape, dtype, buffer=self._blocks[key].buf)
+                        for key, (shape, dtype) in specs.items()}
+        self._arrays['X'][:] = X
+        self._arrays['y'][:] = y
+
+        context = mp.get_context()
+        names = {key: block.name for key, block in self._blocks.items()}
+        self._connections, self._workers = [], []
+        for rank in range(n_jobs):
+            parent, child = context.Pipe()
+            worker = context.Process(target=_worker, daemon=True,
+                                     args=(child, rank, type(model), model.get_config(), cost_function, names, specs))
+            worker.start()
+            child.close()
+            self._connections.append(parent)
+            self._workers.append(worker)
+        # release the processes and the shared memory even if fit is interrupted
+        self._finalizer = weakref.finalize(self, _shutdown, self._connections, self._workers, self._blocks)
+
+    def per_sample_gradients(self, rows, reduction='sum', out=None):
+        """
+        The parallel counterpart of `Program.per_sample_gradients` for a minibatch
+        given as row indices of X.
+
+        Parameters:
+            rows (array_like): Indices of the minibatch rows.
+            reduction (str, optional): 'sum' or 'mean' of the gradients over the
+                minibatch. Defaults to 'sum'.
+            out (numpy.ndarray, optional): A (n_params,) array the reduced gradients
+                are added to in place, such as `flat_parameters().grad`. Defaults to
+                None, a new array.
+
+        Returns:
+            tuple: Per-sample losses (batch,) and the reduced gradients (n_params,),
+                laid out like `flat_parameters().data` (`out` when given).
+        """
+        assert reduction in ('sum', 'mean'), "reduction must be 'sum' or 'mean'"
+        rows = np.asarray(rows)
+        batch_size = len(rows)
+        self._arrays['parameters'][:] = self.flat.data
+        self._arrays['batch'][:batch_size] = rows
+        bounds = np.linspace(0, batch_size, self.n_jobs + 1).astype(int)
+        busy = []
+        for rank, (lo, hi) in enumerate(zip(bounds[:-1], bounds[1:])):
+            if hi > lo:
+                self._connections[rank].send((int(lo), int(hi)))
+                busy.append(rank)
+            else:
+                self._arrays['gradients'][rank] = 0.0
+        for rank in busy:
+            error = self._connections[rank].recv()
+            if error is not None:
+                raise RuntimeError(f"worker {rank} failed:\n{error}")
+        gradients = self._arrays['gradients'].sum(axis=0)
+        if reduction == 'mean':
+            gradients /= batch_size
+        if out is not None:
+            out += gradients
+            gradients = out
+        return self._arrays['losses'][:batch_size].copy(), gradients
+
+    def close(self):
+        """
+        Stops the workers and frees the shared memory.
+        """
+        self._arrays = None
+        self._finalizer()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+        return False
+
+
+def _shutdown(connections, workers, blocks):
+    for connection in connections:
+        try:
+            connection.send(None)
+        except (BrokenPipeError, OSError):
+            pass
+    for worker in workers:
+        worker.join(timeout=5)
+        if worker.is_alive():
+            worker.terminate()
+    for block in blocks.values():
+        block.close()
+        block.unlink()
+
+
+def _local_gradients(model, program, flat, X, y, cost_function, out):
+    """Per-sample losses of one shard, with its summed gradient written to out, on a replica."""
+    out.fill(0.0)
+    if program is not None:
+        return program.per_sample_gradients(X, y, cost_function, reduction='sum', out=out)[0]
+    # a Dense MLP: one batched forward / backward through its layers
+    flat.zero_grad()
+    output = model.forward(X)
+    y_hat = Tensor(output.reshape(-1) if output.shape[1] == 1 else output)
+    losses = CostFunction.batched(cost_function)(y_hat, y, reduction='none')
+    losses.backward()
+    model.backward(y_hat.grad.reshape(output.shape))
+    out += flat.grad
+    return losses.data
+
+
+def _worker(connection, rank, model_class, config, cost_function, names, specs):
+    """Serves gradient requests for the shard [lo, hi) of the shared minibatch."""
+    blocks = {key: SharedMemory(name=name) for key, name in names.items()}
+    arrays = {key: np.ndarray(shape, dtype, buffer=blocks[key].buf) for key, (shape, dtype) in specs.items()}
+    with skip_init():
+        model = model_class(**config)
+    flat = model.flat_parameters(arrays['parameters'])
+    program = None if getattr(model, 'dense', False) else model.compile()
+    X, y, batch = arrays['X'], arrays['y'], arrays['batch']
+    while True:
+        message = connection.recv()
+        if message is None:
+            break
+        lo, hi = message
+        try:
+            rows = batch[lo:hi]
+            arrays['losses'][lo:hi] = _local_gradients(model, program, flat, X[rows], y[rows],
+                                                       cost_function, arrays['gradients'][rank])
+            connection.send(None)
+        except Exception:
+            connection.send(traceback.format_exc())
+    del model, flat, program, X, y, batch, arrays
+    for block in blocks.values():
+        block.close()
+
+
+def predict_in_chunks(model, X, chunk_size=8192, n_jobs=1, backend='thread'):
+    """
+    Predicts X chunk by chunk into one preallocated ndarray, so the work memory is
+    bounded by chunk_size whatever the number of rows, and no graph is built.
+    With n_jobs > 1 the chunks are evaluated by a pool:
+
+    - 'thread': every thread runs its own `Program.replica()` (or the `Dense`
+      layers) and writes its rows of the output directly. numpy releases the GIL
+      inside its kernels, so large chunks run in parallel.
+    - 'process': every process rebuilds the model from `get_config()` and its
+      flat parameters once; the chunks are sent to it and the predictions sent
+      back, with at most 2 * n_jobs chunks in flight.
+
+    Parameters:
+        model: A model with `compile()`, or a `Dense` MLP.
+        X (array_like): Input data, (n_samples, input_dim). May be an np.memmap,
+            which is then read one chunk at a time.
+        chunk_size (int, optional): Rows per chunk. Defaults to 8192.
+        n_jobs (int, optional): Number of threads or processes. Defaults to 1.
+        backend (str, optional): 'thread' or 'process'. Defaults to 'thread'.
+
+    Returns:
+        numpy.ndarray: Predictions, (n_samples,) for single-output models and
+            (n_samples, n_outputs) otherwise.
+    """
+    assert backend in ('thread', 'process'), "backend must be 'thread' or 'process'"
+    X = X if isinstance(X, np.ndarray) else np.asarray(X, dtype=float)
+    if X.ndim == 1:
+        X = X.reshape(1, -1)
+    n_samples = X.shape[0]
+    predictor = _chunk_predictor(model)
+    if n_samples == 0:
+        return np.asarray(predictor(np.asarray(X, dtype=float)))  # (0,) + the shape of one prediction
+    chunk_size = n_samples if chunk_size is None else max(int(chunk_size), 1)
+    bounds = [(lo, min(lo + chunk_size, n_samples)) for lo in range(0, n_samples, chunk_size)]
+
+    # the first chunk gives the output shape
+    first = predictor(X[bounds[0][0]:bounds[0][1]])
+    out = np.empty((n_samples,) + first.shape[1:])
+    out[:len(first)] = first
+    bounds = bounds[1:]
+    if not bounds:
+        return out
+
+    if n_jobs <= 1:
+        for lo, hi in bounds:
+            out[lo:hi] = predictor(X[lo:hi])
+    elif backend == 'thread':
+        local = threading.local()
+
+        def run(lo, hi):
+            if not hasattr(local, 'predictor'):
+                local.predictor = _chunk_predictor(model)
+            out[lo:hi] = local.predictor(X[lo:hi])
+
+        with ThreadPoolExecutor(n_jobs) as pool:
+            for future in [pool.submit(run, lo, hi) for lo, hi in bounds]:
+                future.result()
+    else:
+        flat = model.flat_parameters()
+        with ProcessPoolExecutor(n_jobs, initializer=_init_predictor,
+                                 initargs=(type(model), model.get_config(), np.array(flat.data))) as pool:
+            pending = []
+            for lo, hi in bounds:
+                pending.append((lo, hi, pool.submit(_predict_chunk, np.asarray(X[lo:hi], dtype=float))))
+                if len(pending) >= 2 * n_jobs:
+                    lo_, hi_, future = pending.pop(0)
+                    out[lo_:hi_] = future.result()
+            for lo_, hi_, future in pending:
+                out[lo_:hi_] = future.result()
+    return out
+
+
+def _chunk_predictor(model):
+    """A function predicting one chunk with buffers of its own."""
+    if getattr(model, 'dense', False):
+        def forward(X):
+            with no_grad():  # a pool thread starts with grad mode on; keep the layers stateless
+                output = model.forward(X)
+            return output.reshape(-1) if output.shape[1] == 1 else output
+        return forward
+    return model.compile().replica()
+
+
+_process_predictor = None
+
+
+def _init_predictor(model_class, config, data):
+    global _process_predictor
+    with skip_init():
+        model = model_class(**config)
+    model.flat_parameters(data)
+    _process_predictor = _chunk_predictor(model)
+
+
+def _predict_chunk(X):
+    return _process_predictor(X)
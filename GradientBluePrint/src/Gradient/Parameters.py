@@ -0,0 +1,234 @@
+import sys, os
+import random
+from contextlib import ContextDecorator
+import numpy as np
+
+# Get the parent directory
+parent_directory = sys.path[0]  # Assumes the script is in the parent directory
+
+# Add the parent directory to the Python path
+sys.path.append(os.path.dirname(os.path.dirname(parent_directory)))
+
+from src.Gradient.Gradient import Variable, Op
+from src.Gradient.Tensor import Tensor
+
+
+_initialize = True
+
+
+class skip_init(ContextDecorator):
+    """
+    Context manager for building a model whose parameter values are replaced right
+    away (see `load`). Inside it, `uniform` allocates array parameters without
+    filling them, so building a `Dense` MLP does no work per weight, and
+    `scalar_uniform` returns 0.0 without drawing a random number.
+    """
+
+    def _recreate_cm(self):
+        return type(self)()
+
+    def __enter__(self):
+        global _initialize
+        self._previous = _initialize
+        _initialize = False
+        return self
+
+    def __exit__(self, *exc):
+        global _initialize
+        _initialize = self._previous
+        return False
+
+
+def uniform(shape, low=-1.0, high=1.0):
+    """
+    Initial values of an array parameter: uniform random numbers in [low, high), or
+    an uninitialized array inside `skip_init`.
+    """
+    if _initialize:
+        return np.random.uniform(low, high, shape)
+    return np.empty(shape)
+
+
+def scalar_uniform(low=-1.0, high=1.0):
+    """
+    Initial value of a scalar (`Variable`) parameter: a uniform random number in
+    [low, high], or 0.0 inside `skip_init`.
+    """
+    if _initialize:
+        return random.uniform(low, high)
+    return 0.0
+
+
+class Parameter(Variable):
+    """
+    A `Variable` whose value and gradient are one entry of a `ParameterBuffer`.
+    Reading or writing `data` / `grad` goes straight to `buffer.data[index]` /
+    `buffer.grad[index]`, so graph code that updates a Parameter (`p.grad += ...`)
+    and array code that updates the whole buffer see the same numbers.
+
+    A gradient graph (`backward(create_graph=True)`) is kept on the Parameter
+    itself, since a Variable cannot be stored in a float array.
+    """
+    __slots__ = ('_buffer', '_index', '_graph_grad')
+
+    def __init__(self, buffer, index, label=''):
+        """
+        Parameters:
+            buffer (ParameterBuffer): The buffer holding the value and the gradient.
+            index (int): Position of the parameter in the buffer.
+            label (str, optional): Name of the parameter.
+        """
+        self._buffer = buffer
+        self._index = index
+        self._graph_grad = None
+        # a leaf; Variable.__init__ is not called since it would write data and grad
+        # into the buffer, which may be a read-mostly memory-mapped checkpoint
+        self._children = ()
+        self._code = Op.NONE
+        self._arg = None
+        self.label = label
+        self._tape = None
+
+    def __getstate__(self):
+        # data and grad live in the buffer, which is pickled with it
+        return None, {name: getattr(self, name) for name in
+                      ('_buffer', '_index', '_graph_grad', '_children', '_code', '_arg', 'label', '_tape')}
+
+    @property
+    def data(self):
+        return self._buffer.data.item(self._index)
+
+    @data.setter
+    def data(self, value):
+        self._buffer.data[self._index] = value
+
+    @property
+    def grad(self):
+        if self._graph_grad is not None:
+            return self._graph_grad
+        return self._buffer.grad.item(self._index)
+
+    @grad.setter
+    def grad(self, value):
+        if isinstance(value, Variable):
+            self._graph_grad = value
+        else:
+            self._graph_grad = None
+            self._buffer.grad[self._index] = value
+
+
+class ParameterBuffer:
+    def __init__(self, parameters, data=None):
+        """
+        Copies a model's parameters into two contiguous float arrays, `data` and
+        `grad`, and turns every parameter into a view of them: a scalar `Variable`
+        is replaced by a `Parameter`, and a `Tensor` keeps its identity but gets
+        `data` / `grad` rebound to reshaped slices of the arrays.
+
+        The models install the new objects with `flat_parameters()`; afterwards an
+        optimizer step, zeroing the gradients, a gradient norm or clipping is one
+        numpy operation on `data` / `grad` instead of a loop over parameters.
+
+        Parameters:
+            parameters (list): A model's `parameters()`, possibly nested (multiclass models).
+            data (ndarray, optional): A 1-D float array with one value per parameter entry
+                to use as `data` as is, instead of copying the current values (e.g. a
+                memory-mapped checkpoint). Defaults to None.
+        """
+        leaves = _leaves(parameters)
+        sizes = [p.data.size if isinstance(p, Tensor) else 1 for p in leaves]
+        offsets = np.concatenate(([0], np.cumsum(sizes, dtype=int)))
+        if data is not None and np.shape(data) != (offsets[-1],):
+            raise ValueError(f"data must have shape ({offsets[-1]},), got {np.shape(data)}")
+        self.data = np.empty(offsets[-1]) if data is None else data
+        self.grad = np.zeros(offsets[-1])
+        self.labels = [p.label for p in leaves]
+        self.shapes = [p.data.shape if isinstance(p, Tensor) else () for p in leaves]
+        self.offsets = offsets
+
+        views = {}
+        for p, start, stop in zip(leaves, offsets[:-1], offsets[1:]):
+            # with data given the values are replaced, and the gradients start at zero
+            if isinstance(p, Tensor):
+                if data is None:
+                    self.data[start:stop] = p.data.ravel()
+                    self.grad[start:stop] = p.grad.ravel()
+                views[id(p)] = p
+            else:
+                if data is None:
+                    self.data[start] = p.data
+                    self.grad[start] = p.grad if not isinstance(p.grad, Variable) else 0.0
+                views[id(p)] = Parameter(self, int(start), label=p.label)
+        self.parameters = _rebuild(parameters, views)
+        self._bind_tensors()
+
+    def _bind_tensors(self):
+        """Makes the data / grad of every Tensor parameter a view of the flat arrays."""
+        for p, start, stop, shape in zip(_leaves(self.parameters), self.offsets[:-1], self.offsets[1:], self.shapes):
+            if isinstance(p, Tensor):
+                p.data = self.data[start:stop].reshape(shape)
+                p.grad = self.grad[start:stop].reshape(shape)
+
+    def __setstate__(self, state):
+        # pickle copies every array on its own; make the Tensors views of data / grad again
+        self.__dict__.update(state)
+        self._bind_tensors()
+
+    def __len__(self):
+        return self.data.size
+
+    def zero_grad(self):
+        """
+        Sets every gradient to zero, in place.
+        """
+        self.grad.fill(0.0)
+
+    def grad_norm(self):
+        """
+        Returns:
+            float: The L2 norm of all gradients together.
+        """
+        return float(np.sqrt(np.dot(self.grad, self.grad)))
+
+    def clip_grad_norm(self, max_norm):
+        """
+        Rescales all gradients together so their global L2 norm is at most max_norm.
+
+        Parameters:
+            max_norm (float): Largest allowed norm.
+
+        Returns:
+            float: The norm before clipping.
+        """
+        norm = self.grad_norm()
+        if norm > max_norm:
+            self.grad *= max_norm / norm
+        return norm
+
+    def clip_grad_value(self, clip_value):
+        """
+        Clips every gradient entry to [-clip_value, clip_value], in place.
+
+        Parameters:
+            clip_value (float): Largest allowed magnitude.
+        """
+        np.clip(self.grad, -clip_value, clip_value, out=self.grad)
+
+    def __repr__(self):
+        return f"ParameterBuffer({len(self.labels)} parameters, {self.data.size} values)"
+
+
+def _leaves(parameters):
+    """The Variables and Tensors of a (nested) parameter list, in order."""
+    leaves = []
+    for parameter in parameters:
+        if isinstance(parameter, (list, tuple)):
+            leaves.extend(_leaves(parameter))
+        else:
+            leaves.append(parameter)
+    return leaves
+
+
+def _rebuild(parameters, views):
+    """The (nested) parameter list with every leaf replaced by its view."""
+    return [_rebuild(p, views) if isinstance(p, (list, tuple)) else views[id(p)] for p in parameters]
@@ -0,0 +1,395 @@
+import sys, os
+# Get the parent directory
+parent_directory = sys.path[0]  # Assumes the script is in the parent directory
+
+# Add the parent directory to the Python path
+sys.path.append(os.path.dirname(os.path.dirname(parent_directory)))
+
+from src.Helpers.DrawGraph import draw_dot
+from src.Gradient.Gradient import topological_sort, is_grad_enabled
+from src.NNS import Activation_Kernels as kernels
+from operator import attrgetter
+import numpy as np
+
+
+def _unbroadcast(grad, shape):
+    """
+    Sums `grad` over the axes numpy broadcast in the forward pass, so the
+    gradient of an operand always has the operand's own shape.
+    """
+    while grad.ndim > len(shape):
+        grad = grad.sum(axis=0)
+    for axis, size in enumerate(shape):
+        if size == 1 and grad.shape[axis] != 1:
+            grad = grad.sum(axis=axis, keepdims=True)
+    return grad
+
+
+def _leaf_backward(grad):
+    return None
+
+
+def _freed_backward(grad):
+    raise RuntimeError("graph already freed; pass retain_graph=True to the first backward() "
+                       "to back-propagate through it again")
+
+
+class Tensor:
+    __array_ufunc__ = None  # let `ndarray <op> Tensor` fall through to the reflected Tensor operator
+
+    def __init__(self, data, _children=(), _op='', label=''):
+        """
+        @ data: array_like  # input data, stored as a float ndarray
+        @ _children: set, To keep track of all connections, basically to keep track of what Tensors are producing what Tensors
+        @ _op: str, To keep track of mathematical expression of each operation
+
+        A Tensor is the array counterpart of `Variable`: one node holds a whole
+        ndarray, so a batch of samples flows through a graph of a handful of
+        nodes instead of one node per scalar.
+        """
+        self.data = np.asarray(data, dtype=float)
+        self._prev = set(_children) if is_grad_enabled() else set()
+        self._op = _op
+        self.label = label
+        self.grad = np.zeros(self.data.shape)  # derivative of the value with respect to an _childern, same shape as data
+        # receives the gradient of this Tensor; the closures never reference their own
+        # output Tensor, so a graph holds no reference cycles and is freed by refcounting
+        self._backward = _leaf_backward
+
+    @property
+    def shape(self):
+        return self.data.shape
+
+    @property
+    def T(self):
+        return self.transpose()
+
+    @staticmethod
+    def from_variables(variables, label=''):
+        """
+        Packs scalar `Variable` objects (a list, or a list of lists) into a Tensor.
+        The gradient the Tensor receives is added back into each Variable's grad,
+        so models keeping their parameters as Variables can still run a batched graph
+        and be updated by the existing optimizers.
+        """
+        variables = np.asarray(variables, dtype=object)
+        output = Tensor(np.array([v.data for v in variables.ravel()], dtype=float).reshape(variables.shape),
+                        _op='pack', label=label)
+
+        def _backward(grad):
+            for v, g in zip(variables.ravel(), grad.ravel()):
+                v.grad += float(g)
+
+        if is_grad_enabled():
+            output._backward = _backward
+        return output
+
+    def __add__(self, other):
+        """
+        To add two Tensor objects, following numpy broadcasting.
+        """
+        other = other if isinstance(other, Tensor) else Tensor(other)
+        output = Tensor(self.data + other.data, _children=(self, other), _op='+')
+
+        def _backward(grad):
+            self.grad += _unbroadcast(grad, self.shape)
+            other.grad += _unbroadcast(grad, other.shape)
+
+        if is_grad_enabled():
+            output._backward = _backward
+        return output
+
+    def __sub__(self, other):
+        """
+        To subtract two Tensor objects, following numpy broadcasting.
+        """
+        other = other if isinstance(other, Tensor) else Tensor(other)
+        output = Tensor(self.data - other.data, _children=(self, other), _op='-')
+
+        def _backward(grad):
+            self.grad += _unbroadcast(grad, self.shape)
+            other.grad -= _unbroadcast(grad, other.shape)
+
+        if is_grad_enabled():
+            output._backward = _backward
+        return output
+
+    def __mul__(self, other):
+        """
+        To multiply two Tensor objects element-wise, following numpy broadcasting.
+        """
+        other = other if isinstance(other, Tensor) else Tensor(other)
+        output = Tensor(self.data * other.data, _children=(self, other), _op='*')
+
+        def _backward(grad):
+            self.grad += _unbroadcast(other.data * grad, self.shape)
+            other.grad += _unbroadcast(self.data * grad, other.shape)
+
+        if is_grad_enabled():
+            output._backward = _backward
+        return output
+
+    def __truediv__(self, other):
+        """
+        To divide two Tensor objects element-wise, following numpy broadcasting.
+        """
+        other = other if isinstance(other, Tensor) else Tensor(other)
+        assert np.all(other.data != 0), "Division by 0 is undefined"
+        data = self.data / other.data
+        output = Tensor(data, _children=(self, other), _op='/')
+
+        def _backward(grad):
+            self.grad += _unbroadcast(grad / other.data, self.shape)
+            other.grad -= _unbroadcast(grad * data / other.data, other.shape)
+
+        if is_grad_enabled():
+            output._backward = _backward
+        return output
+
+    def __pow__(self, other):
+        """
+        To take a Tensor element-wise to the power of a constant.
+        """
+        assert isinstance(other, (int, float)), "Only supporting int/float powers for now"
+        output = Tensor(self.data ** other, _children=(self, ), _op=f'**{other}')
+
+        def _backward(grad):
+            self.grad += other * (self.data ** (other - 1)) * grad
+
+        if is_grad_enabled():
+            output._backward = _backward
+        return output
+
+    def __matmul__(self, other):
+        """
+        To take the matrix product of two Tensor objects (1-D and 2-D operands, as numpy.matmul).
+        """
+        other = other if isinstance(other, Tensor) else Tensor(other)
+        output = Tensor(self.data @ other.data, _children=(self, other), _op='@')
+
+        def _backward(grad):
+            a, b, g = self.data, other.data, grad
+            if a.ndim == 1 and b.ndim == 1:
+                self.grad += g * b
+                other.grad += g * a
+            elif b.ndim == 1:
+                self.grad += np.outer(g, b)
+                other.grad += a.T @ g
+            elif a.ndim == 1:
+                self.grad += b @ g
+                other.grad += np.outer(a, g)
+            else:
+                self.grad += g @ b.T
+                other.grad += a.T @ g
+
+        if is_grad_enabled():
+            output._backward = _backward
+        return output
+
+    def sum(self, axis=None, keepdims=False):
+        """
+        To sum the elements of a Tensor over the given axis (all of them by default).
+        """
+        output = Tensor(self.data.sum(axis=axis, keepdims=keepdims), _children=(self, ), _op='sum')
+
+        def _backward(grad):
+            g = grad
+            if axis is not None and not keepdims:
+                g = np.expand_dims(g, axis)
+            self.grad += np.broadcast_to(g, self.shape)
+
+        if is_grad_enabled():
+            output._backward = _backward
+        return output
+
+    def mean(self, axis=None, keepdims=False):
+        """
+        To average the elements of a Tensor over the given axis (all of them by default).
+        """
+        count = self.data.size if axis is None else np.prod([self.shape[a] for a in np.atleast_1d(axis)])
+        return self.sum(axis=axis, keepdims=keepdims) * (1.0 / count)
+
+    def reshape(self, *shape):
+        """
+        To view a Tensor with a new shape.
+        """
+        output = Tensor(self.data.reshape(*shape), _children=(self, ), _op='reshape')
+
+        def _backward(grad):
+            self.grad += grad.reshape(self.shape)
+
+        if is_grad_enabled():
+            output._backward = _backward
+        return output
+
+    def transpose(self):
+        """
+        To reverse the axes of a Tensor.
+        """
+        output = Tensor(self.data.T, _children=(self, ), _op='T')
+
+        def _backward(grad):
+            self.grad += grad.T
+
+        if is_grad_enabled():
+            output._backward = _backward
+        return output
+
+    def exp(self):
+        """
+        To calculate the element-wise exp of a Tensor.
+        """
+        data = np.exp(self.data)
+        output = Tensor(data, _children=(self, ), _op='exp')
+
+        def _backward(grad):
+            self.grad += grad * data
+
+        if is_grad_enabled():
+            output._backward = _backward
+        return output
+
+    def log(self):
+        """
+        To calculate the element-wise log of a Tensor.
+        """
+        x = self.data
+        output = Tensor(np.log(x), _children=(self, ), _op='log')
+
+        def _backward(grad):
+            self.grad += grad / x
+
+        if is_grad_enabled():
+            output._backward = _backward
+        return output
+
+    def sigmoid(self):
+        """
+        Computes the element-wise sigmoid activation function.
+        """
+        t = kernels.sigmoid(self.data)
+        output = Tensor(t, _children=(self, ), _op='sigmoid')
+
+        def _backward(grad):
+            self.grad += kernels.sigmoid_backward(t, grad)
+
+        if is_grad_enabled():
+            output._backward = _backward
+        return output
+
+    def tanh(self):
+        """
+        Computes the element-wise hyperbolic tangent activation function.
+        """
+        t = kernels.tanh(self.data)
+        output = Tensor(t, _children=(self, ), _op='tanh')
+
+        def _backward(grad):
+            self.grad += kernels.tanh_backward(t, grad)
+
+        if is_grad_enabled():
+            output._backward = _backward
+        return output
+
+    def relu(self):
+        """
+        Computes the element-wise rectified linear unit (ReLU) activation function.
+        """
+        t = kernels.relu(self.data)
+        output = Tensor(t, _children=(self, ), _op='relu')
+
+        def _backward(grad):
+            self.grad += kernels.relu_backward(t, grad)
+
+        if is_grad_enabled():
+            output._backward = _backward
+        return output
+
+    def leaky_relu(self):
+        """
+        Computes the element-wise leaky ReLU activation function.
+        """
+        t = kernels.leaky_relu(self.data)
+        output = Tensor(t, _children=(self, ), _op='leaky relu')
+
+        def _backward(grad):
+            self.grad += kernels.leaky_relu_backward(t, grad)
+
+        if is_grad_enabled():
+            output._backward = _backward
+        return output
+
+    def softmax(self, axis=-1):
+        """
+        Computes the softmax activation function along `axis` (the class axis of a batch by default).
+        """
+        t = kernels.softmax(self.data, axis=axis)
+        output = Tensor(t, _children=(self, ), _op='softmax')
+
+        def _backward(grad):
+            self.grad += kernels.softmax_backward(t, grad, axis=axis)
+
+        if is_grad_enabled():
+            output._backward = _backward
+        return output
+
+    def backward(self, retain_graph=False):
+        """
+        To perform a backward propagation, this function will
+        fist convert the network to a topological graph then
+        in order will perform a back propagation.
+
+        Parameters:
+            retain_graph (bool, optional): Keep the graph for another backward pass.
+                By default the backward closures and child links are dropped once the
+                gradients are propagated, so the intermediate arrays are freed at once;
+                a later backward() that reaches one of those nodes raises a RuntimeError.
+        """
+        topological_graph = topological_sort(self, children=attrgetter('_prev'))
+
+        # gradients of intermediate nodes are recomputed from scratch on every pass
+        for node in topological_graph:
+            if node._backward is _freed_backward:
+                _freed_backward(node.grad)  # before any leaf gradient is touched
+            if node._backward is not _leaf_backward:
+                node.grad.fill(0.0)
+
+        self.grad = np.ones_like(self.data)
+        for node in reversed(topological_graph):
+            node._backward(node.grad)
+
+        if not retain_graph:
+            for node in topological_graph:
+                if node._backward is not _leaf_backward:
+                    node._prev = set()
+                    node._backward = _freed_backward
+
+    def __draw__(self):
+        """
+        To visualize the network.
+        """
+        return draw_dot(self)
+
+    def __repr__(self):
+        return f"Tensor(shape={self.shape})|Label(label={self.label})"
+
+    def __neg__(self):
+        return self * -1.0
+
+    def __radd__(self, other):  # other + self
+        return self + other
+
+    def __rsub__(self, other):  # other - self
+        other = other if isinstance(other, Tensor) else Tensor(other)
+        return other - self
+
+    def __rmul__(self, other):  # other * self
+        return self * other
+
+    def __rtruediv__(self, other):  # other / self
+        other = other if isinstance(other, Tensor) else Tensor(other)
+        return other / self
+
+    def __rmatmul__(self, other):  # other @ self
+        other = other if isinstance(other, Tensor) else Tensor(other)
+        return other @ self
@@ -0,0 +1,474 @@
+import sys, os
+import copy
+# Get the parent directory
+parent_directory = sys.path[0]  # Assumes the script is in the parent directory
+
+# Add the parent directory to the Python path
+sys.path.append(os.path.dirname(os.path.dirname(parent_directory)))
+
+from src.Gradient.Gradient import Variable, Op, topological_sort, enable_grad
+from src.Gradient.Tensor import Tensor
+from src.Gradient.Parameters import Parameter
+from src.NNS import Activation_Kernels as kernels
+from src.Cost_functions.Cost_functions import CostFunction
+import numpy as np
+
+
+def flatten_parameters(parameters):
+    """
+    Flattens a model's `parameters()` list, which is nested for multiclass models.
+    """
+    flat = []
+    for parameter in parameters:
+        if isinstance(parameter, (list, tuple)):
+            flat.extend(flatten_parameters(parameter))
+        else:
+            flat.append(parameter)
+    return flat
+
+
+def trace(model, input_dim, example=None):
+    """
+    Runs `model` forward once on placeholder input Variables and linearizes the
+    recorded graph into a `Program`.
+
+    Parameters:
+        model: Any model whose `__call__` takes one sample and returns a Variable or a list of Variables.
+        input_dim (int): Number of input features.
+        example (array_like, optional): Values for the placeholders. Defaults to ones.
+
+    Returns:
+        Program: The compiled model.
+    """
+    example = np.ones(input_dim) if example is None else np.asarray(example, dtype=float)
+    inputs = np.array([Variable(float(example[i]), label=f"x{i}") for i in range(input_dim)], dtype=object)
+    with enable_grad():
+        outputs = model(inputs)
+        return Program(outputs, list(inputs), flatten_parameters(model.parameters()))
+
+
+def _unique(rows):
+    return len(set(rows.tolist())) == len(rows)
+
+
+def _accumulate(G, rows, values, unique):
+    """G[rows] += values, adding repeated rows once per occurrence."""
+    if unique:
+        G[rows] += values
+    else:
+        np.add.at(G, rows, values)
+
+
+class Program:
+    def __init__(self, outputs, inputs, parameters):
+        """
+        A model graph recorded once and stored as a flat list of instructions.
+
+        Every node of the traced graph owns one row of a (n_nodes, batch) array, so
+        each instruction runs for a whole batch with one numpy call and no Variable
+        objects are created when the program is run. The chain-rule of each
+        instruction mirrors the `_BACKWARD` table of `Variable`, in the same order,
+        so per-sample gradients match the dynamic graph.
+
+        Parameters:
+            outputs (Variable or list): Output(s) of the traced model.
+            inputs (list): Placeholder Variables standing for the input features.
+            parameters (list): The model parameters, in `parameters()` order.
+        """
+        self.single_output = isinstance(outputs, Variable)
+        outputs = [outputs] if self.single_output else list(outputs)
+        self.parameters = parameters
+
+        root = Variable(0.0, outputs)
+        tape = topological_sort(root)[:-1]
+        index = {node: row for row, node in enumerate(tape)}
+        self.n_nodes = len(tape)
+
+        input_rows = {node: i for i, node in enumerate(inputs)}
+        parameter_ids = {id(p): i for i, p in enumerate(parameters)}
+        self.input_rows, self.parameter_rows = [], []
+        self.constant_rows, self.constants = [], []
+        self.instructions = []
+        softmax_groups = {}
+        for row, node in enumerate(tape):
+            if not node._children:
+                if node in input_rows:
+                    self.input_rows.append((row, input_rows[node]))
+                elif id(node) in parameter_ids:
+                    self.parameter_rows.append((row, parameter_ids[id(node)]))
+                else:
+                    self.constant_rows.append(row)
+                    self.constants.append(node.data)
+                continue
+            ins = tuple(index[child] for child in node._children)
+            arg = node._arg
+            if node._code == Op.SOFTMAX:
+                # the outputs of one softmax share their value list; keep (i, row) of every member
+                i, t = node._arg
+                group = softmax_groups.setdefault(id(t), [None] * len(t))
+                group[i] = row
+                arg = (i, group)  # the row computing the group is added below
+            elif node._code == Op.SUM:
+                rows = np.array(ins, dtype=int)
+                arg = (node._arg, rows, _unique(rows))
+            elif node._code == Op.DOT:
+                rows = np.array(ins, dtype=int)
+                if node._arg is None:
+                    weights, inputs = rows[:len(rows) // 2], rows[len(rows) // 2:]
+                    if np.array_equal(weights, inputs):
+                        arg = (weights, None, None, _unique(weights), True)  # a sum of squares
+                    else:
+                        arg = (weights, inputs, None, _unique(weights), _unique(inputs))
+                else:
+                    arg = (rows, None, np.array(node._arg, dtype=float), _unique(rows), True)
+            self.instructions.append((node._code, row, ins, arg))
+
+        for group in softmax_groups.values():
+            if None in group:
+                raise ValueError("every output of a traced softmax must be part of the graph")
+        # the whole group is computed by the member that runs first, whichever output it is
+        self.instructions = [(code, row, ins, arg + (min(arg[1]), ) if code == Op.SOFTMAX else arg)
+                             for code, row, ins, arg in self.instructions]
+
+        self.output_rows = [index[node] for node in outputs]
+        # a model ending in a softmax (multiclass LogisticRegression) hands its logits
+        # to `loss`, so cross-entropy can skip the softmax backward
+        self.logit_rows = None
+        self.backward_instructions = self.instructions
+        if all(node._code == Op.SOFTMAX and node._arg[1] is outputs[0]._arg[1] for node in outputs) \
+                and len(outputs) == len(outputs[0]._children):
+            self.logit_rows = [index[child] for child in outputs[0]._children]
+            head = set(self.output_rows)
+            self.backward_instructions = [ins for ins in self.instructions if ins[1] not in head]
+        self.gradient_rows = [None] * len(parameters)
+        for row, i in self.parameter_rows:
+            self.gradient_rows[i] = row
+        self._gradient_index = (np.array([i for _, i in self.parameter_rows], dtype=int),
+                                np.array([row for row, _ in self.parameter_rows], dtype=int))
+        self.constants = np.array(self.constants, dtype=float)
+        # parameters living in one ParameterBuffer are loaded with a single gather
+        self._flat = None
+        if parameters and all(isinstance(p, Parameter) and p._buffer is parameters[0]._buffer for p in parameters):
+            self._flat = (parameters[0]._buffer,
+                          np.array([row for row, _ in self.parameter_rows], dtype=int),
+                          np.array([parameters[i]._index for _, i in self.parameter_rows], dtype=int))
+        self._values = None
+        self._grads = None
+
+    def _buffers(self, batch_size):
+        if self._values is None or self._values.shape[1] != batch_size:
+            self._values = np.empty((self.n_nodes, batch_size))
+            self._grads = np.empty((self.n_nodes, batch_size))
+        return self._values, self._grads
+
+    def forward(self, X):
+        """
+        Runs the program on a batch.
+
+        Parameters:
+            X (array_like): Input data of shape (batch, input_dim).
+
+        Returns:
+            numpy.ndarray: Output values of shape (n_outputs, batch).
+        """
+        X = np.asarray(X, dtype=float)
+        if X.ndim == 1:
+            X = X.reshape(1, -1)
+        V, _ = self._buffers(X.shape[0])
+        for row, column in self.input_rows:
+            V[row] = X[:, column]
+        if self._flat is not None:
+            buffer, rows, index = self._flat
+            V[rows] = buffer.data[index][:, None]
+        else:
+            for row, i in self.parameter_rows:
+                V[row] = self.parameters[i].data
+        if self.constant_rows:
+            V[self.constant_rows] = self.constants[:, None]
+        for code, out, ins, arg in self.instructions:
+            _FORWARD[code](V, out, ins, arg)
+        return V[self.output_rows]
+
+    def backward(self, upstream, reduction=None, out=None):
+        """
+        Back-propagates the gradients of the outputs of the last `forward` call.
+
+        Parameters:
+            upstream (numpy.ndarray): The gradient returned by `loss`.
+            reduction (str, optional): None for every sample's gradient, or 'mean' /
+                'sum' to reduce them over the batch without forming the per-sample
+                (n_params, batch) array. Defaults to None.
+            out (numpy.ndarray, optional): With a reduction, a (n_params,) array to add
+                the reduced gradient to in place, e.g. `flat_parameters().grad`.
+
+        Returns:
+            numpy.ndarray: Per-sample parameter gradients, shape (n_params, batch),
+                rows in `parameters` order; or the reduced gradients (n_params,)
+                (`out` when given).
+        """
+        V, G = self._values, self._grads
+        G.fill(0.0)
+        G[self.output_rows if self.logit_rows is None else self.logit_rows] += upstream
+        for code, out_row, ins, arg in reversed(self.backward_instructions):
+            _BACKWARD[code](V, G, out_row, ins, arg)
+        if reduction is not None:
+            totals = G.sum(axis=1)  # one value per node
+            if reduction == 'mean':
+                totals /= V.shape[1]
+            out = np.zeros(len(self.parameters)) if out is None else out
+            index, rows = self._gradient_index
+            out[index] += totals[rows]  # every parameter has one row
+            return out
+        gradients = np.zeros((len(self.parameters), V.shape[1]))
+        for i, row in enumerate(self.gradient_rows):
+            if row is not None:
+                gradients[i] = G[row]
+        return gradients
+
+    def loss(self, cost_function, y):
+        """
+        Evaluates `cost_function` on the outputs of the last `forward` call. The
+        `CostFunction` losses run through their batch versions in one vectorized
+        step; any other cost function is evaluated sample by sample, building only
+        the few output nodes per sample as Variables.
+
+        Parameters:
+            cost_function (callable): A `CostFunction` method.
+            y (array_like): Targets, one per sample.
+
+        When the model ends in a softmax, the outputs are rebuilt as softmax nodes of
+        the logits, so `CostFunction.categorical_cross_entropy_loss` fuses them and the
+        gradient is taken directly with respect to the logits.
+
+        Returns:
+            tuple: Per-sample loss values (batch,) and d(loss)/d(output) (n_outputs, batch),
+                or d(loss)/d(logits) for a softmax model; `backward` accepts either.
+        """
+        outputs = self._values[self.output_rows]
+        leaves = outputs if self.logit_rows is None else self._values[self.logit_rows]
+        batched = CostFunction.batched(cost_function, from_logits=self.logit_rows is not None)
+        if batched is not None:
+            # one vectorized node for the whole batch; 'none' keeps every sample's loss
+            y_hat = Tensor(leaves[0] if self.single_output else leaves.T)
+            with enable_grad():
+                loss = batched(y_hat, y, reduction='none')
+                loss.backward()
+            upstream = y_hat.grad.reshape(1, -1) if self.single_output else y_hat.grad.T
+            return loss.data, upstream
+        losses = np.empty(outputs.shape[1])
+        upstream = np.empty_like(leaves)
+        with enable_grad():
+            for k, y_ in enumerate(y):
+                z = tuple(Variable(value) for value in leaves[:, k])  # shared by the softmax nodes
+                if self.logit_rows is None:
+                    y_hat = z
+                else:
+                    t = outputs[:, k].tolist()
+                    y_hat = [Variable(t_i, z, Op.SOFTMAX, _arg=(i, t)) for i, t_i in enumerate(t)]
+                loss = cost_function(y_hat[0] if self.single_output else y_hat, y_)
+                loss.backward()
+                losses[k] = loss.data
+                upstream[:, k] = [v.grad for v in z]
+        return losses, upstream
+
+    def per_sample_gradients(self, X, y, cost_function, reduction=None, out=None):
+        """
+        Computes the gradient of `cost_function` for every sample of a batch at once,
+        like a vmap of the dynamic forward/backward pass: one `forward`, one `loss`
+        and one `backward` over the whole batch, with no per-sample Python loop over
+        the parameters.
+
+        Parameters:
+            X (array_like): Input data of shape (batch, input_dim).
+            y (array_like): Targets, one per sample.
+            cost_function (callable): A `CostFunction` method.
+            reduction (str, optional): None for every sample's gradient, or 'mean' /
+                'sum' to reduce them over the batch. Defaults to None.
+            out (numpy.ndarray, optional): With a reduction, a (n_params,) array the
+                reduced gradient is added to in place, such as `flat_parameters().grad`,
+                so the gradient memory stays O(n_params) whatever the batch size.
+                Defaults to None, a new array.
+
+        Returns:
+            tuple: Per-sample losses (batch,) and the gradients: (batch, n_params)
+                for reduction=None, (n_params,) otherwise (`out` when given). Columns
+                are in `parameters` order.
+        """
+        assert reduction in (None, 'mean', 'sum'), "reduction must be None, 'mean' or 'sum'"
+        assert out is None or reduction is not None, "out needs a reduction"
+        self.forward(X)
+        losses, upstream = self.loss(cost_function, y)
+        if reduction is not None:
+            return losses, self.backward(upstream, reduction, out)
+        return losses, self.backward(upstream).T
+
+    def __call__(self, X):
+        """
+        Predicts the outputs for a batch.
+
+        Returns:
+            numpy.ndarray: Shape (batch,) for single-output models, (batch, n_outputs) otherwise.
+        """
+        outputs = self.forward(X)
+        return outputs[0].copy() if self.single_output else outputs.T.copy()
+
+    def replica(self):
+        """
+        A Program sharing this one's instructions and parameters but with its own
+        work buffers, so another thread can run it at the same time.
+
+        Returns:
+            Program: The replica.
+        """
+        replica = copy.copy(self)
+        replica._values = None
+        replica._grads = None
+        return replica
+
+    def __repr__(self):
+        return f"Program(nodes={self.n_nodes}, instructions={len(self.instructions)}, parameters={len(self.parameters)})"
+
+
+# ------------------------------ vectorized kernels ------------------------------
+# Row-wise counterparts of the op-codes of `Variable`. V holds node values and G node
+# gradients, one row per node and one column per sample.
+
+def _add_forward(V, out, ins, arg):
+    np.add(V[ins[0]], V[ins[1]], out=V[out])
+
+def _sub_forward(V, out, ins, arg):
+    np.subtract(V[ins[0]], V[ins[1]], out=V[out])
+
+def _mul_forward(V, out, ins, arg):
+    np.multiply(V[ins[0]], V[ins[1]], out=V[out])
+
+def _pow_forward(V, out, ins, arg):
+    np.power(V[ins[0]], arg, out=V[out])
+
+def _exp_forward(V, out, ins, arg):
+    np.exp(V[ins[0]], out=V[out])
+
+def _log_forward(V, out, ins, arg):
+    np.log(V[ins[0]], out=V[out])
+
+def _sigmoid_forward(V, out, ins, arg):
+    kernels.sigmoid(V[ins[0]], out=V[out])
+
+def _tanh_forward(V, out, ins, arg):
+    kernels.tanh(V[ins[0]], out=V[out])
+
+def _relu_forward(V, out, ins, arg):
+    kernels.relu(V[ins[0]], out=V[out])
+
+def _leaky_relu_forward(V, out, ins, arg):
+    kernels.leaky_relu(V[ins[0]], out=V[out])
+
+def _softmax_forward(V, out, ins, arg):
+    i, group, first = arg
+    if out != first:
+        return  # the whole group is computed with the member first in tape order
+    V[group] = kernels.softmax(V[list(ins)], axis=0)
+
+def _sum_forward(V, out, ins, arg):
+    constant, rows, _ = arg
+    if len(rows) == 0:
+        V[out] = constant
+        return
+    terms = V[rows]
+    terms[0] += constant
+    # reducing over the first axis adds the rows one after the other, like the dynamic node
+    np.add.reduce(terms, axis=0, out=V[out])
+
+def _dot_forward(V, out, ins, arg):
+    weights, inputs, constants, _, _ = arg
+    if constants is not None:
+        terms = V[weights] * constants[:, None]
+    else:
+        terms = V[weights] * V[weights if inputs is None else inputs]
+    np.add.reduce(terms, axis=0, out=V[out])
+
+
+def _add_backward(V, G, out, ins, arg):
+    G[ins[0]] += 1.0 * G[out]
+    G[ins[1]] += 1.0 * G[out]
+
+def _sub_backward(V, G, out, ins, arg):
+    G[ins[0]] += 1.0 * G[out]
+    G[ins[1]] -= 1.0 * G[out]
+
+def _mul_backward(V, G, out, ins, arg):
+    a, b = ins
+    G[a] += V[b] * G[out]
+    G[b] += V[a] * G[out]
+
+def _pow_backward(V, G, out, ins, arg):
+    G[ins[0]] += arg * (V[ins[0]] ** (arg - 1)) * G[out]
+
+def _exp_backward(V, G, out, ins, arg):
+    G[ins[0]] += G[out] * V[out]
+
+def _log_backward(V, G, out, ins, arg):
+    G[ins[0]] += G[out] * (V[ins[0]] ** -1)
+
+def _sigmoid_backward(V, G, out, ins, arg):
+    G[ins[0]] += kernels.sigmoid_backward(V[out], G[out])
+
+def _tanh_backward(V, G, out, ins, arg):
+    G[ins[0]] += kernels.tanh_backward(V[out], G[out])
+
+def _relu_backward(V, G, out, ins, arg):
+    G[ins[0]] += kernels.relu_backward(V[out], G[out])
+
+def _leaky_relu_backward(V, G, out, ins, arg):
+    G[ins[0]] += kernels.leaky_relu_backward(V[out], G[out])
+
+def _softmax_backward(V, G, out, ins, arg):
+    i, group, _ = arg
+    for j, row in enumerate(ins):
+        G[row] += V[out] * ((i == j) - V[group[j]]) * G[out]
+
+def _sum_backward(V, G, out, ins, arg):
+    _, rows, unique = arg
+    _accumulate(G, rows, G[out], unique)
+
+def _dot_backward(V, G, out, ins, arg):
+    weights, inputs, constants, unique_weights, unique_inputs = arg
+    g = G[out]
+    if constants is not None:
+        _accumulate(G, weights, constants[:, None] * g, unique_weights)
+    elif inputs is None:
+        _accumulate(G, weights, 2.0 * V[weights] * g, unique_weights)
+    else:
+        _accumulate(G, weights, V[inputs] * g, unique_weights)
+        _accumulate(G, inputs, V[weights] * g, unique_inputs)
+
+
+_FORWARD = [None] * len(Op)
+_FORWARD[Op.ADD] = _add_forward
+_FORWARD[Op.SUB] = _sub_forward
+_FORWARD[Op.MUL] = _mul_forward
+_FORWARD[Op.POW] = _pow_forward
+_FORWARD[Op.EXP] = _exp_forward
+_FORWARD[Op.LOG] = _log_forward
+_FORWARD[Op.SIGMOID] = _sigmoid_forward
+_FORWARD[Op.TANH] = _tanh_forward
+_FORWARD[Op.RELU] = _relu_forward
+_FORWARD[Op.LEAKY_RELU] = _leaky_relu_forward
+_FORWARD[Op.SOFTMAX] = _softmax_forward
+_FORWARD[Op.SUM] = _sum_forward
+_FORWARD[Op.DOT] = _dot_forward
+
+_BACKWARD = [None] * len(Op)
+_BACKWARD[Op.ADD] = _add_backward
+_BACKWARD[Op.SUB] = _sub_backward
+_BACKWARD[Op.MUL] = _mul_backward
+_BACKWARD[Op.POW] = _pow_backward
+_BACKWARD[Op.EXP] = _exp_backward
+_BACKWARD[Op.LOG] = _log_backward
+_BACKWARD[Op.SIGMOID] = _sigmoid_backward
+_BACKWARD[Op.TANH] = _tanh_backward
+_BACKWARD[Op.RELU] = _relu_backward
+_BACKWARD[Op.LEAKY_RELU] = _leaky_relu_backward
+_BACKWARD[Op.SOFTMAX] = _softmax_backward
+_BACKWARD[Op.SUM] = _sum_backward
+_BACKWARD[Op.DOT] = _dot_backward
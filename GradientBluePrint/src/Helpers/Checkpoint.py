@@ -0,0 +1,113 @@
+# code for saving models to and loading them from a binary checkpoint file
+"""
+Checkpoint layout (all integers little-endian):
+
+    8 bytes   magic b'GBPCKPT1'
+    8 bytes   uint64 length of the JSON header
+    n bytes   JSON header: model class, constructor config, labels, shapes and offsets
+              of the parameters, dtype and the byte offset of the data
+    padding   zeros up to a multiple of 64 bytes
+    raw       the model's flat parameter array (`flat_parameters().data`), float64
+
+The parameters are one contiguous array, so loading can memory-map them: only the
+header is read, and the pages of the weights are read from disk when first used.
+"""
+import sys, os
+import json
+import numpy as np
+
+# Get the parent directory
+parent_directory = sys.path[0]  # Assumes the script is in the parent directory
+
+# Add the parent directory to the Python path
+sys.path.append(os.path.dirname(os.path.dirname(parent_directory)))
+
+from src.Gradient.Parameters import skip_init
+
+MAGIC = b'GBPCKPT1'
+ALIGNMENT = 64
+DTYPE = '<f8'
+
+
+def save_model(model, path):
+    """
+    Writes a model's architecture and parameters to `path`.
+
+    Parameters:
+        model: A model with `get_config()` and `flat_parameters()`.
+        path (str): File to write.
+    """
+    flat = model.flat_parameters()
+    header = {
+        'model': type(model).__name__,
+        'config': model.get_config(),
+        'dtype': DTYPE,
+        'labels': flat.labels,
+        'shapes': [list(shape) for shape in flat.shapes],
+        'offsets': [int(offset) for offset in flat.offsets],
+    }
+    # the data offset is part of the header, so iterate until its length settles
+    data_offset = 0
+    while True:
+        header['data_offset'] = data_offset
+        encoded = json.dumps(header).encode('utf-8')
+        start = len(MAGIC) + 8 + len(encoded)
+        aligned = -(-start // ALIGNMENT) * ALIGNMENT
+        if aligned == data_offset:
+            break
+        data_offset = aligned
+    with open(path, 'wb') as f:
+        f.write(MAGIC)
+        f.write(len(encoded).to_bytes(8, 'little'))
+        f.write(encoded)
+        f.write(b'\0' * (data_offset - start))
+        f.write(np.ascontiguousarray(flat.data, dtype=DTYPE).tobytes())
+
+
+def read_header(path):
+    """
+    Reads the JSON header of a checkpoint.
+
+    Parameters:
+        path (str): Checkpoint file.
+
+    Returns:
+        dict: The header.
+    """
+    with open(path, 'rb') as f:
+        if f.read(len(MAGIC)) != MAGIC:
+            raise ValueError(f"{path} is not a model checkpoint")
+        length = int.from_bytes(f.read(8), 'little')
+        return json.loads(f.read(length).decode('utf-8'))
+
+
+def load_model(cls, path, mmap=True):
+    """
+    Rebuilds a model saved with `save_model`.
+
+    Parameters:
+        cls (type): The model class; must match the saved one.
+        path (str): Checkpoint file.
+        mmap (bool, optional): Memory-map the parameters (copy-on-write: training the
+            loaded model never modifies the file) instead of reading them into memory.
+            Defaults to True.
+
+    Returns:
+        The model, whose `flat_parameters().data` is the checkpoint's parameter array.
+    """
+    header = read_header(path)
+    if header['model'] != cls.__name__:
+        raise ValueError(f"{path} holds a {header['model']}, not a {cls.__name__}")
+    size = header['offsets'][-1]
+    if mmap:
+        data = np.memmap(path, dtype=header['dtype'], mode='c', offset=header['data_offset'], shape=(size,))
+    else:
+        data = np.fromfile(path, dtype=header['dtype'], count=size, offset=header['data_offset'])
+        if data.size != size:
+            raise ValueError(f"{path} is truncated: expected {size} parameters, found {data.size}")
+    with skip_init():  # the random initial values would be overwritten anyway
+        model = cls(**header['config'])
+    flat = model.flat_parameters(data)
+    if flat.labels != header['labels'] or [list(shape) for shape in flat.shapes] != header['shapes']:
+        raise ValueError(f"the parameters in {path} do not match a {cls.__name__}({header['config']})")
+    return model
@@ -6,13 +6,14 @@ def trace(root):
     Builds a set of all nodes and edges in a graph
     """
     nodes, edges = set(), set()
-    def build(v):
+    stack = [root]  # explicit stack, so deep graphs do not hit the recursion limit
+    while stack:
+        v = stack.pop()
         if v not in nodes:
             nodes.add(v)
             for children in v._prev:
                 edges.add((children, v))
-                build(children)
-    build(root)
+                stack.append(children)
     return nodes, edges
 
 
@@ -27,8 +28,12 @@ def draw_dot(root):
         # Return the identity of an object. This is guaranteed to be unique among simultaneously existing objects. (CPython uses the object's memory address.)
         uid = str(id(n)) 
         # for any value in the graph, create a rectangular ('record') node for it
-        dot.node(name = uid, label = "{ %s | data %.4f | gradient %.10f}" % (n.label, n.data, n.grad),
-                 shape='record',  style='filled', fillcolor='#F0F8FF')
+        if getattr(n.data, 'ndim', 0):
+            # Tensor nodes hold whole arrays, so only their shape is shown
+            label = "{ %s | shape %s }" % (n.label, n.data.shape)
+        else:
+            label = "{ %s | data %.4f | gradient %.10f}" % (n.label, n.data, n.grad)
+        dot.node(name = uid, label = label, shape='record',  style='filled', fillcolor='#F0F8FF')
         if n._op:
             # If this value is a result of some operations, create an _op node for it
             dot.node(name = uid + n._op, label = n._op)
@@ -5,7 +5,9 @@ parent_directory = sys.path[0]  # Assumes the script is in the parent directory
 
 # Add the parent directory to the Python path
 sys.path.append(parent_directory)
-from src.Gradient.Gradient import Variable
+from src.Gradient.Gradient import Variable, Op
+from src.Gradient.Tensor import Tensor
+from src.Gradient.Dual import Dual
 
 import math
 
@@ -24,15 +26,12 @@ class Activations(Variable):
         Returns:
             Variable: Output variable after applying the sigmoid function.
         """
+        if isinstance(self, (Tensor, Dual)):
+            return self.sigmoid()
         n = self.data
-        t = 1 / (1 + math.exp(-n))
-        output = Variable(t, _children=(self, ), _op='sigmoid')
-
-        def _backward():
-            self.grad += t * (1 - t) * output.grad
-
-        output._backward = _backward
-        return output
+        # only ever exponentiate a non-positive number, so large |n| cannot overflow
+        t = 1 / (1 + math.exp(-n)) if n >= 0 else math.exp(n) / (1 + math.exp(n))
+        return Variable(t, (self, ), Op.SIGMOID)
 
     @staticmethod
     def tanh(self):
@@ -42,15 +41,10 @@ class Activations(Variable):
         Returns:
             Variable: Output variable after applying the tanh function.
         """
-        n = self.data
-        t = (math.exp(2 * n) - 1) / (math.exp(2 * n) + 1)
-        output = Variable(t, _children=(self, ), _op='tanh')
-
-        def _backward():
-            self.grad += (1 - t ** 2) * output.grad
-
-        output._backward = _backward
-        return output
+        if isinstance(self, (Tensor, Dual)):
+            return self.tanh()
+        t = math.tanh(self.data)
+        return Variable(t, (self, ), Op.TANH)
 
     @staticmethod
     def relu(self):
@@ -60,18 +54,11 @@ class Activations(Variable):
         Returns:
             Variable: Output variable after applying the ReLU function.
         """
+        if isinstance(self, (Tensor, Dual)):
+            return self.relu()
         n = self.data
         t = n if n > 0 else 0
-        output = Variable(t, _children=(self, ), _op='relu')
-
-        def _backward():
-            if t > 0:
-                self.grad += 1 * output.grad
-            else:
-                self.grad += 0 * output.grad
-
-        output._backward = _backward
-        return output
+        return Variable(t, (self, ), Op.RELU)
 
     @staticmethod
     def leaky_relu(self):
@@ -81,18 +68,11 @@ class Activations(Variable):
         Returns:
             Variable: Output variable after applying the leaky ReLU function.
         """
+        if isinstance(self, (Tensor, Dual)):
+            return self.leaky_relu()
         n = self.data
         t = n if n > 0 else 0.01 * n
-        output = Variable(t, _children=(self, ), _op='leaky relu')
-
-        def _backward():
-            if t > 0:
-                self.grad += 1 * output.grad
-            else:
-                self.grad += 0.01 * output.grad
-
-        output._backward = _backward
-        return output
+        return Variable(t, (self, ), Op.LEAKY_RELU)
 
     @staticmethod
     def softmax(self):
@@ -102,21 +82,38 @@ class Activations(Variable):
         Returns:
             list: List of output variables after applying the softmax function.
         """
+        if isinstance(self, Tensor):
+            return self.softmax()
+        if any(isinstance(x, Dual) for x in self):
+            return Dual.softmax(self)
         n = [x.data for x in self]
-        exp_n = [math.exp(x) for x in n]
+        m = max(n)  # shift so the largest exponent is 0
+        exp_n = [math.exp(x - m) for x in n]
         sum_exp_n = sum(exp_n)
         t = [x / sum_exp_n for x in exp_n]
-        output = [Variable(t[i], _children=(self[i], ), _op='softmax') for i in range(len(t))]
+        children = tuple(self)
+        return [Variable(t[i], children, Op.SOFTMAX, _arg=(i, t)) for i in range(len(t))]
 
-        def _backward():
-            for i in range(len(self)):
-                for j in range(len(self)):
-                    if i == j:
-                        self[i].grad += t[i] * (1 - t[i]) * output[j].grad
-                    else:
-                        self[i].grad += -t[i] * t[j] * output[j].grad
+    @staticmethod
+    def softmax_cross_entropy(logits, label):
+        """
+        Computes -log(softmax(logits)[label]) as a single node. The value uses the
+        log-sum-exp trick, so large logits do not overflow, and the backward pass is
+        one O(k) loop (d/dx_j = t_j - [j == label]) instead of going through the k
+        softmax outputs.
 
-        for i in range(len(output)):
-            output[i]._backward = _backward
+        Parameters:
+            logits (list): Variables, one per class.
+            label (int): Index of the true class.
 
-        return output
+        Returns:
+            Variable: The cross-entropy loss.
+        """
+        label = int(label)
+        n = [x.data for x in logits]
+        m = max(n)
+        exp_n = [math.exp(x - m) for x in n]
+        sum_exp_n = sum(exp_n)
+        t = [x / sum_exp_n for x in exp_n]
+        data = m + math.log(sum_exp_n) - n[label]
+        return Variable(data, tuple(logits), Op.SOFTMAX_CROSS_ENTROPY, _arg=(label, t))
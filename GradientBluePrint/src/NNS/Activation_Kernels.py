@@ -0,0 +1,146 @@
+"""
+Array kernels of the activation functions.
+
+Every forward kernel takes an ndarray and returns the activation of all its entries
+with one vectorized expression: no Python loop and no branch per entry. The kernels
+are numerically stable for any finite input (no overflow in exp) and accept an `out`
+array, which may be the input itself to work in place.
+
+Every backward kernel takes the *output* y of the forward kernel and the upstream
+gradient, so a layer only has to keep its activations, and returns the gradient with
+respect to the input.
+"""
+import numpy as np
+
+
+def sigmoid(x, out=None):
+    """
+    Computes 1 / (1 + exp(-x)) as exp(min(x, 0)) / (1 + exp(-|x|)), which never
+    exponentiates a positive number.
+
+    Parameters:
+        x (ndarray): Input.
+        out (ndarray, optional): Where to write the result; may be x.
+
+    Returns:
+        ndarray: The sigmoid of x.
+    """
+    e = np.exp(-np.abs(x))
+    numerator = np.where(x >= 0, 1.0, e)
+    e += 1.0
+    return np.divide(numerator, e, out=out)
+
+
+def sigmoid_backward(y, grad, out=None):
+    """
+    Parameters:
+        y (ndarray): Output of `sigmoid`.
+        grad (ndarray): Gradient with respect to y.
+        out (ndarray, optional): Where to write the result.
+
+    Returns:
+        ndarray: Gradient with respect to the input, y * (1 - y) * grad.
+    """
+    return np.multiply(y * (1 - y), grad, out=out)
+
+
+def tanh(x, out=None):
+    """
+    Computes the hyperbolic tangent of x.
+
+    Parameters:
+        x (ndarray): Input.
+        out (ndarray, optional): Where to write the result; may be x.
+
+    Returns:
+        ndarray: tanh(x).
+    """
+    return np.tanh(x, out=out)
+
+
+def tanh_backward(y, grad, out=None):
+    """
+    Returns:
+        ndarray: Gradient with respect to the input, (1 - y ** 2) * grad.
+    """
+    return np.multiply(1 - y ** 2, grad, out=out)
+
+
+def relu(x, out=None):
+    """
+    Computes max(x, 0).
+
+    Parameters:
+        x (ndarray): Input.
+        out (ndarray, optional): Where to write the result; may be x.
+
+    Returns:
+        ndarray: relu(x).
+    """
+    return np.maximum(x, 0.0, out=out)
+
+
+def relu_backward(y, grad, out=None):
+    """
+    Returns:
+        ndarray: Gradient with respect to the input, grad where y > 0 and 0 elsewhere.
+    """
+    return np.multiply(y > 0, grad, out=out)
+
+
+def leaky_relu(x, slope=0.01, out=None):
+    """
+    Computes x for x > 0 and slope * x otherwise, as max(x, slope * x) for slope < 1.
+
+    Parameters:
+        x (ndarray): Input.
+        slope (float, optional): Slope for negative inputs. Defaults to 0.01.
+        out (ndarray, optional): Where to write the result; may be x.
+
+    Returns:
+        ndarray: leaky_relu(x).
+    """
+    return np.maximum(x, slope * x, out=out)
+
+
+def leaky_relu_backward(y, grad, slope=0.01, out=None):
+    """
+    Returns:
+        ndarray: Gradient with respect to the input, grad where y > 0 and slope * grad elsewhere.
+    """
+    return np.multiply(np.where(y > 0, 1.0, slope), grad, out=out)
+
+
+def softmax(x, axis=-1, out=None):
+    """
+    Computes exp(x) / sum(exp(x)) along `axis`, after subtracting the maximum so
+    the largest exponent is 0.
+
+    Parameters:
+        x (ndarray): Input, e.g. (batch, k) logits.
+        axis (int, optional): The class axis. Defaults to -1.
+        out (ndarray, optional): Where to write the result; may be x.
+
+    Returns:
+        ndarray: softmax(x) along axis.
+    """
+    x = np.asarray(x, dtype=float)  # integer logits would make out an integer array
+    out = np.subtract(x, x.max(axis=axis, keepdims=True), out=out)
+    np.exp(out, out=out)
+    out /= out.sum(axis=axis, keepdims=True)
+    return out
+
+
+def softmax_backward(y, grad, axis=-1, out=None):
+    """
+    Applies the softmax Jacobian in O(k): y * (grad - sum(grad * y)) along `axis`.
+
+    Returns:
+        ndarray: Gradient with respect to the input.
+    """
+    return np.multiply(y, grad - (grad * y).sum(axis=axis, keepdims=True), out=out)
+
+
+FORWARD = {'sigmoid': sigmoid, 'tanh': tanh, 'relu': relu, 'leaky_relu': leaky_relu, 'softmax': softmax}
+BACKWARD = {'sigmoid': sigmoid_backward, 'tanh': tanh_backward, 'relu': relu_backward,
+            'leaky_relu': leaky_relu_backward, 'softmax': softmax_backward}
@@ -1,6 +1,7 @@
 import sys
-import random
+import time
 from typing import List
+import numpy as np
 
 # Get the parent directory
 parent_directory = sys.path[0]  # Assumes the script is in the parent directory
@@ -8,8 +9,16 @@ parent_directory = sys.path[0]  # Assumes the script is in the parent directory
 # Add the parent directory to the Python path
 sys.path.append(parent_directory)
 from src.Helpers.DrawGraph import draw_dot
-from src.Gradient.Gradient import Variable
-from Activation_Functions import Activations
+from src.Gradient.Gradient import Variable, no_grad, is_grad_enabled
+from src.Gradient.Tensor import Tensor
+from src.Gradient.Parameters import ParameterBuffer, uniform, scalar_uniform
+from src.Helpers.Checkpoint import save_model, load_model
+from src.Gradient.Trace import trace
+from src.Gradient.Parallel import DataParallel, predict_in_chunks
+from src.NNS.Activation_Functions import Activations
+from src.NNS import Activation_Kernels as kernels
+from src.Cost_functions.Cost_functions import CostFunction
+from src.Optimizers.optimizers import LBFGS, make_optimizer
 
 class Neuron:
     def __init__(self, input_d, layer_index, node_index, activation='linear'):
@@ -22,8 +31,8 @@ class Neuron:
             node_index (int): Index of the neuron within the layer.
             activation (str, optional): Activation function type. Defaults to 'linear'.
         """
-        self.w = [Variable(random.uniform(-1, 1), label=f"Layer{layer_index}_node{node_index}_W{_}") for _ in range(input_d)]
-        self.b = Variable(random.uniform(-1, 1), label=f"Layer{layer_index}_node{node_index}_b")
+        self.w = [Variable(scalar_uniform(), label=f"Layer{layer_index}_node{node_index}_W{_}") for _ in range(input_d)]
+        self.b = Variable(scalar_uniform(), label=f"Layer{layer_index}_node{node_index}_b")
         self.activation = activation
 
     def __call__(self, x):
@@ -31,14 +40,16 @@ class Neuron:
         Computes the output of the neuron given input.
 
         Parameters:
-            x (list): Input to the neuron.
+            x (list or Tensor): Input to the neuron, or a (batch, input_d) Tensor.
 
         Returns:
-            float: Output of the neuron.
+            float or Tensor: Output of the neuron.
         """
-        act = sum((w_i * x_i for w_i, x_i in zip(self.w, x)), self.b)
-        activation_function = getattr(Activations, self.activation)
-        output = activation_function(act) if self.activation != 'linear' else act
+        if isinstance(x, Tensor):
+            act = x @ Tensor.from_variables(self.w) + Tensor.from_variables([self.b])
+            return getattr(Activations, self.activation)(act) if self.activation != 'linear' else act
+        act = Variable.dot(self.w, x) + self.b
+        output = getattr(Activations, self.activation)(act) if self.activation != 'linear' else act
         return output
 
     def parameters(self):
@@ -78,11 +89,19 @@ class Layer:
         Computes the output of the layer given input.
 
         Parameters:
-            x (list): Input to the layer.
+            x (list or Tensor): Input to the layer, or a (batch, neuron_dim) Tensor.
 
         Returns:
-            list: Output of the layer.
+            list or Tensor: Output of the layer. A batched input gives a
+                (batch, layer_dim) Tensor computed with one matrix product.
         """
+        if isinstance(x, Tensor):
+            activation = self.neurons[0].activation
+            W = Tensor.from_variables([neuron.w for neuron in self.neurons])
+            b = Tensor.from_variables([neuron.b for neuron in self.neurons])
+            act = x @ W.T + b
+            output = getattr(Activations, activation)(act) if activation != 'linear' else act
+            return output.reshape(-1) if len(self.neurons) == 1 else output
         outputs = [neuron(x) for neuron in self.neurons]
         return outputs[0] if len(outputs) == 1 else outputs
 
@@ -105,8 +124,136 @@ class Layer:
         """
         return f"Layer of [{', '.join(str(n) for n in self.neurons)}]"
 
+class Dense:
+    def __init__(self, input_dim, output_dim, layer_index, activation='linear'):
+        """
+        Initializes a fully connected layer whose parameters are whole arrays: the
+        weights W of shape (input_dim, output_dim) and the bias b of shape
+        (output_dim,), both Tensors. It computes what a `Layer` of output_dim
+        neurons computes, with one matrix product for a whole batch.
+
+        Parameters:
+            input_dim (int): Number of inputs.
+            output_dim (int): Number of outputs (neurons).
+            layer_index (int): Index of the layer.
+            activation (str, optional): Activation function type: 'linear' or one of
+                `Activation_Kernels.FORWARD`. Defaults to 'linear'.
+        """
+        if activation != 'linear' and activation not in kernels.FORWARD:
+            raise ValueError(f"unknown activation {activation!r}; expected 'linear' or one of {sorted(kernels.FORWARD)}")
+        self.W = Tensor(uniform((input_dim, output_dim)), label=f"Layer{layer_index}_W")
+        self.b = Tensor(uniform(output_dim), label=f"Layer{layer_index}_b")
+        self.activation = activation
+        self._activation = kernels.FORWARD.get(activation)  # None for 'linear'
+        self._activation_backward = kernels.BACKWARD.get(activation)
+        self._input = None
+        self._output = None
+
+    def __call__(self, x):
+        """
+        Computes the output of the layer.
+
+        Parameters:
+            x (Tensor or array_like): A (batch, input_dim) Tensor, recorded in the
+                Tensor graph; one sample of Variables or Duals (e.g. from `jvp`); or
+                an array, run through `forward`.
+
+        Returns:
+            Tensor, list or numpy.ndarray: Output of shape (batch, output_dim), or
+                (batch,) for a single-output Tensor layer. One sample of Variables
+                gives a list of output_dim Variables, or one Variable, like a `Layer`.
+        """
+        if isinstance(x, Tensor):
+            act = x @ self.W + self.b
+            output = getattr(Activations, self.activation)(act) if self.activation != 'linear' else act
+            return output.reshape(-1) if self.W.shape[1] == 1 else output
+        if not (isinstance(x, np.ndarray) and x.dtype != object):
+            sample = np.asarray(x, dtype=object).reshape(-1)
+            if any(isinstance(x_i, Variable) for x_i in sample):
+                return self._sample(sample)
+        return self.forward(x)
+
+    def _sample(self, x):
+        """
+        The layer on one sample of Variables (or Duals), one scalar operation at a
+        time. W and b enter as constants, so only the input is differentiated.
+        """
+        act = []
+        for column, bias in zip(self.W.data.T, self.b.data):
+            total = x[0] * float(column[0])
+            for x_i, w in zip(x[1:], column[1:]):
+                total = total + x_i * float(w)
+            act.append(total + float(bias))
+        if self.activation == 'softmax':
+            outputs = Activations.softmax(act)
+        elif self.activation != 'linear':
+            outputs = [getattr(Activations, self.activation)(a) for a in act]
+        else:
+            outputs = act
+        return outputs[0] if len(outputs) == 1 else outputs
+
+    def forward(self, X):
+        """
+        Runs the layer on a batch without building a graph, keeping the input and
+        the output for `backward` unless grad mode is off (`no_grad`, as in
+        `predict`), so concurrent predicts share no layer state. The activation is
+        applied in place.
+
+        Parameters:
+            X (array_like): Input of shape (batch, input_dim).
+
+        Returns:
+            numpy.ndarray: Output of shape (batch, output_dim).
+        """
+        X = np.asarray(X, dtype=float)
+        if X.ndim == 1:
+            X = X.reshape(1, -1)
+        output = X @ self.W.data
+        output += self.b.data
+        if self._activation is not None:
+            self._activation(output, out=output)
+        if is_grad_enabled():
+            self._input, self._output = X, output
+        return output
+
+    def backward(self, grad):
+        """
+        Back-propagates through the last `forward` call: adds dL/dW and dL/db to
+        W.grad and b.grad and returns dL/dX.
+
+        Parameters:
+            grad (numpy.ndarray): dL/d(output), shape (batch, output_dim).
+
+        Returns:
+            numpy.ndarray: dL/d(input), shape (batch, input_dim).
+        """
+        if self._activation_backward is not None:
+            grad = self._activation_backward(self._output, grad)
+        self.W.grad += self._input.T @ grad
+        self.b.grad += grad.sum(axis=0)
+        return grad @ self.W.data.T
+
+    def parameters(self):
+        """
+        Get the parameters of the layer.
+
+        Returns:
+            list: [W, b].
+        """
+        return [self.W, self.b]
+
+    def __repr__(self):
+        """
+        Representation of the layer.
+
+        Returns:
+            str: String representation of the layer.
+        """
+        return f"{self.activation} Dense({self.W.shape[0]}, {self.W.shape[1]})"
+
 class MLP:
-    def __init__(self, input_dim: int, layers_dim: List[int], activations: List[str] = ['linear']):
+    def __init__(self, input_dim: int, layers_dim: List[int], activations: List[str] = ['linear'],
+                 dense: bool = False):
         """
         Initializes a Multi-Layer Perceptron.
 
@@ -115,30 +262,275 @@ class MLP:
             layers_dim (List[int]): List of integers representing dimensions of each layer.
             activations (List[str], optional): List of activation function types.
                 Defaults to ['linear'].
+            dense (bool, optional): Build the MLP from array-backed `Dense` layers
+                instead of `Layer`s of scalar `Neuron`s. Defaults to False.
         """
         sizes = [input_dim] + layers_dim
         
         if len(activations)==1:
             activations = activations * len(layers_dim)
         
-        self.layers = {"layer_{}".format(i+1):Layer(sizes[i], sizes[i+1],
-                                                    layer_index=i+1,
-                                                    activation=activations[i]) for i in range(len(layers_dim))}
-        
+        layer_type = Dense if dense else Layer
+        self.layers = {"layer_{}".format(i+1):layer_type(sizes[i], sizes[i+1],
+                                                         layer_index=i+1,
+                                                         activation=activations[i]) for i in range(len(layers_dim))}
+        self.dense = dense
+        self.input_dim = input_dim
+        self._program = None
+        self._flat = None
+
     def __call__(self,x):
         """
         Forward pass through the MLP.
 
         Parameters:
-            x (list): Input data.
+            x (list or Tensor): Input data, or a (batch, input_dim) Tensor.
 
         Returns:
-            list: Output of the MLP.
+            list or Tensor: Output of the MLP.
         """
         for layer in self.layers:
             x = self.layers[layer](x) # Forward pass
         return x
 
+    def forward(self, X):
+        """
+        Runs a `Dense` MLP on a batch without building a graph; see `Dense.forward`.
+
+        Parameters:
+            X (array_like): Input data of shape (batch, input_dim).
+
+        Returns:
+            numpy.ndarray: Output of shape (batch, output_dim).
+        """
+        for layer in self.layers.values():
+            X = layer.forward(X)
+        return X
+
+    def backward(self, grad):
+        """
+        Back-propagates dL/d(output) of the last `forward` call through every
+        `Dense` layer, accumulating the parameter gradients in their `.grad`.
+
+        Parameters:
+            grad (numpy.ndarray): dL/d(output), shape (batch, output_dim).
+
+        Returns:
+            numpy.ndarray: dL/d(input), shape (batch, input_dim).
+        """
+        for layer in reversed(list(self.layers.values())):
+            grad = layer.backward(grad)
+        return grad
+
+    def fit(self, X, y, loss='sse', optimizer='SGD', batch_size=32, epochs=10, learning_rate=0.001,
+            shuffle=True, n_jobs=1, schedule=None, clip_norm=None, clip_value=None):
+        """
+        Trains the MLP. Every step runs one minibatch as a single batched forward and
+        backward pass: the `Dense` layers directly, a `Neuron` MLP through its
+        compiled program. The gradients are summed into the flat gradient buffer of
+        `flat_parameters()`, which is reused from step to step, and the optimizer
+        takes the mean with one array update.
+
+        Parameters:
+            X (array_like): Input data of shape (n_samples, input_dim).
+            y (array_like): Targets: (n_samples,) or (n_samples, n_outputs), or class
+                indices (n_samples, 1) for 'categorical_cross_entropy_loss'. With several
+                outputs, the loss of a sample is summed over them.
+            loss (str or callable, optional): Name of a `CostFunction` loss ('sse',
+                'log_loss', 'hinge_loss', or 'categorical_cross_entropy_loss' for a
+                dense MLP, the only kind with a softmax output; ValueError otherwise) or a
+                `CostFunction` method. Defaults to 'sse'.
+            optimizer (str or Optimizer, optional): 'SGD' for shuffled minibatches of
+                batch_size, 'BGD' for one step on the whole data per epoch, or a stateful
+                optimizer taking a step per minibatch: 'Momentum', 'Nesterov', 'AdaGrad',
+                'RMSProp', 'Adam'; 'LBFGS' for one full-batch quasi-Newton iteration per
+                epoch until converged; or an `Optimizer` built on `flat_parameters()`.
+                Defaults to 'SGD'.
+            batch_size (int, optional): Minibatch size for 'SGD'. Defaults to 32.
+            epochs (int, optional): Number of passes over the data. Defaults to 10.
+            learning_rate (float, optional): Learning rate. Defaults to 0.001.
+            shuffle (bool, optional): Reshuffle the samples every epoch. Defaults to True.
+            n_jobs (int, optional): Number of worker processes sharing each minibatch
+                (see `DataParallel`). Defaults to 1, no worker processes.
+            schedule (Schedule, optional): Learning-rate schedule applied by the optimizer
+                (see `src/Optimizers/schedules.py`). Defaults to None.
+            clip_norm (float, optional): Largest global L2 norm of the gradient of a step.
+                Defaults to None.
+            clip_value (float, optional): Largest magnitude of any gradient entry of a step.
+                Defaults to None.
+
+        Returns:
+            list: One dict per epoch with the mean 'loss' and the throughput 'samples_per_sec'.
+        """
+        cost_function = getattr(CostFunction, loss) if isinstance(loss, str) else loss
+        if cost_function == CostFunction.categorical_cross_entropy_loss and not self.dense:
+            raise ValueError("'categorical_cross_entropy_loss' needs softmax outputs; build the MLP with dense=True")
+        flat = self.flat_parameters()
+        full_batch = optimizer == 'BGD'
+        optimizer = make_optimizer(optimizer, flat, learning_rate, schedule, clip_norm, clip_value)
+        flat.zero_grad()  # the gradients are accumulated into flat.grad
+        X, y = np.asarray(X, dtype=float), np.asarray(y)
+        n_samples = X.shape[0]
+        batch_size = n_samples if full_batch or batch_size is None else batch_size
+        if self.dense:
+            batched = CostFunction.batched(cost_function)
+            assert batched is not None, "a Dense MLP needs a CostFunction loss with a batch version"
+        else:
+            program = self.compile()
+        workers = DataParallel(self, X, y, cost_function, n_jobs) if n_jobs > 1 else None
+
+        def accumulate(batch):
+            """Adds the summed gradient of the samples in batch to flat.grad and returns their summed loss."""
+            Xb, yb = X[batch], y[batch]
+            if workers is not None:
+                losses, _ = workers.per_sample_gradients(batch, reduction='sum', out=flat.grad)
+                return losses.sum()
+            if self.dense:
+                output = self.forward(Xb)
+                y_hat = Tensor(output.reshape(-1) if output.shape[1] == 1 else output)
+                batch_loss = batched(y_hat, yb, reduction='sum')
+                batch_loss.backward()
+                self.backward(y_hat.grad.reshape(output.shape))
+                return float(batch_loss.data)
+            losses, _ = program.per_sample_gradients(Xb, yb, cost_function, reduction='sum', out=flat.grad)
+            return losses.sum()
+
+        if isinstance(optimizer, LBFGS):
+            # full batch: one quasi-Newton iteration per epoch, on the mean loss
+            optimizer.reset(history=False)  # a cached gradient from an earlier fit may be for other data
+            everything = np.arange(n_samples)
+
+            def closure():
+                flat.zero_grad()
+                loss = accumulate(everything) / n_samples
+                flat.grad /= n_samples
+                return loss
+
+        history = []
+        for epoch in range(epochs):
+            start = time.perf_counter()
+            if isinstance(optimizer, LBFGS):
+                total_loss = optimizer.step(closure) * n_samples
+            else:
+                order = np.random.permutation(n_samples) if shuffle else np.arange(n_samples)
+                total_loss = 0.0
+                for first in range(0, n_samples, batch_size):
+                    batch = order[first:first + batch_size]
+                    total_loss += accumulate(batch)
+                    optimizer.step(len(batch))
+                    optimizer.zero_grad()
+            elapsed = time.perf_counter() - start
+            optimizer.end_epoch(total_loss / n_samples)
+            history.append({'loss': total_loss / n_samples, 'samples_per_sec': n_samples / elapsed})
+            print(f"Epoch {epoch}, Loss: {total_loss / n_samples}, {n_samples / elapsed:.0f} samples/sec")
+            if getattr(optimizer, 'converged', False):
+                break
+        if workers is not None:
+            workers.close()
+        return history
+
+    def get_config(self):
+        """
+        Get the constructor arguments of the model, as stored by `save`.
+
+        Returns:
+            dict: Keyword arguments that rebuild the same architecture.
+        """
+        layers = list(self.layers.values())
+        if self.dense:
+            layers_dim = [layer.W.shape[1] for layer in layers]
+            activations = [layer.activation for layer in layers]
+        else:
+            layers_dim = [len(layer.neurons) for layer in layers]
+            activations = [layer.neurons[0].activation for layer in layers]
+        return {'input_dim': self.input_dim, 'layers_dim': layers_dim, 'activations': activations,
+                'dense': self.dense}
+
+    def save(self, path):
+        """
+        Saves the architecture and the parameters to a binary checkpoint: a JSON
+        header followed by the flat parameter array (see `src/Helpers/Checkpoint.py`).
+
+        Parameters:
+            path (str): File to write.
+        """
+        save_model(self, path)
+
+    @classmethod
+    def load(cls, path, mmap=True):
+        """
+        Loads a model written by `save`.
+
+        Parameters:
+            path (str): Checkpoint file.
+            mmap (bool, optional): Memory-map the parameters instead of reading them, so
+                their values are read from disk when first used. A Dense MLP then reads
+                only the header up front; a Neuron MLP still builds one Parameter per
+                weight. Defaults to True.
+
+        Returns:
+            MLP: The model, with its parameters in `flat_parameters()`.
+        """
+        return load_model(cls, path, mmap)
+
+    def flat_parameters(self, data=None):
+        """
+        Moves the parameters into one contiguous `ParameterBuffer`. The `Neuron`
+        weights become `Parameter` views into `buffer.data` / `buffer.grad`, and the
+        `W` / `b` arrays of `Dense` layers become reshaped slices of them, so
+        optimizer steps, gradient zeroing, norms and clipping are single array operations.
+
+        Parameters:
+            data (ndarray, optional): Flat array to adopt as the parameter values when
+                the buffer is created, instead of the current ones (see `load`).
+
+        Returns:
+            ParameterBuffer: The MLP's parameters and gradients as flat arrays.
+        """
+        if self._flat is None:
+            self._flat = ParameterBuffer(self.parameters(), data)
+            if not self.dense:
+                parameters = iter(self._flat.parameters)
+                for layer in self.layers.values():
+                    for neuron in layer.neurons:
+                        neuron.w = [next(parameters) for _ in neuron.w]
+                        neuron.b = next(parameters)
+            self._program = None  # the compiled program refers to the replaced Variables
+        return self._flat
+
+    def compile(self):
+        """
+        Traces the MLP once into a `Program` that runs whole batches without
+        building a graph per sample. A `Dense` MLP already does, and is not traced.
+
+        Returns:
+            Program: The compiled MLP.
+        """
+        assert not self.dense, "a Dense MLP runs batches directly, see forward()"
+        if self._program is None:
+            self._program = trace(self, self.input_dim)
+        return self._program
+
+    @no_grad()
+    def predict(self, X, chunk_size=8192, n_jobs=1, backend='thread'):
+        """
+        Predicts the output for a batch of inputs with the compiled MLP (the `Dense`
+        layers for a Dense MLP), chunk by chunk into one preallocated array.
+
+        Parameters:
+            X (array_like): Input data, (n_samples, input_dim).
+            chunk_size (int, optional): Rows evaluated at a time, which bounds the work
+                memory. Defaults to 8192.
+            n_jobs (int, optional): Number of threads or processes evaluating the chunks
+                (see `predict_in_chunks`). Defaults to 1.
+            backend (str, optional): 'thread' or 'process'. Defaults to 'thread'.
+
+        Returns:
+            numpy.ndarray: Predicted outputs, (n_samples,) when the last layer has one
+                neuron and (n_samples, n_outputs) otherwise.
+        """
+        return predict_in_chunks(self, X, chunk_size, n_jobs, backend)
+
     def parameters(self):
         """
         Get all parameters of the MLP.
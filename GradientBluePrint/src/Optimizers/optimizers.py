@@ -1,41 +1,477 @@
+import numbers
+from abc import ABC, abstractmethod
 import numpy as np
 
+from src.Gradient.Parameters import ParameterBuffer
+from src.Gradient.Trace import flatten_parameters
+
 class Optimizers:
     @staticmethod
-    def SGD(parameters, gradients, learning_rate, multiclass=False):
+    def SGD(parameters, learning_rate, *, batch_size=1, multiclass=False):
         """
-        Performs stochastic gradient descent optimization.
+        Performs a stochastic gradient descent step with the gradients accumulated in
+        place: summed into each parameter's `grad` by `backward()`, or into the `grad`
+        array of a model's `flat_parameters()`. The step uses their mean over the
+        batch_size samples and zeroes them, so the memory is one gradient per
+        parameter whatever the batch size.
 
         Parameters:
-            parameters (list): List of parameters (e.g., weights and biases).
-            gradients (dict): Dictionary containing gradients for each parameter.
+            parameters (list or ParameterBuffer): List of parameters (e.g., weights and biases),
+                possibly nested, or a model's `flat_parameters()`.
             learning_rate (float): Learning rate for the optimization.
-            multiclass (bool, optional): Flag indicating if the problem is multiclass. Defaults to False.
+            batch_size (int, optional): Number of samples summed into the gradients, by keyword.
+                Defaults to 1.
+            multiclass (bool, optional): Flag indicating if the problem is multiclass (a list of
+                parameter lists). Nested lists are handled either way. Defaults to False.
         """
-        if multiclass:
-            for parameter in parameters:
-                for p in parameter:
-                    p.data += -learning_rate * np.mean(gradients[p.label])
-        else:
-            for p in parameters:
-                p.data += -learning_rate * np.mean(gradients[p.label])
+        if not isinstance(learning_rate, numbers.Real):
+            # the gradients dict of the former SGD(parameters, gradients, learning_rate) signature
+            raise TypeError(f"learning_rate must be a number, got {type(learning_rate).__name__}; "
+                            "the gradients are now read from the parameters' grad")
+        Optimizers.batch_gradient_descent(parameters, learning_rate, batch_size, multiclass)
 
     @staticmethod
     def batch_gradient_descent(parameters, learning_rate, batch_size, multiclass=False):
         """
-        Performs batch gradient descent optimization.
+        Performs batch gradient descent optimization with the gradients accumulated in
+        each parameter's `grad` (or in the `grad` array of a `flat_parameters()`),
+        and zeroes them.
 
         Parameters:
-            parameters (list): List of parameters (e.g., weights and biases).
+            parameters (list or ParameterBuffer): List of parameters (e.g., weights and biases),
+                possibly nested, or a model's `flat_parameters()`, which is updated and zeroed
+                in one step.
             learning_rate (float): Learning rate for the optimization.
             batch_size (int): Size of the mini-batch.
-            multiclass (bool, optional): Flag indicating if the problem is multiclass. Defaults to False.
-        """
-        if multiclass:
-            for parameter in parameters:
-                for p in parameter:
-                    p.data += -learning_rate * p.grad / batch_size
-        else:
-            for p in parameters:
-                p.data += -learning_rate * p.grad / batch_size
+            multiclass (bool, optional): Flag indicating if the problem is multiclass (a list of
+                parameter lists). Nested lists are handled either way. Defaults to False.
+        """
+        if isinstance(parameters, ParameterBuffer):
+            parameters.data += -learning_rate * parameters.grad / batch_size
+            parameters.zero_grad()
+            return
+        for p in flatten_parameters(parameters):
+            p.data += -learning_rate * p.grad / batch_size
+            if isinstance(p.grad, np.ndarray):
+                p.grad.fill(0.0)  # array parameters keep their gradient buffer for the next step
+            else:
                 p.grad = 0.0
+
+
+class Optimizer(ABC):
+    def __init__(self, parameters, learning_rate=0.001, schedule=None, clip_norm=None, clip_value=None):
+        """
+        Base class of the stateful optimizers. An optimizer works on a model's
+        `flat_parameters()`: its state (velocity, moments) is kept in arrays laid out
+        like `parameters.data`, and every `step()` updates all parameters with a few
+        vectorized array operations. Subclasses define `_update`.
+
+        Parameters:
+            parameters (ParameterBuffer): The model's `flat_parameters()`.
+            learning_rate (float, optional): Learning rate. Defaults to 0.001.
+            schedule (Schedule, optional): Sets the learning rate of every step from
+                `learning_rate` and the step count (see `src/Optimizers/schedules.py`).
+                Defaults to None, a constant learning rate.
+            clip_norm (float, optional): Rescale the gradient of every step so its global
+                L2 norm is at most clip_norm. Defaults to None.
+            clip_value (float, optional): Clip every gradient entry of every step to
+                [-clip_value, clip_value]. Defaults to None.
+        """
+        assert isinstance(parameters, ParameterBuffer), "optimizers work on a model's flat_parameters()"
+        self.parameters = parameters
+        self.initial_learning_rate = learning_rate
+        self.learning_rate = learning_rate
+        self.schedule = schedule
+        self.clip_norm = clip_norm
+        self.clip_value = clip_value
+        self.iterations = 0
+
+    def step(self, batch_size=1):
+        """
+        Updates the parameters with the gradient accumulated in `parameters.grad`.
+        The gradient is averaged and clipped in place first, so afterwards
+        `parameters.grad` holds the gradient of the update.
+
+        Parameters:
+            batch_size (int, optional): Number of samples summed into the gradient;
+                the update uses their mean. Defaults to 1.
+        """
+        if batch_size != 1:
+            self.parameters.grad /= batch_size
+        if self.clip_value is not None:
+            self.parameters.clip_grad_value(self.clip_value)
+        if self.clip_norm is not None:
+            self.parameters.clip_grad_norm(self.clip_norm)
+        if self.schedule is not None:
+            self.learning_rate = self.schedule(self.initial_learning_rate, self.iterations)
+        self.iterations += 1
+        self._update(self.parameters.grad)
+
+    def zero_grad(self):
+        """
+        Sets the accumulated gradient to zero, in place.
+        """
+        self.parameters.zero_grad()
+
+    def end_epoch(self, loss):
+        """
+        Reports the loss of an epoch to the schedule (see `ReduceOnPlateau`).
+
+        Parameters:
+            loss (float): Training loss of the epoch.
+        """
+        if self.schedule is not None:
+            self.schedule.observe(loss)
+
+    @abstractmethod
+    def _update(self, gradient):
+        """
+        Updates `parameters.data` in place from the averaged, clipped gradient.
+
+        Parameters:
+            gradient (numpy.ndarray): The gradient, laid out like `parameters.data`.
+        """
+
+    def __repr__(self):
+        return f"{type(self).__name__}(learning_rate={self.learning_rate})"
+
+
+class GradientDescent(Optimizer):
+    """
+    Plain gradient descent, w -= learning_rate * g: the 'SGD' and
+    'batch_gradient_descent' / 'BGD' of `fit`, with a schedule and clipping.
+    """
+
+    def _update(self, gradient):
+        self.parameters.data -= self.learning_rate * gradient
+
+
+class Momentum(Optimizer):
+    def __init__(self, parameters, learning_rate=0.001, momentum=0.9, **options):
+        """
+        Gradient descent with momentum: v = momentum * v - learning_rate * g, then w += v.
+
+        Parameters:
+            parameters (ParameterBuffer): The model's `flat_parameters()`.
+            learning_rate (float, optional): Learning rate. Defaults to 0.001.
+            momentum (float, optional): Decay of the velocity. Defaults to 0.9.
+            **options: schedule, clip_norm and clip_value (see `Optimizer`).
+        """
+        super().__init__(parameters, learning_rate, **options)
+        self.momentum = momentum
+        self.velocity = np.zeros_like(parameters.data)
+
+    def _update(self, gradient):
+        self.velocity *= self.momentum
+        self.velocity -= self.learning_rate * gradient
+        self.parameters.data += self.velocity
+
+
+class Nesterov(Momentum):
+    """
+    Nesterov accelerated gradient, in the form that keeps the parameters at the
+    current point: v = momentum * v - learning_rate * g, then
+    w += momentum * v - learning_rate * g.
+    """
+
+    def _update(self, gradient):
+        step = self.learning_rate * gradient
+        self.velocity *= self.momentum
+        self.velocity -= step
+        self.parameters.data += self.momentum * self.velocity - step
+
+
+class AdaGrad(Optimizer):
+    def __init__(self, parameters, learning_rate=0.01, epsilon=1e-8, **options):
+        """
+        AdaGrad: every parameter's step is divided by the root of its summed squared gradients.
+
+        Parameters:
+            parameters (ParameterBuffer): The model's `flat_parameters()`.
+            learning_rate (float, optional): Learning rate. Defaults to 0.01.
+            epsilon (float, optional): Added to the denominator. Defaults to 1e-8.
+            **options: schedule, clip_norm and clip_value (see `Optimizer`).
+        """
+        super().__init__(parameters, learning_rate, **options)
+        self.epsilon = epsilon
+        self.sum_squares = np.zeros_like(parameters.data)
+
+    def _update(self, gradient):
+        self.sum_squares += gradient ** 2
+        self.parameters.data -= self.learning_rate * gradient / (np.sqrt(self.sum_squares) + self.epsilon)
+
+
+class RMSProp(Optimizer):
+    def __init__(self, parameters, learning_rate=0.001, rho=0.9, epsilon=1e-8, **options):
+        """
+        RMSProp: every parameter's step is divided by the root of a moving average of
+        its squared gradients.
+
+        Parameters:
+            parameters (ParameterBuffer): The model's `flat_parameters()`.
+            learning_rate (float, optional): Learning rate. Defaults to 0.001.
+            rho (float, optional): Decay of the moving average. Defaults to 0.9.
+            epsilon (float, optional): Added to the denominator. Defaults to 1e-8.
+            **options: schedule, clip_norm and clip_value (see `Optimizer`).
+        """
+        super().__init__(parameters, learning_rate, **options)
+        self.rho = rho
+        self.epsilon = epsilon
+        self.mean_square = np.zeros_like(parameters.data)
+
+    def _update(self, gradient):
+        self.mean_square *= self.rho
+        self.mean_square += (1 - self.rho) * gradient ** 2
+        self.parameters.data -= self.learning_rate * gradient / (np.sqrt(self.mean_square) + self.epsilon)
+
+
+class Adam(Optimizer):
+    def __init__(self, parameters, learning_rate=0.001, beta1=0.9, beta2=0.999, epsilon=1e-8, **options):
+        """
+        Adam: moving averages of the gradient (first moment) and of its square
+        (second moment), both corrected for their zero initialization.
+
+        Parameters:
+            parameters (ParameterBuffer): The model's `flat_parameters()`.
+            learning_rate (float, optional): Learning rate. Defaults to 0.001.
+            beta1 (float, optional): Decay of the first moment. Defaults to 0.9.
+            beta2 (float, optional): Decay of the second moment. Defaults to 0.999.
+            epsilon (float, optional): Added to the denominator. Defaults to 1e-8.
+            **options: schedule, clip_norm and clip_value (see `Optimizer`).
+        """
+        super().__init__(parameters, learning_rate, **options)
+        self.beta1, self.beta2 = beta1, beta2
+        self.epsilon = epsilon
+        self.first_moment = np.zeros_like(parameters.data)
+        self.second_moment = np.zeros_like(parameters.data)
+
+    def _update(self, gradient):
+        self.first_moment *= self.beta1
+        self.first_moment += (1 - self.beta1) * gradient
+        self.second_moment *= self.beta2
+        self.second_moment += (1 - self.beta2) * gradient ** 2
+        step_size = self.learning_rate * np.sqrt(1 - self.beta2 ** self.iterations) / (1 - self.beta1 ** self.iterations)
+        epsilon = self.epsilon * np.sqrt(1 - self.beta2 ** self.iterations)
+        self.parameters.data -= step_size * self.first_moment / (np.sqrt(self.second_moment) + epsilon)
+
+
+class LBFGS(Optimizer):
+    def __init__(self, parameters, learning_rate=1.0, history_size=10, tolerance_grad=1e-7,
+                 tolerance_change=1e-9, c1=1e-4, c2=0.9, max_evaluations=25, **options):
+        """
+        Full-batch L-BFGS over a model's flat parameter vector. Every `step(closure)`
+        is one quasi-Newton iteration: the direction comes from the last
+        history_size (s, y) pairs of parameter and gradient changes (two-loop
+        recursion), and the step length from a line search satisfying the strong
+        Wolfe conditions
+
+            f(w + t d) <= f(w) + c1 t g.d        (sufficient decrease)
+            |g(w + t d).d| <= c2 |g.d|           (curvature)
+
+        which keeps every accepted pair with s.y > 0, so the inverse Hessian
+        estimate stays positive definite.
+
+        Parameters:
+            parameters (ParameterBuffer): The model's `flat_parameters()`.
+            learning_rate (float, optional): First trial step of the line search, after
+                the first iteration (whose trial step is scaled by 1 / |g|_1). Defaults
+                to 1.0, the quasi-Newton step.
+            history_size (int, optional): Number of (s, y) pairs kept. Defaults to 10.
+            tolerance_grad (float, optional): Converged when every |gradient entry| is at
+                most this. Defaults to 1e-7.
+            tolerance_change (float, optional): Converged when the loss or the step
+                changes by less than this. Defaults to 1e-9.
+            c1 (float, optional): Sufficient-decrease constant. Defaults to 1e-4.
+            c2 (float, optional): Curvature constant. Defaults to 0.9.
+            max_evaluations (int, optional): Loss evaluations allowed per line search.
+                Defaults to 25.
+        """
+        assert not any(value is not None for value in options.values()), \
+            "L-BFGS sets its step length with the line search: no schedule or clipping"
+        super().__init__(parameters, learning_rate)
+        self.history_size = history_size
+        self.tolerance_grad = tolerance_grad
+        self.tolerance_change = tolerance_change
+        self.c1, self.c2 = c1, c2
+        self.max_evaluations = max_evaluations
+        self.s, self.y, self.rho = [], [], []
+        self.evaluations = 0
+        self.converged = False
+        self._loss = self._grad = None
+
+    def step(self, closure):
+        """
+        Takes one L-BFGS iteration.
+
+        Parameters:
+            closure (callable): Sets `parameters.grad` to the full-batch gradient at the
+                current `parameters.data` (zeroing it first) and returns the loss as a
+                float. It is called once per line-search trial.
+
+        Returns:
+            float: The loss after the step.
+        """
+        if self._grad is None:
+            self._loss, self._grad = self._evaluate(closure)
+        loss, grad = self._loss, self._grad
+        if np.abs(grad).max() <= self.tolerance_grad:
+            self.converged = True
+            return loss
+
+        direction = self._direction(grad)
+        slope = grad @ direction
+        if slope > -1e-12:  # not a descent direction: restart from steepest descent
+            self.s, self.y, self.rho = [], [], []
+            direction = -grad
+            slope = grad @ direction
+        t = self.learning_rate if self.iterations else min(1.0, 1.0 / np.abs(grad).sum()) * self.learning_rate
+
+        start = np.array(self.parameters.data)
+        t, new_loss, new_grad = self._line_search(closure, start, loss, slope, direction, t)
+        s, y = t * direction, new_grad - grad
+        self.parameters.data[:] = start  # the line search leaves the parameters at its last trial
+        self._update(s)
+        self.iterations += 1
+
+        sy = s @ y
+        if sy > 1e-10:
+            if len(self.s) == self.history_size:
+                del self.s[0], self.y[0], self.rho[0]
+            self.s.append(s)
+            self.y.append(y)
+            self.rho.append(1.0 / sy)
+        if abs(new_loss - loss) < self.tolerance_change or np.abs(s).max() < self.tolerance_change:
+            self.converged = True
+        self._loss, self._grad = new_loss, new_grad
+        return new_loss
+
+    def _update(self, step):
+        """Moves the parameters by the accepted step t * d of the line search."""
+        self.parameters.data += step
+
+    def reset(self, history=True):
+        """
+        Forgets the cached loss and gradient and the converged flag, e.g. after the
+        parameters or the data were changed outside `step`.
+
+        Parameters:
+            history (bool, optional): Also forget the (s, y) pairs. Defaults to True.
+        """
+        if history:
+            self.s, self.y, self.rho = [], [], []
+        self.converged = False
+        self._loss = self._grad = None
+
+    def _evaluate(self, closure):
+        loss = float(closure())
+        self.evaluations += 1
+        return loss, np.array(self.parameters.grad)
+
+    def _direction(self, grad):
+        """-H grad by the two-loop recursion, with H0 = (s.y / y.y) I."""
+        q = -grad
+        alphas = []
+        for s, y, rho in zip(reversed(self.s), reversed(self.y), reversed(self.rho)):
+            alpha = rho * (s @ q)
+            q -= alpha * y
+            alphas.append(alpha)
+        if self.s:
+            q *= (self.s[-1] @ self.y[-1]) / (self.y[-1] @ self.y[-1])
+        for s, y, rho, alpha in zip(self.s, self.y, self.rho, reversed(alphas)):
+            q += (alpha - rho * (y @ q)) * s
+        return q
+
+    def _line_search(self, closure, start, loss, slope, direction, t):
+        """Strong-Wolfe line search (Nocedal & Wright, Algorithms 3.5 and 3.6)."""
+
+        def at(t):
+            self.parameters.data[:] = start + t * direction
+            f, g = self._evaluate(closure)
+            if not np.isfinite(f):  # e.g. a saturated sigmoid: too far, shorten the step
+                return (t, np.inf, g, np.nan)
+            return (t, f, g, g @ direction)
+
+        previous = (0.0, loss, None, slope)
+        for trial in range(self.max_evaluations):
+            current = at(t)
+            if current[1] > loss + self.c1 * t * slope or (trial and current[1] >= previous[1]):
+                return self._zoom(at, previous, current, loss, slope, self.max_evaluations - trial - 1)
+            if abs(current[3]) <= -self.c2 * slope:
+                return current[:3]
+            if current[3] >= 0:
+                return self._zoom(at, current, previous, loss, slope, self.max_evaluations - trial - 1)
+            previous, t = current, 2.0 * t
+        return current[:3]
+
+    def _zoom(self, at, low, high, loss, slope, evaluations):
+        """Shrinks [low, high], which brackets a Wolfe point; low has the lower loss."""
+        for _ in range(max(evaluations, 1)):
+            lo, hi = min(low[0], high[0]), max(low[0], high[0])
+            if hi - lo < self.tolerance_change:
+                break
+            t = _cubic_minimum(low, high)
+            if not lo + 0.1 * (hi - lo) <= t <= hi - 0.1 * (hi - lo):
+                t = (lo + hi) / 2  # the interpolation is too close to an end: bisect
+            current = at(t)
+            if current[1] > loss + self.c1 * t * slope or current[1] >= low[1]:
+                high = current
+            else:
+                if abs(current[3]) <= -self.c2 * slope:
+                    return current[:3]
+                if current[3] * (high[0] - low[0]) >= 0:
+                    high = low
+                low = current
+        if low[2] is None:  # no trial decreased the loss: stay at the start
+            return 0.0, loss, self._grad
+        return low[:3]
+
+
+def _cubic_minimum(a, b):
+    """Minimizer of the cubic matching the loss and slope at the trial points a and b."""
+    (t1, f1, _, g1), (t2, f2, _, g2) = a, b
+    d1 = g1 + g2 - 3 * (f1 - f2) / (t1 - t2)
+    square = d1 * d1 - g1 * g2
+    if square < 0:
+        return (t1 + t2) / 2
+    d2 = np.sign(t2 - t1) * np.sqrt(square)
+    return t2 - (t2 - t1) * (g2 + d2 - d1) / (g2 - g1 + 2 * d2)
+
+
+OPTIMIZERS = {'sgd': GradientDescent, 'bgd': GradientDescent, 'batch_gradient_descent': GradientDescent,
+              'momentum': Momentum, 'nesterov': Nesterov, 'adagrad': AdaGrad, 'rmsprop': RMSProp, 'adam': Adam,
+              'lbfgs': LBFGS}
+
+
+def make_optimizer(optimizer, parameters, learning_rate, schedule=None, clip_norm=None, clip_value=None):
+    """
+    Resolves the `optimizer` argument of a model's `fit`.
+
+    Parameters:
+        optimizer (str or Optimizer): The name of an optimizer ('SGD', 'BGD',
+            'batch_gradient_descent', 'Momentum', 'Nesterov', 'AdaGrad', 'RMSProp',
+            'Adam', 'LBFGS', in any case), or an `Optimizer` already built on the model's
+            `flat_parameters()`, which keeps its state across `fit` calls.
+        parameters (ParameterBuffer): The model's `flat_parameters()`.
+        learning_rate (float): Learning rate for an optimizer given by name, except
+            'LBFGS', whose line search starts from the quasi-Newton step.
+        schedule (Schedule, optional): Learning-rate schedule for an optimizer given
+            by name. Defaults to None.
+        clip_norm (float, optional): Global gradient-norm clipping for an optimizer
+            given by name. Defaults to None.
+        clip_value (float, optional): Per-value gradient clipping for an optimizer
+            given by name. Defaults to None.
+
+    Returns:
+        Optimizer: The optimizer.
+    """
+    if isinstance(optimizer, Optimizer):
+        assert optimizer.parameters is parameters, "the optimizer must be built on the model's flat_parameters()"
+        assert schedule is None and clip_norm is None and clip_value is None, \
+            "give the schedule and the clipping to the optimizer instance"
+        return optimizer
+    assert optimizer.lower() in OPTIMIZERS, f"unknown optimizer {optimizer!r}"
+    if optimizer.lower() == 'lbfgs':
+        # the line search sets the step length, starting from the quasi-Newton step
+        return LBFGS(parameters, schedule=schedule, clip_norm=clip_norm, clip_value=clip_value)
+    return OPTIMIZERS[optimizer.lower()](parameters, learning_rate, schedule=schedule,
+                                       clip_norm=clip_norm, clip_value=clip_value)
@@ -0,0 +1,146 @@
+import math
+from abc import ABC, abstractmethod
+
+
+class Schedule(ABC):
+    """
+    Base class of the learning-rate schedules. An `Optimizer` given a schedule
+    calls it before every step with its initial learning rate and the number of
+    steps taken so far, and uses the returned rate for that step. A schedule
+    that follows the training loss gets it through `observe`, which `fit` calls
+    once per epoch.
+    """
+
+    @abstractmethod
+    def __call__(self, learning_rate, iteration):
+        """
+        Parameters:
+            learning_rate (float): The optimizer's initial learning rate.
+            iteration (int): Number of steps taken before this one.
+
+        Returns:
+            float: The learning rate of the step.
+        """
+
+    def observe(self, loss):
+        """
+        Reports the training loss of an epoch. Ignored by the fixed schedules.
+
+        Parameters:
+            loss (float): Training loss of the epoch.
+        """
+
+    def __repr__(self):
+        return f"{type(self).__name__}({', '.join(f'{k}={v}' for k, v in vars(self).items() if not k.startswith('_'))})"
+
+
+class StepDecay(Schedule):
+    def __init__(self, step_size, gamma=0.1):
+        """
+        Multiplies the learning rate by gamma every step_size steps.
+
+        Parameters:
+            step_size (int): Number of steps between two decays.
+            gamma (float, optional): Decay factor. Defaults to 0.1.
+        """
+        self.step_size = step_size
+        self.gamma = gamma
+
+    def __call__(self, learning_rate, iteration):
+        return learning_rate * self.gamma ** (iteration // self.step_size)
+
+
+class ExponentialDecay(Schedule):
+    def __init__(self, gamma):
+        """
+        Multiplies the learning rate by gamma every step.
+
+        Parameters:
+            gamma (float): Decay factor per step.
+        """
+        self.gamma = gamma
+
+    def __call__(self, learning_rate, iteration):
+        return learning_rate * self.gamma ** iteration
+
+
+class CosineAnnealing(Schedule):
+    def __init__(self, total_steps, min_learning_rate=0.0):
+        """
+        Decreases the learning rate along half a cosine, from its initial value to
+        min_learning_rate at total_steps, and keeps it there afterwards.
+
+        Parameters:
+            total_steps (int): Length of the decay in steps.
+            min_learning_rate (float, optional): Final learning rate. Defaults to 0.0.
+        """
+        self.total_steps = total_steps
+        self.min_learning_rate = min_learning_rate
+
+    def __call__(self, learning_rate, iteration):
+        progress = min(iteration, self.total_steps) / self.total_steps
+        return self.min_learning_rate + (learning_rate - self.min_learning_rate) * (1 + math.cos(math.pi * progress)) / 2
+
+
+class Warmup(Schedule):
+    def __init__(self, warmup_steps, schedule=None):
+        """
+        Increases the learning rate linearly from learning_rate / warmup_steps to
+        learning_rate over the first warmup_steps steps, then hands over to another
+        schedule, started from its own step 0.
+
+        Parameters:
+            warmup_steps (int): Length of the warmup in steps.
+            schedule (Schedule, optional): Schedule after the warmup. Defaults to None,
+                a constant learning rate.
+        """
+        self.warmup_steps = warmup_steps
+        self.schedule = schedule
+
+    def __call__(self, learning_rate, iteration):
+        if iteration < self.warmup_steps:
+            return learning_rate * (iteration + 1) / self.warmup_steps
+        if self.schedule is None:
+            return learning_rate
+        return self.schedule(learning_rate, iteration - self.warmup_steps)
+
+    def observe(self, loss):
+        if self.schedule is not None:
+            self.schedule.observe(loss)
+
+
+class ReduceOnPlateau(Schedule):
+    def __init__(self, factor=0.1, patience=10, threshold=1e-4, min_learning_rate=0.0):
+        """
+        Multiplies the learning rate by factor when the epoch loss has not improved
+        for more than patience epochs. An improvement is a loss below
+        best * (1 - threshold).
+
+        Parameters:
+            factor (float, optional): Decay factor. Defaults to 0.1.
+            patience (int, optional): Epochs without improvement tolerated before a
+                decay. Defaults to 10.
+            threshold (float, optional): Relative improvement that counts. Defaults to 1e-4.
+            min_learning_rate (float, optional): Lower bound of the learning rate.
+                Defaults to 0.0.
+        """
+        self.factor = factor
+        self.patience = patience
+        self.threshold = threshold
+        self.min_learning_rate = min_learning_rate
+        self.scale = 1.0
+        self._best = math.inf
+        self._bad_epochs = 0
+
+    def __call__(self, learning_rate, iteration):
+        return max(learning_rate * self.scale, self.min_learning_rate)
+
+    def observe(self, loss):
+        if loss < self._best * (1 - self.threshold):
+            self._best = loss
+            self._bad_epochs = 0
+        else:
+            self._bad_epochs += 1
+            if self._bad_epochs > self.patience:
+                self.scale *= self.factor
+                self._bad_epochs = 0
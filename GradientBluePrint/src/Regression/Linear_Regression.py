@@ -6,10 +6,15 @@ parent_directory = sys.path[0]  # Assumes the script is in the parent directory
 sys.path.append(os.path.dirname(os.path.dirname(parent_directory)))
 
 from src.Helpers.DrawGraph import draw_dot
-from src.Gradient.Gradient import Variable
-from src.Optimizers.optimizers import Optimizers
+from src.Gradient.Gradient import Variable, no_grad
+from src.Gradient.Tensor import Tensor
+from src.Gradient.Parameters import ParameterBuffer, scalar_uniform
+from src.Helpers.Checkpoint import save_model, load_model
+from src.Gradient.Trace import trace
+from src.Gradient.Parallel import DataParallel, predict_in_chunks
+from src.Optimizers.optimizers import LBFGS, make_optimizer
+from src.Regression.Solvers import solve_ridge, elastic_net, elastic_net_path
 from src.Cost_functions.Cost_functions import CostFunction
-import random
 import numpy as np
 
 class LinearRegression:
@@ -20,10 +25,12 @@ class LinearRegression:
         Parameters:
             input_dim (int): Dimensionality of the input data.
         """
-        self.w = [Variable(random.uniform(-1, 1), label=f"W{_}") for _ in range(input_dim)]
-        self.b = Variable(random.uniform(-1, 1), label="b")
+        self.w = [Variable(scalar_uniform(), label=f"W{_}") for _ in range(input_dim)]
+        self.b = Variable(scalar_uniform(), label="b")
         self.costFunction = getattr(CostFunction, 'sse')
-        
+        self._program = None
+        self._flat = None
+
     def parameters(self):
         """
         Get the parameters (weights and bias) of the model.
@@ -33,30 +40,106 @@ class LinearRegression:
         """
         return self.w + [self.b]
 
-    def predict(self, X):
+    @no_grad()
+    def predict(self, X, chunk_size=8192, n_jobs=1, backend='thread'):
         """
-        Predicts the output for a given input.
+        Predicts the output for a given input with the compiled model, chunk by
+        chunk into one preallocated array.
 
         Parameters:
-            X (array_like): Input data.
+            X (array_like): Input data, (n_samples, input_dim).
+            chunk_size (int, optional): Rows evaluated at a time, which bounds the work
+                memory. Defaults to 8192.
+            n_jobs (int, optional): Number of threads or processes evaluating the chunks
+                (see `predict_in_chunks`). Defaults to 1.
+            backend (str, optional): 'thread' or 'process'. Defaults to 'thread'.
 
         Returns:
-            list: Predicted outputs.
+            numpy.ndarray: Predicted outputs, (n_samples,).
         """
-        ypreds = [self(x) for x in X]
-        return ypreds
-    
+        return predict_in_chunks(self, X, chunk_size, n_jobs, backend)
+
+    def get_config(self):
+        """
+        Get the constructor arguments of the model, as stored by `save`.
+
+        Returns:
+            dict: Keyword arguments that rebuild the same architecture.
+        """
+        return {'input_dim': len(self.w)}
+
+    def save(self, path):
+        """
+        Saves the architecture and the parameters to a binary checkpoint: a JSON
+        header followed by the flat parameter array (see `src/Helpers/Checkpoint.py`).
+
+        Parameters:
+            path (str): File to write.
+        """
+        save_model(self, path)
+
+    @classmethod
+    def load(cls, path, mmap=True):
+        """
+        Loads a model written by `save`.
+
+        Parameters:
+            path (str): Checkpoint file.
+            mmap (bool, optional): Memory-map the parameters instead of reading them, so
+                their values are read from disk when first used. The model still builds
+                one Parameter per weight, so loading takes time linear in the number of
+                weights. Defaults to True.
+
+        Returns:
+            LinearRegression: The model, with its parameters in `flat_parameters()`.
+        """
+        return load_model(cls, path, mmap)
+
+    def flat_parameters(self, data=None):
+        """
+        Moves the parameters into one contiguous `ParameterBuffer`. Every weight
+        becomes a `Parameter` view into `buffer.data` / `buffer.grad`, so optimizer
+        steps, gradient zeroing, norms and clipping are single array operations.
+
+        Parameters:
+            data (ndarray, optional): Flat array to adopt as the parameter values when
+                the buffer is created, instead of the current ones (see `load`).
+
+        Returns:
+            ParameterBuffer: The model's parameters and gradients as flat arrays.
+        """
+        if self._flat is None:
+            self._flat = ParameterBuffer(self.parameters(), data)
+            self.w, self.b = self._flat.parameters[:-1], self._flat.parameters[-1]
+            self._program = None  # the compiled program refers to the replaced Variables
+        return self._flat
+
+    def compile(self):
+        """
+        Traces the model once into a `Program` that `fit` and `predict` run on
+        whole batches without building a graph per sample.
+
+        Returns:
+            Program: The compiled model.
+        """
+        if self._program is None:
+            self._program = trace(self, len(self.w))
+        return self._program
+
     def __call__(self, x):
         """
         Computes the output of the model for a given input.
 
         Parameters:
-            x (array_like): Input data.
+            x (array_like or Tensor): Input data. A 2-D Tensor is treated as a
+                whole batch and evaluated as a single matrix product.
 
         Returns:
-            float: Output of the model.
+            float or Tensor: Output of the model.
         """
-        y_hat = sum((w_i * x_i for w_i, x_i in zip(self.w, x.T)), self.b)
+        if isinstance(x, Tensor):
+            return x @ Tensor.from_variables(self.w) + Tensor.from_variables([self.b])
+        y_hat = Variable.dot(self.w, x.T) + self.b
         return y_hat
     
     def __draw__(self, x):
@@ -81,58 +164,132 @@ class LinearRegression:
         Returns:
             Variable: Regularization term.
         """
-        penalty_term = Variable(0, label='regularization_term')
-        for param in self.w:
-            penalty_term += (param ** 2)
+        penalty_term = Variable.dot(self.w, self.w)
+        penalty_term.label = 'regularization_term'
         return penalty_term * regularization_term / (2 * len(self.w))
     
     def fit(self, X, y, learning_rate=0.001, num_epochs=300,
-            batch_size=1024, optimizer='SGD', regularization_term=0.05):
+            batch_size=1024, optimizer='SGD', regularization_term=0.05, n_jobs=1,
+            schedule=None, clip_norm=None, clip_value=None, solver=None, chunk_size=8192,
+            l1_ratio=0.5, selection='cyclic'):
         """
         Fits the Linear Regression model to the given data.
 
         Parameters:
-            X (array_like): Input data.
+            X (array_like): Input data. With a solver, may also be an np.memmap larger
+                than memory, or an iterable of (X_chunk, y_chunk) pairs with y None.
             y (array_like): Target values.
             learning_rate (float, optional): Learning rate for optimization. Defaults to 0.001.
             num_epochs (int, optional): Number of epochs for training. Defaults to 300.
             batch_size (int, optional): Batch size for mini-batch optimization. Defaults to 1024.
-            optimizer (str, optional): Optimization algorithm ('SGD' or 'batch_gradient_descent'). Defaults to 'SGD'.
-            regularization_term (float, optional): Regularization term. Defaults to 0.05.
+            optimizer (str or Optimizer, optional): Optimization algorithm: 'SGD', 'batch_gradient_descent',
+                a stateful optimizer ('Momentum', 'Nesterov', 'AdaGrad', 'RMSProp', 'Adam'), 'LBFGS'
+                (full batch, one iteration per epoch until converged; batch_size and learning_rate
+                are not used) or an `Optimizer` built on `flat_parameters()`. Defaults to 'SGD'.
+            regularization_term (float or array_like, optional): Regularization term. With
+                solver 'lasso' or 'elasticnet', a sequence of terms fits the whole
+                regularization path. Defaults to 0.05.
+            n_jobs (int, optional): Number of worker processes sharing each batch
+                (see `DataParallel`). Defaults to 1, no worker processes.
+            schedule (Schedule, optional): Learning-rate schedule applied by the optimizer
+                (see `src/Optimizers/schedules.py`). Defaults to None.
+            clip_norm (float, optional): Largest global L2 norm of the gradient of a step.
+                Defaults to None.
+            clip_value (float, optional): Largest magnitude of any gradient entry of a step.
+                Defaults to None.
+            solver (str, optional): Minimize the same objective exactly instead of
+                iterating, in one pass over the data: 'cholesky', 'qr' or 'svd'; or
+                replace the L2 penalty by an L1 ('lasso') or elastic-net ('elasticnet')
+                one, minimized by coordinate descent (see `src/Regression/Solvers.py`).
+                The optimizer arguments are then not used. Defaults to None.
+            chunk_size (int, optional): Rows read at a time by a solver. Defaults to 8192.
+            l1_ratio (float, optional): Share of the L1 penalty with solver 'elasticnet',
+                in (0, 1]. Defaults to 0.5.
+            selection (str, optional): Coordinate order of 'lasso' and 'elasticnet':
+                'cyclic' or 'random'. Defaults to 'cyclic'.
+
+        Returns:
+            tuple: With 'lasso' or 'elasticnet' and a sequence of regularization terms,
+                the path `(terms, weights, biases)` of `elastic_net_path`; the model keeps
+                the last (least regularized) solution. None otherwise.
         """
-        for epoch in range(num_epochs):
-            if batch_size is None:
-                Xb, yb = X, y
+        flat = self.flat_parameters()
+        if solver in ('lasso', 'elasticnet'):
+            l1_ratio = 1.0 if solver == 'lasso' else l1_ratio
+            path = None
+            if np.ndim(regularization_term) == 0:
+                w, b = elastic_net(X, y, regularization_term, l1_ratio, selection)
             else:
-                ri = np.random.permutation(X.shape[0])[:batch_size]
-                Xb, yb = X[ri], y[ri]
-
-            ypreds = self.predict(Xb)      
-
-            # Forward pass
-            if optimizer == 'SGD':
-                losses = [self.costFunction(y_hat, y_) + self.regularizer(regularization_term) for y_hat, y_ in zip(ypreds, yb)]
-                # Backward Pass
-                gradients = {parameter.label: [] for parameter in self.parameters()}
-                for k, loss in enumerate(losses):
-                    loss.backward()
-                    self.loss = loss
-                    for parameter in self.parameters():
-                        gradients[parameter.label].append(parameter.grad)
-                        parameter.grad = 0.0
+                path = elastic_net_path(X, y, regularization_term, l1_ratio, selection=selection)
+                w, b = path[1][-1], path[2][-1]
+            assert len(w) == len(self.w), f"expected {len(self.w)} features, got {len(w)}"
+            flat.data[:-1] = w
+            flat.data[-1] = b
+            return path
+        if solver is not None:
+            w, b = solve_ridge(X, y, regularization_term, solver, chunk_size)
+            assert len(w) == len(self.w), f"expected {len(self.w)} features, got {len(w)}"
+            flat.data[:-1] = w
+            flat.data[-1] = b
+            return
+        summed = optimizer == 'batch_gradient_descent'
+        optimizer = make_optimizer(optimizer, flat, learning_rate, schedule, clip_norm, clip_value)
+        program = self.compile()
+        workers = DataParallel(self, X, y, self.costFunction, n_jobs) if n_jobs > 1 else None
+        if isinstance(optimizer, LBFGS):
+            # full batch: one quasi-Newton iteration per epoch, until converged
+            optimizer.reset(history=False)  # a cached gradient from an earlier fit may be for other data
+            everything = np.arange(X.shape[0])
 
-            else:
-                # batch GD
-                loss = sum((self.costFunction(y_hat, y_)  for ypred, y_ in zip(ypreds, yb)), Variable(0)) + self.regularizer(regularization_term)
-                loss.backward()
+            def closure():
+                penalty = self.regularizer(regularization_term)
+                flat.zero_grad()
+                penalty.backward()
+                if workers is None:
+                    losses, _ = program.per_sample_gradients(X, y, self.costFunction, 'mean', out=flat.grad)
+                else:
+                    losses, _ = workers.per_sample_gradients(everything, 'mean', out=flat.grad)
+                return losses.mean() + penalty.data
 
-            # Update using specified optimizer
-            if optimizer == 'SGD':
-                Optimizers.SGD(self.parameters(), gradients, learning_rate)
-                if epoch % 10 == 0:
-                    print(f"Epoch {epoch}, Loss: {sum([loss.data for loss in losses])}")
+            for epoch in range(num_epochs):
+                loss = optimizer.step(closure)
+                if epoch % 10 == 0 or optimizer.converged:
+                    print(f"Epoch {epoch}, Loss: {loss}")
+                if optimizer.converged:
+                    break
+        else:
+            for epoch in range(num_epochs):
+                if batch_size is None:
+                    ri = np.arange(X.shape[0])
+                    Xb, yb = X, y
+                else:
+                    ri = np.random.permutation(X.shape[0])[:batch_size]
+                    Xb, yb = X[ri], y[ri]
+
+                penalty = self.regularizer(regularization_term)
+                flat.zero_grad()
+                penalty.backward()
 
-            elif optimizer == 'batch_gradient_descent':
-                Optimizers.batch_gradient_descent(self.parameters(), learning_rate, batch_size)
+                # Forward and backward pass over the whole batch, accumulated into flat.grad
+                reduction = 'sum' if summed else 'mean'
+                if workers is None:
+                    losses, _ = program.per_sample_gradients(Xb, yb, self.costFunction, reduction, out=flat.grad)
+                else:
+                    losses, _ = workers.per_sample_gradients(ri, reduction, out=flat.grad)
+
+                # Update using specified optimizer
+                if summed:
+                    # the regularization gradient is averaged over the batch with the rest
+                    loss = losses.sum() + penalty.data
+                    optimizer.step(len(Xb))
+                else:
+                    # every sample's loss carries the regularization term
+                    loss = (losses + penalty.data).sum()
+                    optimizer.step()
+                optimizer.zero_grad()
+                optimizer.end_epoch(loss)
                 if epoch % 10 == 0:
-                    print(f"Epoch {epoch}, Loss: {loss.data}")
+                    print(f"Epoch {epoch}, Loss: {loss}")
+
+        if workers is not None:
+            workers.close()
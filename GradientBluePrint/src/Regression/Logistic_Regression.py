@@ -1,13 +1,17 @@
 import sys
-import random
 import numpy as np
 
 parent_directory = sys.path[0]
 sys.path.append(parent_directory)
 
 from src.Helpers.DrawGraph import draw_dot
-from src.Gradient.Gradient import Variable
-from src.Optimizers.optimizers import Optimizers
+from src.Gradient.Gradient import Variable, no_grad
+from src.Gradient.Tensor import Tensor
+from src.Gradient.Parameters import ParameterBuffer, scalar_uniform
+from src.Helpers.Checkpoint import save_model, load_model
+from src.Gradient.Trace import trace
+from src.Gradient.Parallel import DataParallel, predict_in_chunks
+from src.Optimizers.optimizers import LBFGS, make_optimizer
 from src.NNS.Activation_Functions import Activations
 from src.Cost_functions.Cost_functions import CostFunction
 
@@ -23,18 +27,20 @@ class LogisticRegression:
             k (int, optional): Number of classes in multiclass setting. Defaults to 2.
         """
         if multiclass:
-            self.w = [[Variable(random.uniform(-1, 1), 
+            self.w = [[Variable(scalar_uniform(), 
                                 label=f"Class{k}_W{_}") for _ in range(input_dim)] for k in range(k)]
-            self.b = [Variable(random.uniform(-1, 1),
+            self.b = [Variable(scalar_uniform(),
                                label=f"Class{k}_b") for k in range(k)]
             self.activation = getattr(Activations, 'softmax')
             self.costFunction = getattr(CostFunction, 'categorical_cross_entropy_loss')
         else:
-            self.w = [Variable(random.uniform(-1, 1), label=f"W{_}") for _ in range(input_dim)]
-            self.b = Variable(random.uniform(-1, 1), label="b")
+            self.w = [Variable(scalar_uniform(), label=f"W{_}") for _ in range(input_dim)]
+            self.b = Variable(scalar_uniform(), label="b")
             self.activation = getattr(Activations, 'sigmoid')
             self.costFunction = getattr(CostFunction, 'log_loss')
         self.multiclass = multiclass
+        self._program = None
+        self._flat = None
 
     def parameters(self):
         """
@@ -45,34 +51,118 @@ class LogisticRegression:
         """
         return self.w + [self.b]
 
-    def predict(self, X):
+    @no_grad()
+    def predict(self, X, chunk_size=8192, n_jobs=1, backend='thread'):
         """
-        Predicts the output for a given input.
+        Predicts the output for a given input with the compiled model, chunk by
+        chunk into one preallocated array.
 
         Parameters:
-            X (array_like): Input data.
+            X (array_like): Input data, (n_samples, input_dim).
+            chunk_size (int, optional): Rows evaluated at a time, which bounds the work
+                memory. Defaults to 8192.
+            n_jobs (int, optional): Number of threads or processes evaluating the chunks
+                (see `predict_in_chunks`). Defaults to 1.
+            backend (str, optional): 'thread' or 'process'. Defaults to 'thread'.
+
+        Returns:
+            numpy.ndarray: Predicted probabilities, (n_samples,) for a binary model and
+                (n_samples, k) for a multiclass one.
+        """
+        return predict_in_chunks(self, X, chunk_size, n_jobs, backend)
+
+    def get_config(self):
+        """
+        Get the constructor arguments of the model, as stored by `save`.
+
+        Returns:
+            dict: Keyword arguments that rebuild the same architecture.
+        """
+        if self.multiclass:
+            return {'input_dim': len(self.w[0]), 'multiclass': True, 'k': len(self.w)}
+        return {'input_dim': len(self.w), 'multiclass': False}
+
+    def save(self, path):
+        """
+        Saves the architecture and the parameters to a binary checkpoint: a JSON
+        header followed by the flat parameter array (see `src/Helpers/Checkpoint.py`).
+
+        Parameters:
+            path (str): File to write.
+        """
+        save_model(self, path)
+
+    @classmethod
+    def load(cls, path, mmap=True):
+        """
+        Loads a model written by `save`.
+
+        Parameters:
+            path (str): Checkpoint file.
+            mmap (bool, optional): Memory-map the parameters instead of reading them, so
+                their values are read from disk when first used. The model still builds
+                one Parameter per weight, so loading takes time linear in the number of
+                weights. Defaults to True.
+
+        Returns:
+            LogisticRegression: The model, with its parameters in `flat_parameters()`.
+        """
+        return load_model(cls, path, mmap)
+
+    def flat_parameters(self, data=None):
+        """
+        Moves the parameters into one contiguous `ParameterBuffer`. Every weight
+        becomes a `Parameter` view into `buffer.data` / `buffer.grad`, so optimizer
+        steps, gradient zeroing, norms and clipping are single array operations.
+
+        Parameters:
+            data (ndarray, optional): Flat array to adopt as the parameter values when
+                the buffer is created, instead of the current ones (see `load`).
+
+        Returns:
+            ParameterBuffer: The model's parameters and gradients as flat arrays.
+        """
+        if self._flat is None:
+            self._flat = ParameterBuffer(self.parameters(), data)
+            self.w, self.b = self._flat.parameters[:-1], self._flat.parameters[-1]
+            self._program = None  # the compiled program refers to the replaced Variables
+        return self._flat
+
+    def compile(self):
+        """
+        Traces the model once into a `Program` that `fit` and `predict` run on
+        whole batches without building a graph per sample.
 
         Returns:
-            list: Predicted outputs.
+            Program: The compiled model.
         """
-        ypreds = [self(x) for x in X]
-        return ypreds
+        if self._program is None:
+            input_dim = len(self.w[0]) if self.multiclass else len(self.w)
+            self._program = trace(self, input_dim)
+        return self._program
 
     def __call__(self, x):
         """
         Computes the output of the model for a given input.
 
         Parameters:
-            x (array_like): Input data.
+            x (array_like or Tensor): Input data. A 2-D Tensor is treated as a
+                whole batch and evaluated as a single matrix product.
 
         Returns:
-            float or list: Output of the model.
+            float, list or Tensor: Output of the model.
         """
+        if isinstance(x, Tensor):
+            if self.multiclass:
+                y_hat = x @ Tensor.from_variables(self.w).T + Tensor.from_variables(self.b)
+            else:
+                y_hat = x @ Tensor.from_variables(self.w) + Tensor.from_variables([self.b])
+            return self.activation(y_hat)
         if self.multiclass:
-            y_hat = [sum((w_i * x_i for w_i, x_i in zip(w, x.T)), b) for w, b in zip(self.w, self.b)]
+            y_hat = [Variable.dot(w, x.T) + b for w, b in zip(self.w, self.b)]
             y_hat = self.activation(y_hat)
         else:
-            y_hat = sum((w_i * x_i for w_i, x_i in zip(self.w, x.T)), self.b)  # Forward pass
+            y_hat = Variable.dot(self.w, x.T) + self.b  # Forward pass
             y_hat = self.activation(y_hat)
         return y_hat
 
@@ -98,13 +188,13 @@ class LogisticRegression:
         Returns:
             Variable: Regularization term.
         """
-        penalty_term = Variable(0, label='regularization_term')
-        for param in self.w:
-            penalty_term += (param ** 2)
+        penalty_term = Variable.dot(self.w, self.w)
+        penalty_term.label = 'regularization_term'
         return penalty_term * regularization_term / (2 * len(self.w))
 
     def fit(self, X, y, learning_rate=0.001, num_epochs=300,
-            batch_size=1024, optimizer='SGD', regularization_term=0.05):
+            batch_size=1024, optimizer='SGD', regularization_term=0.05, n_jobs=1,
+            schedule=None, clip_norm=None, clip_value=None):
         """
         Fits the Logistic Regression model to the given data.
 
@@ -114,62 +204,81 @@ class LogisticRegression:
             learning_rate (float, optional): Learning rate for optimization. Defaults to 0.001.
             num_epochs (int, optional): Number of epochs for training. Defaults to 300.
             batch_size (int, optional): Batch size for mini-batch optimization. Defaults to 1024.
-            optimizer (str, optional): Optimization algorithm ('SGD' or 'BGD'). Defaults to 'SGD'.
+            optimizer (str or Optimizer, optional): Optimization algorithm: 'SGD', 'BGD', a stateful
+                optimizer ('Momentum', 'Nesterov', 'AdaGrad', 'RMSProp', 'Adam'), 'LBFGS' (full batch,
+                one iteration per epoch until converged; batch_size and learning_rate are not used)
+                or an `Optimizer` built on `flat_parameters()`. Defaults to 'SGD'.
             regularization_term (float, optional): Regularization term. Defaults to 0.05.
+            n_jobs (int, optional): Number of worker processes sharing each batch
+                (see `DataParallel`). Defaults to 1, no worker processes.
+            schedule (Schedule, optional): Learning-rate schedule applied by the optimizer
+                (see `src/Optimizers/schedules.py`). Defaults to None.
+            clip_norm (float, optional): Largest global L2 norm of the gradient of a step.
+                Defaults to None.
+            clip_value (float, optional): Largest magnitude of any gradient entry of a step.
+                Defaults to None.
         """
-        for epoch in range(num_epochs):
-            if batch_size is None:
-                Xb, yb = X, y
-            else:
-                ri = np.random.permutation(X.shape[0])[:batch_size]
-                Xb, yb = X[ri], y[ri]
+        flat = self.flat_parameters()
+        summed = optimizer == 'BGD'
+        optimizer = make_optimizer(optimizer, flat, learning_rate, schedule, clip_norm, clip_value)
+        program = self.compile()
+        workers = DataParallel(self, X, y, self.costFunction, n_jobs) if n_jobs > 1 else None
+        if isinstance(optimizer, LBFGS):
+            # full batch: one quasi-Newton iteration per epoch, until converged
+            optimizer.reset(history=False)  # a cached gradient from an earlier fit may be for other data
+            everything = np.arange(X.shape[0])
 
-            ypreds = self.predict(Xb)
+            def closure():
+                # the multiclass objective is not regularized
+                penalty = Variable(0) if self.multiclass else self.regularizer(regularization_term)
+                flat.zero_grad()
+                penalty.backward()
+                if workers is None:
+                    losses, _ = program.per_sample_gradients(X, y, self.costFunction, 'mean', out=flat.grad)
+                else:
+                    losses, _ = workers.per_sample_gradients(everything, 'mean', out=flat.grad)
+                return losses.mean() + penalty.data
 
-            # Forward pass
-            if optimizer == 'SGD':
-                if self.multiclass:
-                    losses = [self.costFunction(ypred, y_) for ypred, y_ in zip(ypreds, yb)]
-                    gradients = {parameter.label: [] for parameters in self.parameters() for parameter in parameters}
+            for epoch in range(num_epochs):
+                loss = optimizer.step(closure)
+                if epoch % 10 == 0 or optimizer.converged:
+                    print(f"Epoch {epoch}, Loss: {loss}")
+                if optimizer.converged:
+                    break
+        else:
+            for epoch in range(num_epochs):
+                if batch_size is None:
+                    ri = np.arange(X.shape[0])
+                    Xb, yb = X, y
+                else:
+                    ri = np.random.permutation(X.shape[0])[:batch_size]
+                    Xb, yb = X[ri], y[ri]
 
-                    for k, loss in enumerate(losses):
-                        loss.backward()
-                        self.loss = loss
-                        for parameters in self.parameters():
-                            for parameter in parameters:
-                                gradients[parameter.label].append(parameter.grad)
-                                parameter.grad = 0.0
+                # the multiclass objective is not regularized
+                penalty = Variable(0) if self.multiclass else self.regularizer(regularization_term)
+                flat.zero_grad()
+                penalty.backward()
 
+                # Forward and backward pass over the whole batch, accumulated into flat.grad
+                reduction = 'sum' if summed else 'mean'
+                if workers is None:
+                    losses, _ = program.per_sample_gradients(Xb, yb, self.costFunction, reduction, out=flat.grad)
                 else:
-                    losses = [self.costFunction(ypred, y_) + self.regularizer(regularization_term) for ypred,
-                              y_ in zip(ypreds, yb)]
-                    # Backward Pass
-                    gradients = {parameter.label: [] for parameter in self.parameters()}
-                    for k, loss in enumerate(losses):
-                        loss.backward()
-                        self.loss = loss
-                        for parameter in self.parameters():
-                            gradients[parameter.label].append(parameter.grad)
-                            parameter.grad = 0.0
+                    losses, _ = workers.per_sample_gradients(ri, reduction, out=flat.grad)
 
-            else:
-                # batch GD
-                if self.multiclass:
-                    loss = sum((self.costFunction(ypred, y_) for ypred, y_ in zip(ypreds, yb)),
-                               Variable(0))
+                # Update using specified optimizer
+                if summed:
+                    # the regularization gradient is averaged over the batch with the rest
+                    loss = losses.sum() + penalty.data
+                    optimizer.step(len(Xb))
                 else:
-                    loss = sum((self.costFunction(ypred, y_) for ypred, y_ in zip(ypreds, yb)),
-                               Variable(0)) + self.regularizer(regularization_term)
-                loss.backward()
-
-            # Update using specified optimizer
-            if optimizer == 'SGD':
-                Optimizers.SGD(self.parameters(), gradients, learning_rate, multiclass=self.multiclass)
+                    # every sample's loss carries the regularization term
+                    loss = (losses + penalty.data).sum()
+                    optimizer.step()
+                optimizer.zero_grad()
+                optimizer.end_epoch(loss)
                 if epoch % 10 == 0:
-                    print(f"Epoch {epoch}, Loss: {sum([loss.data for loss in losses])}")
+                    print(f"Epoch {epoch}, Loss: {loss}")
 
-            elif optimizer == 'BGD':
-                Optimizers.batch_gradient_descent(self.parameters(), learning_rate, batch_size,
-                                                 multiclass=self.multiclass)
-                if epoch % 10 == 0:
-                    print(f"Epoch {epoch}, Loss: {loss.data}")
+        if workers is not None:
+            workers.close()
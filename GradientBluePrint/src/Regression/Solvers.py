@@ -0,0 +1,305 @@
+# closed-form solvers for the objectives of LinearRegression
+"""
+`LinearRegression.fit` minimizes, with n samples and d weights,
+
+    J(w, b) = 1/n * sum_i (x_i . w + b - y_i)^2 + reg / (2 d) * |w|^2
+
+(the mean `CostFunction.sse` plus `LinearRegression.regularizer(reg)`). The bias
+is not penalized, so it is eliminated by centering: with Xc, yc the centered data,
+
+    w = argmin |Xc w - yc|^2 + alpha |w|^2,   alpha = n * reg / (2 d)
+    b = mean(y) - mean(X) . w
+
+The ridge solvers read the data once, in chunks, so X can be larger than memory
+(an np.memmap, or any iterable of (X_chunk, y_chunk) pairs).
+
+The elastic-net solvers replace the L2 penalty by
+
+    reg / d * (l1_ratio * |w|_1 + (1 - l1_ratio) / 2 * |w|^2)
+
+which is `regularizer(reg)` at l1_ratio = 0 and a Lasso at l1_ratio = 1, and
+minimize it by coordinate descent on the centered data held in memory.
+"""
+import numpy as np
+
+SOLVERS = ('cholesky', 'qr', 'svd')
+
+
+def iter_chunks(X, y=None, chunk_size=8192):
+    """
+    Yields the data as (X_chunk, y_chunk) float arrays.
+
+    Parameters:
+        X (array_like or iterable): Input data (n_samples, n_features), read chunk_size
+            rows at a time (an np.memmap is then paged in chunk by chunk); or, with y
+            None, an iterable of (X_chunk, y_chunk) pairs.
+        y (array_like, optional): Targets (n_samples,). Defaults to None.
+        chunk_size (int, optional): Rows per chunk. Defaults to 8192.
+    """
+    if y is None:
+        for X_chunk, y_chunk in X:
+            yield np.asarray(X_chunk, dtype=float), np.asarray(y_chunk, dtype=float).reshape(-1)
+        return
+    for lo in range(0, len(X), chunk_size):
+        yield np.asarray(X[lo:lo + chunk_size], dtype=float), np.asarray(y[lo:lo + chunk_size], dtype=float).reshape(-1)
+
+
+class _Moments:
+    """Streaming means of X and y and, for 'cholesky', the centered Xc'Xc and Xc'yc."""
+
+    def __init__(self, gram):
+        self.gram = gram
+        self.n = 0
+        self.mean_x = self.mean_y = None
+        self.xx = self.xy = None
+
+    def update(self, X, y):
+        m = len(X)
+        if m == 0:
+            return
+        mean_x, mean_y = X.mean(axis=0), y.mean()
+        if self.n == 0:
+            self.mean_x, self.mean_y = np.zeros_like(mean_x), 0.0
+            if self.gram:
+                self.xx, self.xy = np.zeros((X.shape[1], X.shape[1])), np.zeros(X.shape[1])
+        delta_x, delta_y = mean_x - self.mean_x, mean_y - self.mean_y
+        if self.gram:
+            # pairwise merge of the co-moments (Chan et al.), without the cancellation
+            # of X'X - n * mean * mean'
+            Dx = X - mean_x
+            weight = self.n * m / (self.n + m)
+            self.xx += Dx.T @ Dx + weight * np.outer(delta_x, delta_x)
+            self.xy += Dx.T @ (y - mean_y) + weight * delta_x * delta_y
+        self.mean_x = self.mean_x + delta_x * m / (self.n + m)
+        self.mean_y = self.mean_y + delta_y * m / (self.n + m)
+        self.n += m
+
+
+def _triangular_factor(chunks, moments):
+    """
+    Streaming (TSQR) R factor of [1, X, y]. With the column of ones first, its
+    trailing block is the R factor of the centered [Xc, yc]: returns R22 (d, d)
+    and z = Q2' yc (d,), so |Xc w - yc|^2 = |R22 w - z|^2 + constant.
+    """
+    R = None
+    for X, y in chunks:
+        moments.update(X, y)
+        block = np.hstack([np.ones((len(X), 1)), X, y[:, None]])
+        R = np.linalg.qr(block if R is None else np.vstack([R, block]), mode='r')
+    if R is None:
+        raise ValueError("no samples to fit")
+    d = R.shape[1] - 2
+    # pad to (d + 2, d + 2) when there were fewer rows than columns
+    R = np.vstack([R, np.zeros((d + 2 - R.shape[0], d + 2))])
+    return R[1:d + 1, 1:d + 1], R[1:d + 1, d + 1]
+
+
+def solve_ridge(X, y=None, regularization_term=0.05, solver='cholesky', chunk_size=8192):
+    """
+    Minimizes the LinearRegression objective exactly, in one pass over the data.
+
+    - 'cholesky': accumulates the centered normal equations Xc'Xc and Xc'yc
+      chunk by chunk, then solves (Xc'Xc + alpha I) w = Xc'yc by a Cholesky
+      factorization. The fastest, O(n d^2) work and O(d^2) memory, but the
+      normal equations square the condition number of X.
+    - 'qr': accumulates the R factor of the centered data by streaming QR, then
+      solves the stacked least-squares problem [R; sqrt(alpha) I] w = [z; 0]
+      with a second QR. Accurate for ill-conditioned X.
+    - 'svd': the same streamed R, then w = V diag(s / (s^2 + alpha)) U' z from
+      the SVD of R (which has the singular values of Xc). Also handles a rank
+      deficient X with no regularization, giving the minimum-norm solution.
+
+    Parameters:
+        X (array_like or iterable): Input data, or an iterable of (X_chunk, y_chunk)
+            pairs when y is None (see `iter_chunks`).
+        y (array_like, optional): Targets. Defaults to None.
+        regularization_term (float, optional): reg of `LinearRegression.regularizer`.
+            Defaults to 0.05.
+        solver (str, optional): 'cholesky', 'qr' or 'svd'. Defaults to 'cholesky'.
+        chunk_size (int, optional): Rows read at a time. Defaults to 8192.
+
+    Returns:
+        tuple: The weights w (d,) and the bias b (float).
+    """
+    assert solver in SOLVERS, f"solver must be one of {SOLVERS}"
+    chunks = iter_chunks(X, y, chunk_size)
+    moments = _Moments(gram=solver == 'cholesky')
+    if solver == 'cholesky':
+        for X_chunk, y_chunk in chunks:
+            moments.update(X_chunk, y_chunk)
+        if moments.n == 0:
+            raise ValueError("no samples to fit")
+        d = len(moments.mean_x)
+        alpha = moments.n * regularization_term / (2 * d)
+        L = np.linalg.cholesky(moments.xx + alpha * np.eye(d))
+        w = np.linalg.solve(L.T, np.linalg.solve(L, moments.xy))
+    else:
+        R, z = _triangular_factor(chunks, moments)
+        d = len(z)
+        alpha = moments.n * regularization_term / (2 * d)
+        if solver == 'qr':
+            Q, R_ = np.linalg.qr(np.vstack([R, np.sqrt(alpha) * np.eye(d)]))
+            w = np.linalg.solve(R_, Q[:d].T @ z)
+        else:
+            U, s, Vt = np.linalg.svd(R)
+            cutoff = s.max(initial=0.0) * max(R.shape) * np.finfo(float).eps
+            factors = np.divide(s, s ** 2 + alpha, out=np.zeros_like(s), where=s > cutoff)
+            w = Vt.T @ (factors * (U.T @ z))
+    return w, float(moments.mean_y - moments.mean_x @ w)
+
+
+class _Centered:
+    """The centered data of a coordinate-descent problem and its per-feature constants."""
+
+    def __init__(self, X, y):
+        X, y = np.asarray(X, dtype=float), np.asarray(y, dtype=float).reshape(-1)
+        self.n, self.d = X.shape
+        self.mean_x, self.mean_y = X.mean(axis=0), y.mean()
+        self.X = np.asfortranarray(X - self.mean_x)  # contiguous columns for the coordinate loop
+        self.y = y - self.mean_y
+        self.curvature = 2.0 / self.n * np.einsum('ij,ij->j', self.X, self.X)  # d^2 J / dw_j^2 of the loss
+
+    def correlations(self, residual):
+        """(2/n) Xc' r: minus the gradient of the mean squared error, for every feature."""
+        return 2.0 / self.n * (self.X.T @ residual)
+
+    def penalties(self, regularization_term, l1_ratio):
+        return regularization_term * l1_ratio / self.d, regularization_term * (1 - l1_ratio) / self.d
+
+    def max_regularization(self, l1_ratio):
+        """The smallest regularization_term whose solution is w = 0."""
+        return np.abs(self.correlations(self.y)).max() * self.d / l1_ratio
+
+
+def _sweep(problem, w, residual, features, l1, l2):
+    """One pass of coordinate updates over features; returns the largest change of a weight."""
+    largest = 0.0
+    X, curvature, scale = problem.X, problem.curvature, 2.0 / problem.n
+    for j in features:
+        x, old = X[:, j], w[j]
+        rho = scale * (x @ residual) + curvature[j] * old
+        # soft-thresholding: the exact minimizer along coordinate j
+        new = np.sign(rho) * max(abs(rho) - l1, 0.0) / (curvature[j] + l2) if curvature[j] + l2 > 0 else 0.0
+        if new != old:
+            residual -= (new - old) * x
+            w[j] = new
+            largest = max(largest, abs(new - old))
+    return largest
+
+
+def _coordinate_descent(problem, regularization_term, l1_ratio, w, candidates, selection, tol, max_sweeps):
+    """
+    Minimizes the elastic-net objective from w (updated in place).
+
+    With candidates (the features that survived screening) the candidates are swept
+    once, then the sweeps run over the active set (the nonzero weights) only, until
+    they settle. The optimality (KKT) conditions of every other weight,
+    |(2/n) x_j' r| <= l1, are then checked in one vectorized step; violators are
+    swept in and the loop resumes. With candidates None every sweep visits every
+    feature.
+    """
+    l1, l2 = problem.penalties(regularization_term, l1_ratio)
+    residual = problem.y - problem.X @ w
+    everything = np.arange(problem.d)
+    pending = everything if candidates is None else np.union1d(np.flatnonzero(w), candidates)
+    sweeps = 0
+    while sweeps < max_sweeps:
+        order = np.random.permutation(pending) if selection == 'random' else pending
+        change = _sweep(problem, w, residual, order, l1, l2)
+        sweeps += 1
+        while sweeps < max_sweeps and change > tol * max(np.abs(w).max(initial=0.0), 1.0):
+            active = everything if candidates is None else np.flatnonzero(w)
+            order = np.random.permutation(active) if selection == 'random' else active
+            change = _sweep(problem, w, residual, order, l1, l2)
+            sweeps += 1
+        if candidates is None:
+            break
+        violators = np.flatnonzero((w == 0) & (np.abs(problem.correlations(residual)) > l1 * (1 + 1e-9) + 1e-12))
+        if len(violators) == 0:
+            break
+        pending = violators
+    return w
+
+
+def elastic_net(X, y, regularization_term=0.05, l1_ratio=1.0, selection='cyclic', screening=True,
+                tol=1e-7, max_sweeps=1000, w0=None):
+    """
+    Fits the elastic-net objective (module docstring) by coordinate descent with
+    soft-thresholding.
+
+    Parameters:
+        X (array_like): Input data (n_samples, n_features).
+        y (array_like): Targets (n_samples,).
+        regularization_term (float, optional): reg. Defaults to 0.05.
+        l1_ratio (float, optional): Share of the L1 penalty, in (0, 1]: 1 is a Lasso.
+            Defaults to 1.0.
+        selection (str, optional): 'cyclic' to update the features in order, 'random'
+            for a new random order every sweep. Defaults to 'cyclic'.
+        screening (bool, optional): Discard the features the strong rule predicts to be
+            zero (|(2/n) x_j' r| < 2 l1 - l1_max) and sweep only the active set, with a
+            KKT check that brings back any feature screened out wrongly. Without it
+            every sweep visits every feature. Defaults to True.
+        tol (float, optional): Sweeps over the active set stop when no weight changes by
+            more than tol * max(|w|_inf, 1). Defaults to 1e-7.
+        max_sweeps (int, optional): Limit on the number of sweeps. Defaults to 1000.
+        w0 (array_like, optional): Initial weights (warm start). Defaults to zeros.
+
+    Returns:
+        tuple: The weights w (d,) and the bias b (float).
+    """
+    assert 0 < l1_ratio <= 1, "l1_ratio must be in (0, 1]; use solve_ridge for l1_ratio = 0"
+    assert selection in ('cyclic', 'random'), "selection must be 'cyclic' or 'random'"
+    problem = _Centered(X, y)
+    w = np.zeros(problem.d) if w0 is None else np.array(w0, dtype=float)
+    candidates = None
+    if screening:
+        l1, _ = problem.penalties(regularization_term, l1_ratio)
+        l1_max, _ = problem.penalties(problem.max_regularization(l1_ratio), l1_ratio)
+        candidates = np.flatnonzero(np.abs(problem.correlations(problem.y - problem.X @ w)) >= 2 * l1 - l1_max)
+    w = _coordinate_descent(problem, regularization_term, l1_ratio, w, candidates, selection, tol, max_sweeps)
+    return w, float(problem.mean_y - problem.mean_x @ w)
+
+
+def elastic_net_path(X, y, regularization_terms=None, l1_ratio=1.0, n_terms=100, eps=1e-3,
+                     selection='cyclic', screening=True, tol=1e-7, max_sweeps=1000):
+    """
+    Fits the elastic net for a decreasing sequence of regularization terms, each
+    solution warm-starting the next. With screening, the sequential strong rule
+    discards feature j at reg_k when |(2/n) x_j' r(reg_{k-1})| < 2 l1_k - l1_{k-1},
+    so along a sparse path each fit only visits the few features near the active set.
+
+    Parameters:
+        X (array_like): Input data (n_samples, n_features).
+        y (array_like): Targets (n_samples,).
+        regularization_terms (array_like, optional): The terms, fitted in decreasing order.
+            Defaults to n_terms values log-spaced from the smallest term giving w = 0
+            down to eps times it.
+        l1_ratio (float, optional): Share of the L1 penalty, in (0, 1]. Defaults to 1.0.
+        n_terms (int, optional): Length of the default path. Defaults to 100.
+        eps (float, optional): Ratio of the last to the first default term. Defaults to 1e-3.
+        selection, screening, tol, max_sweeps: As in `elastic_net`.
+
+    Returns:
+        tuple: The terms (k,) in decreasing order, the weights (k, d) and the biases (k,).
+    """
+    assert 0 < l1_ratio <= 1, "l1_ratio must be in (0, 1]; use solve_ridge for l1_ratio = 0"
+    assert selection in ('cyclic', 'random'), "selection must be 'cyclic' or 'random'"
+    problem = _Centered(X, y)
+    reg_max = problem.max_regularization(l1_ratio)
+    if regularization_terms is None:
+        terms = reg_max * np.logspace(0, np.log10(eps), n_terms)
+    else:
+        terms = np.sort(np.asarray(regularization_terms, dtype=float).reshape(-1))[::-1]
+    w = np.zeros(problem.d)
+    previous, _ = problem.penalties(reg_max, l1_ratio)
+    weights = np.empty((len(terms), problem.d))
+    for k, term in enumerate(terms):
+        l1, _ = problem.penalties(term, l1_ratio)
+        candidates = None
+        if screening:
+            gradient = problem.correlations(problem.y - problem.X @ w)
+            candidates = np.flatnonzero(np.abs(gradient) >= 2 * l1 - previous)
+        w = _coordinate_descent(problem, term, l1_ratio, w, candidates, selection, tol, max_sweeps)
+        weights[k] = w
+        previous = max(l1, 0.0)
+    return terms, weights, problem.mean_y - weights @ problem.mean_x
@@ -5,11 +5,15 @@ parent_directory = sys.path[0]  # Assumes the script is in the parent directory
 # Add the parent directory to the Python path
 sys.path.append(os.path.dirname(os.path.dirname(parent_directory)))
 
-import random
 import numpy as np
 
-from src.Gradient.Gradient import Variable
-from src.Optimizers.optimizers import Optimizers
+from src.Gradient.Gradient import Variable, no_grad
+from src.Gradient.Tensor import Tensor
+from src.Gradient.Parameters import ParameterBuffer, scalar_uniform
+from src.Helpers.Checkpoint import save_model, load_model
+from src.Gradient.Trace import trace
+from src.Gradient.Parallel import DataParallel, predict_in_chunks
+from src.Optimizers.optimizers import LBFGS, make_optimizer
 from src.Cost_functions.Cost_functions import CostFunction
 
 
@@ -54,31 +58,137 @@ class SVM:
         input_dim : int
             Dimensionality of the input features.
         """
-        self.w = [Variable(random.uniform(-1, 1), label=f"W{_}") for _ in range(input_dim)]
-        self.b = Variable(random.uniform(-1, 1), label="b")
+        self.w = [Variable(scalar_uniform(), label=f"W{_}") for _ in range(input_dim)]
+        self.b = Variable(scalar_uniform(), label="b")
         self.margin = 1.0  # Margin parameter for SVM
         self.costFunction = CostFunction.hinge_loss
         self.alpha = [Variable(0) for _ in range(input_dim)]
         self.learning_rate = learning_rate
+        self._program = None
+        self._flat = None
 
-    def predict(self, X):
+    @no_grad()
+    def predict(self, X, chunk_size=8192, n_jobs=1, backend='thread'):
         """
-        Predicts the output for a given input x using the SVM model.
+        Predicts the output for a given input x using the SVM model, chunk by chunk
+        into one preallocated array.
+
+        Parameters:
+        -----------
+        X : array_like
+            Input data, (n_samples, input_dim).
+        chunk_size : int, optional
+            Rows evaluated at a time, which bounds the work memory. Defaults to 8192.
+        n_jobs : int, optional
+            Number of threads or processes evaluating the chunks (see
+            `predict_in_chunks`). Defaults to 1.
+        backend : str, optional
+            'thread' or 'process'. Defaults to 'thread'.
+
+        Returns:
+        -----------
+        numpy.ndarray:
+            Decision values, (n_samples,).
         """
-        ypreds = [self(x) for x in X]
-        return ypreds
+        return predict_in_chunks(self, X, chunk_size, n_jobs, backend)
+
+    def get_config(self):
+        """
+        Get the constructor arguments of the model, as stored by `save`.
+
+        Returns:
+        -----------
+        dict:
+            Keyword arguments that rebuild the same architecture.
+        """
+        return {'input_dim': len(self.w), 'learning_rate': self.learning_rate}
+
+    def save(self, path):
+        """
+        Saves the architecture and the parameters to a binary checkpoint: a JSON
+        header followed by the flat parameter array (see `src/Helpers/Checkpoint.py`).
+
+        Parameters:
+        -----------
+        path : str
+            File to write.
+        """
+        save_model(self, path)
+
+    @classmethod
+    def load(cls, path, mmap=True):
+        """
+        Loads a model written by `save`.
+
+        Parameters:
+        -----------
+        path : str
+            Checkpoint file.
+        mmap : bool, optional
+            Memory-map the parameters instead of reading them, so their values are
+            read from disk when first used. The model still builds one Parameter per
+            weight, so loading takes time linear in the number of weights. Defaults
+            to True.
+
+        Returns:
+        -----------
+        SVM:
+            The model, with its parameters in `flat_parameters()`.
+        """
+        return load_model(cls, path, mmap)
+
+    def flat_parameters(self, data=None):
+        """
+        Moves the parameters into one contiguous `ParameterBuffer`. Every weight
+        becomes a `Parameter` view into `buffer.data` / `buffer.grad`, so optimizer
+        steps, gradient zeroing, norms and clipping are single array operations.
+
+        Parameters:
+        -----------
+        data : numpy.ndarray, optional
+            Flat array to adopt as the parameter values when the buffer is created,
+            instead of the current ones (see `load`).
+
+        Returns:
+        -----------
+        ParameterBuffer:
+            The model's parameters and gradients as flat arrays.
+        """
+        if self._flat is None:
+            self._flat = ParameterBuffer(self.parameters(), data)
+            n = len(self.alpha)
+            self.alpha, self.w, self.b = self._flat.parameters[:n], self._flat.parameters[n:-1], self._flat.parameters[-1]
+            self._program = None  # the compiled program refers to the replaced Variables
+        return self._flat
+
+    def compile(self):
+        """
+        Traces the model once into a `Program` that `fit` and `predict` run on
+        whole batches without building a graph per sample.
+
+        Returns:
+        -----------
+        Program:
+            The compiled model.
+        """
+        if self._program is None:
+            self._program = trace(self, len(self.w))
+        return self._program
     
     def __call__(self, x):
         """
         Computes the output of the model for a given input.
 
         Parameters:
-            x (array_like): Input data.
+            x (array_like or Tensor): Input data. A 2-D Tensor is treated as a
+                whole batch and evaluated as a single matrix product.
 
         Returns:
-            float: Output of the model.
+            float or Tensor: Output of the model.
         """
-        y_hat = sum((w_i * x_i for w_i, x_i in zip(self.w, x.T)), self.b)  # Forward pass
+        if isinstance(x, Tensor):
+            return x @ Tensor.from_variables(self.w) + Tensor.from_variables([self.b])
+        y_hat = Variable.dot(self.w, x.T) + self.b  # Forward pass
         return y_hat
     
     def parameters(self):
@@ -93,7 +203,7 @@ class SVM:
         return self.alpha + self.w + [self.b]
 
     def fit(self, X, y, num_epochs=5,
-            batch_size=1024, optimizer='SGD'):
+            batch_size=1024, optimizer='SGD', n_jobs=1, schedule=None, clip_norm=None, clip_value=None):
         """
         Fits the SVM model to the given data.
 
@@ -102,38 +212,69 @@ class SVM:
             y (array_like): Target values (-1 or 1 for binary classification).
             num_epochs (int, optional): Number of epochs for training. Defaults to 300.
             batch_size (int, optional): Batch size for mini-batch optimization. Defaults to 1024.
-            optimizer (str, optional): Optimization algorithm ('SGD' or 'BGD'). Defaults to 'SGD'.
+            optimizer (str or Optimizer, optional): Optimization algorithm: 'SGD', 'BGD', a stateful
+                optimizer ('Momentum', 'Nesterov', 'AdaGrad', 'RMSProp', 'Adam'), 'LBFGS' (full batch,
+                one iteration per epoch until converged; the hinge loss is not smooth, so it may
+                stop early) or an `Optimizer` built on `flat_parameters()`. Defaults to 'SGD'.
+            n_jobs (int, optional): Number of worker processes sharing each batch
+                (see `DataParallel`). Defaults to 1, no worker processes.
+            schedule (Schedule, optional): Learning-rate schedule applied by the optimizer
+                (see `src/Optimizers/schedules.py`). Defaults to None.
+            clip_norm (float, optional): Largest global L2 norm of the gradient of a step.
+                Defaults to None.
+            clip_value (float, optional): Largest magnitude of any gradient entry of a step.
+                Defaults to None.
         """
-        for epoch in range(num_epochs):
-            if batch_size is None:
-                Xb, yb = X, y
-            else:
-                ri = np.random.permutation(X.shape[0])[:batch_size]
-                Xb, yb = X[ri], y[ri]
-
-            ypreds = self.predict(Xb)    
-
-            # Forward pass
-            losses = [self.costFunction(ypred, y_) for ypred, y_ in zip(ypreds, yb)]
-            gradients = {parameter.label: [] for parameter in self.parameters()}
-                        
-            for k, loss in enumerate(losses):
-                loss.backward()
-                self.loss = loss
-                for parameter in self.parameters():
-                    gradients[parameter.label].append(parameter.grad)
-                    parameter.grad = 0.0
-
-            # Update using specified optimizer
-            if optimizer == 'SGD':
-                Optimizers.SGD(self.parameters(), gradients, self.learning_rate)
+        flat = self.flat_parameters()
+        summed = optimizer == 'BGD'
+        optimizer = make_optimizer(optimizer, flat, self.learning_rate, schedule, clip_norm, clip_value)
+        flat.zero_grad()  # the gradients are accumulated into flat.grad
+        program = self.compile()
+        workers = DataParallel(self, X, y, self.costFunction, n_jobs) if n_jobs > 1 else None
+        if isinstance(optimizer, LBFGS):
+            # full batch: one quasi-Newton iteration per epoch, until converged
+            optimizer.reset(history=False)  # a cached gradient from an earlier fit may be for other data
+            everything = np.arange(X.shape[0])
+
+            def closure():
+                flat.zero_grad()
+                if workers is None:
+                    losses, _ = program.per_sample_gradients(X, y, self.costFunction, 'mean', out=flat.grad)
+                else:
+                    losses, _ = workers.per_sample_gradients(everything, 'mean', out=flat.grad)
+                return losses.mean()
+
+            for epoch in range(num_epochs):
+                loss = optimizer.step(closure)
+                if epoch % 10 == 0 or optimizer.converged:
+                    print(f"Epoch {epoch}, Loss: {loss}")
+                if optimizer.converged:
+                    break
+        else:
+            for epoch in range(num_epochs):
+                if batch_size is None:
+                    ri = np.arange(X.shape[0])
+                    Xb, yb = X, y
+                else:
+                    ri = np.random.permutation(X.shape[0])[:batch_size]
+                    Xb, yb = X[ri], y[ri]
+
+                # Forward and backward pass over the whole batch, accumulated into flat.grad
+                reduction = 'sum' if summed else 'mean'
+                if workers is None:
+                    losses, _ = program.per_sample_gradients(Xb, yb, self.costFunction, reduction, out=flat.grad)
+                else:
+                    losses, _ = workers.per_sample_gradients(ri, reduction, out=flat.grad)
+
+                # Update using specified optimizer
+                optimizer.step(len(Xb) if summed else 1)
+                optimizer.zero_grad()
+                optimizer.end_epoch(losses.sum())
                 if epoch % 10 == 0:
-                    print(f"Epoch {epoch}, Loss: {sum([loss.data for loss in losses])}")
+                    print(f"Epoch {epoch}, Loss: {losses.sum()}")
 
-            elif optimizer == 'BGD':
-                Optimizers.batch_gradient_descent(self.parameters(), self.learning_rate, batch_size)
-                if epoch % 10 == 0:
-                    print(f"Epoch {epoch}, Loss: {sum([loss.data for loss in losses])}")
+        if workers is not None:
+            workers.close()
 
     def fit_lagrangian(self, X, y, num_epochs=5):
         """
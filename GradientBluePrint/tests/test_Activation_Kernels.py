@@ -0,0 +1,90 @@
+import unittest
+import sys, os
+import numpy as np
+
+# # Get the parent directory
+parent_directory = sys.path[0]  # Assumes the script is in the parent directory
+
+# # Add the parent directory to the Python path
+grandparent_directory = os.path.dirname(parent_directory)
+
+sys.path.append(grandparent_directory)
+
+from src.Gradient.Gradient import Variable
+from src.NNS import Activation_Kernels as kernels
+from src.NNS.Activation_Functions import Activations
+
+
+class Test_Activation_Kernels(unittest.TestCase):
+    """Tests the array kernels of the activation functions.
+    1. agreement with the scalar Activations
+    2. no overflow for large inputs
+    3. backward kernels against finite differences
+    4. in-place evaluation
+    5. integer input
+    """
+
+    def setUp(self):
+        """This method recreates the inputs for each new test."""
+
+        self.x = np.random.default_rng(0).normal(scale=3.0, size=(5, 4))
+
+    #------------------------------TESTS------------------------------
+    def test_scalar_agreement(self):
+        """Tests that each kernel matches the scalar activation entry by entry."""
+
+        for name in ['sigmoid', 'tanh', 'relu', 'leaky_relu']:
+            expected = [[getattr(Activations, name)(Variable(v)).data for v in row] for row in self.x]
+            np.testing.assert_allclose(kernels.FORWARD[name](self.x), expected, rtol=1e-15)
+        expected = [[t.data for t in Activations.softmax([Variable(v) for v in row])] for row in self.x]
+        np.testing.assert_allclose(kernels.softmax(self.x), expected, rtol=1e-14)
+
+    def test_overflow(self):
+        """Tests that large inputs give the limits without floating point overflow."""
+
+        x = np.array([-1000.0, -40.0, 0.0, 40.0, 1000.0])
+        with np.errstate(over='raise', invalid='raise'):
+            np.testing.assert_allclose(kernels.sigmoid(x), [0.0, 1 / (1 + np.exp(40)), 0.5, 1 / (1 + np.exp(-40)), 1.0])
+            np.testing.assert_allclose(kernels.tanh(x)[[0, -1]], [-1.0, 1.0])
+            np.testing.assert_allclose(kernels.softmax(np.array([[1000.0, 0.0], [-1000.0, -1000.0]])),
+                                       [[1.0, 0.0], [0.5, 0.5]])
+        self.assertEqual(Activations.sigmoid(Variable(-1000.0)).data, 0.0)
+        self.assertEqual(Activations.tanh(Variable(1000.0)).data, 1.0)
+
+    def test_backward(self):
+        """Tests every backward kernel against finite differences of sum(w * f(x))."""
+
+        eps = 1e-6
+        w = np.random.default_rng(1).normal(size=self.x.shape)
+        for name in ['sigmoid', 'tanh', 'relu', 'leaky_relu', 'softmax']:
+            f = kernels.FORWARD[name]
+            grad = kernels.BACKWARD[name](f(self.x), w)
+            numerical = np.zeros_like(self.x)
+            for i in np.ndindex(self.x.shape):
+                up, down = self.x.copy(), self.x.copy()
+                up[i] += eps
+                down[i] -= eps
+                numerical[i] = ((f(up) - f(down)) * w).sum() / (2 * eps)
+            np.testing.assert_allclose(grad, numerical, rtol=1e-5, atol=1e-8)
+
+    def test_in_place(self):
+        """Tests that out=x overwrites the input with the activation."""
+
+        for name in ['sigmoid', 'tanh', 'relu', 'leaky_relu', 'softmax']:
+            x = self.x.copy()
+            result = kernels.FORWARD[name](x, out=x)
+            self.assertIs(result, x)
+            np.testing.assert_allclose(x, kernels.FORWARD[name](self.x), rtol=1e-15)
+
+    def test_integer_input(self):
+        """Tests that every kernel returns floats for an integer array."""
+
+        x = np.array([[1, 2, 3], [0, -1, 5]])
+        for name, kernel in kernels.FORWARD.items():
+            result = kernel(x)
+            self.assertEqual(result.dtype, np.float64, name)
+            np.testing.assert_allclose(result, kernel(x.astype(float)), rtol=1e-15)
+
+
+if __name__ == '__main__':
+    unittest.main()
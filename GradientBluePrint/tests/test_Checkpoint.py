@@ -0,0 +1,110 @@
+import unittest
+import sys, os
+import tempfile
+import pickle
+import numpy as np
+
+# # Get the parent directory
+parent_directory = sys.path[0]  # Assumes the script is in the parent directory
+
+# # Add the parent directory to the Python path
+grandparent_directory = os.path.dirname(parent_directory)
+
+sys.path.append(grandparent_directory)
+
+from src.Helpers.Checkpoint import read_header, ALIGNMENT
+from src.Gradient.Parameters import skip_init
+from src.Regression.Linear_Regression import LinearRegression
+from src.Regression.Logistic_Regression import LogisticRegression
+from src.SVM.SVM import SVM
+from src.NNS.Neural_Network import MLP
+
+
+def outputs(model, X):
+    """The batch outputs of a model, through `forward` for a Dense MLP and the compiled program otherwise."""
+    return model.forward(X) if getattr(model, 'dense', False) else model.compile()(X)
+
+
+class Test_Checkpoint(unittest.TestCase):
+    """Tests saving and loading models.
+    1. round trip of every model, memory-mapped and read into memory
+    2. training a memory-mapped model leaves the file unchanged
+    3. mismatched class or corrupt file
+    4. pickling a flattened model keeps its parameters tied to the buffer
+    5. skip_init() skips the random initialization of scalar models too
+    """
+
+    def setUp(self):
+        """This method recreates the data and a scratch directory for each new test."""
+
+        self.X = np.random.default_rng(0).normal(size=(8, 3))
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, 'model.ckpt')
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    #------------------------------TESTS------------------------------
+    def test_round_trip(self):
+        """Tests that a loaded model has the same architecture and outputs."""
+
+        for model in [LinearRegression(3), LogisticRegression(3), LogisticRegression(3, multiclass=True, k=4),
+                      SVM(3, learning_rate=0.01), MLP(3, [4, 2], ['tanh', 'sigmoid']),
+                      MLP(3, [5, 1], ['relu', 'linear'], dense=True)]:
+            model.save(self.path)
+            header = read_header(self.path)
+            self.assertEqual(header['data_offset'] % ALIGNMENT, 0)
+            self.assertEqual(os.path.getsize(self.path), header['data_offset'] + 8 * len(model.flat_parameters()))
+            for mmap in (True, False):
+                loaded = type(model).load(self.path, mmap=mmap)
+                self.assertEqual(loaded.get_config(), model.get_config())
+                self.assertEqual(isinstance(loaded.flat_parameters().data, np.memmap), mmap)
+                np.testing.assert_array_equal(outputs(loaded, self.X), outputs(model, self.X))
+
+    def test_copy_on_write(self):
+        """Tests that training a memory-mapped model does not write to the checkpoint."""
+
+        model = MLP(3, [4, 1], ['tanh', 'linear'], dense=True)
+        model.save(self.path)
+        with open(self.path, 'rb') as f:
+            saved = f.read()
+        loaded = MLP.load(self.path)
+        loaded.fit(self.X, self.X.sum(axis=1), epochs=2, learning_rate=0.1)
+        self.assertFalse(np.array_equal(loaded.flat_parameters().data, model.flat_parameters().data))
+        with open(self.path, 'rb') as f:
+            self.assertEqual(f.read(), saved)
+
+    def test_errors(self):
+        """Tests that loading the wrong class or a file that is not a checkpoint raises ValueError."""
+
+        LinearRegression(3).save(self.path)
+        with self.assertRaises(ValueError):
+            SVM.load(self.path)
+        with open(self.path, 'wb') as f:
+            f.write(b'not a checkpoint')
+        with self.assertRaises(ValueError):
+            LinearRegression.load(self.path)
+
+    def test_pickle(self):
+        """Tests that an unpickled flattened model still updates through its flat buffer."""
+
+        for model in [MLP(3, [4, 1], ['tanh', 'linear']), MLP(3, [4, 1], ['tanh', 'linear'], dense=True)]:
+            model.flat_parameters()
+            copy = pickle.loads(pickle.dumps(model))
+            np.testing.assert_array_equal(outputs(copy, self.X), outputs(model, self.X))
+            copy.flat_parameters().data[-1] += 1.0
+            np.testing.assert_allclose(outputs(copy, self.X), outputs(model, self.X) + 1.0, rtol=1e-12)
+
+    def test_skip_init(self):
+        """Tests that scalar models built inside skip_init() draw no random values."""
+
+        with skip_init():
+            models = [LinearRegression(3), LogisticRegression(3, multiclass=True, k=2), SVM(3),
+                      MLP(3, [4, 1], ['tanh', 'linear'])]
+        for model in models:
+            self.assertFalse(model.flat_parameters().data.any(), type(model).__name__)
+        self.assertTrue(LinearRegression(3).flat_parameters().data.any())
+
+
+if __name__ == '__main__':
+    unittest.main()
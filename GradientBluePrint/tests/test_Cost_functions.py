@@ -0,0 +1,99 @@
+import unittest
+import sys, os
+import numpy as np
+
+# # Get the parent directory
+parent_directory = sys.path[0]  # Assumes the script is in the parent directory
+
+# # Add the parent directory to the Python path
+grandparent_directory = os.path.dirname(parent_directory)
+
+sys.path.append(grandparent_directory)
+
+from src.Gradient.Gradient import Variable
+from src.Gradient.Tensor import Tensor
+from src.Cost_functions.Cost_functions import CostFunction
+from src.NNS.Activation_Functions import Activations
+
+
+def per_sample(cost_function, y_hat, y, wrap=lambda row: Variable(row)):
+    """Losses and gradients of a per-sample cost function, sample by sample."""
+    losses, gradients = [], []
+    for row, y_ in zip(y_hat, y):
+        v = wrap(row)
+        loss = cost_function(v, y_)
+        loss.backward()
+        losses.append(loss.data)
+        gradients.append([x.grad for x in v] if isinstance(v, list) else v.grad)
+    return np.array(losses), np.array(gradients)
+
+
+class Test_Cost_functions(unittest.TestCase):
+    """Tests the batch cost functions.
+    1. agreement with the per-sample cost functions
+    2. mean / sum / none reductions and sample weights
+    3. hinge loss subgradient
+    """
+
+    def setUp(self):
+        """This method recreates the batch for each new test."""
+
+        rng = np.random.default_rng(0)
+        self.p = rng.uniform(0.05, 0.95, 8)
+        self.labels = rng.integers(0, 2, (8, 1))
+        self.logits = rng.normal(size=(8, 4))
+        self.classes = rng.integers(0, 4, (8, 1))
+
+    def check_batch(self, cost_function, batch_function, y_hat, y, wrap=lambda row: Variable(row)):
+        """Compares a batch cost function (reduction='none') with its per-sample version."""
+
+        expected_losses, expected_gradients = per_sample(cost_function, y_hat, y, wrap)
+        tensor = Tensor(y_hat)
+        loss = batch_function(tensor, y, reduction='none')
+        loss.backward()
+        np.testing.assert_allclose(loss.data, expected_losses, rtol=1e-12)
+        np.testing.assert_allclose(tensor.grad, expected_gradients, rtol=1e-12)
+
+    #------------------------------TESTS------------------------------
+    def test_agreement(self):
+        """Tests every batch cost function against the per-sample one."""
+
+        softmax = lambda row: Activations.softmax([Variable(v) for v in row])
+        self.check_batch(CostFunction.log_loss, CostFunction.batch_log_loss, self.p, self.labels)
+        self.check_batch(CostFunction.sse, CostFunction.batch_sse, self.p, self.labels.ravel())
+        self.check_batch(CostFunction.hinge_loss, CostFunction.batch_hinge_loss,
+                         self.logits[:, 0], 2.0 * self.labels.ravel() - 1)
+        self.check_batch(CostFunction.softmax_cross_entropy_loss, CostFunction.batch_softmax_cross_entropy_loss,
+                         self.logits, self.classes, wrap=lambda row: [Variable(v) for v in row])
+        probabilities = np.array([[t.data for t in softmax(row)] for row in self.logits])
+        self.check_batch(CostFunction.categorical_cross_entropy_loss,
+                         CostFunction.batch_categorical_cross_entropy_loss, probabilities, self.classes,
+                         wrap=lambda row: [Variable(v) for v in row])
+
+    def test_reductions(self):
+        """Tests the mean and sum reductions, with and without sample weights."""
+
+        weights = np.arange(1.0, 9.0)
+        losses, gradients = per_sample(CostFunction.log_loss, self.p, self.labels)
+        for reduction, sample_weight, scale in [('sum', None, np.ones(8)), ('mean', None, np.ones(8) / 8),
+                                                ('sum', weights, weights), ('mean', weights, weights / weights.sum())]:
+            y_hat = Tensor(self.p)
+            loss = CostFunction.batch_log_loss(y_hat, self.labels, reduction, sample_weight)
+            self.assertEqual(loss.shape, ())
+            loss.backward()
+            self.assertAlmostEqual(float(loss.data), (losses * scale).sum())
+            np.testing.assert_allclose(y_hat.grad, gradients * scale, rtol=1e-12)
+
+    def test_hinge_subgradient(self):
+        """Tests that the hinge loss is max(0, 1 - y * y_hat) with a zero gradient past the margin."""
+
+        for y_hat, y, loss, grad in [(0.5, 1, 0.5, -1.0), (2.0, 1, 0.0, 0.0),
+                                     (0.5, -1, 1.5, 1.0), (-2.0, -1, 0.0, 0.0)]:
+            v = Variable(y_hat)
+            result = CostFunction.hinge_loss(v, y)
+            result.backward()
+            self.assertEqual((result.data, v.grad), (loss, grad))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,140 @@
+import unittest
+import sys, os
+import numpy as np
+
+# # Get the parent directory
+parent_directory = sys.path[0]  # Assumes the script is in the parent directory
+
+# # Add the parent directory to the Python path
+grandparent_directory = os.path.dirname(parent_directory)
+
+sys.path.append(grandparent_directory)
+
+from src.Gradient.Tensor import Tensor
+from src.NNS.Neural_Network import MLP, Dense
+
+
+def copy_weights(dense_mlp, mlp):
+    """Sets the Neuron weights of `mlp` to the Dense weights of `dense_mlp`."""
+    for dense, layer in zip(dense_mlp.layers.values(), mlp.layers.values()):
+        for j, neuron in enumerate(layer.neurons):
+            for i, w in enumerate(neuron.w):
+                w.data = dense.W.data[i, j]
+            neuron.b.data = dense.b.data[j]
+
+
+class Test_Dense(unittest.TestCase):
+    """Tests the Dense layer and the Dense MLP.
+    1. forward against the Neuron MLP
+    2. vectorized backward against the Tensor graph
+    3. parameters() contract
+    4. MLP.fit on the Dense and the Neuron MLP
+    5. MLP.fit with (n_samples, n_outputs) targets
+    6. unknown activation names
+    7. categorical cross-entropy is rejected for a Neuron MLP
+    """
+
+    def setUp(self):
+        """This method recreates the data for each new test."""
+
+        rng = np.random.default_rng(0)
+        self.X = rng.normal(size=(6, 3))
+        self.y = rng.normal(size=(6, 2))
+
+    #------------------------------TESTS------------------------------
+    def test_forward(self):
+        """Tests that a Dense MLP computes what the Neuron MLP with the same weights computes."""
+
+        dense = MLP(3, [5, 4, 2], ['tanh', 'relu', 'sigmoid'], dense=True)
+        scalar = MLP(3, [5, 4, 2], ['tanh', 'relu', 'sigmoid'])
+        copy_weights(dense, scalar)
+        expected = [[v.data for v in scalar(list(x))] for x in self.X]
+        np.testing.assert_allclose(dense.forward(self.X), expected, rtol=1e-12)
+        np.testing.assert_allclose(dense(Tensor(self.X)).data, expected, rtol=1e-12)
+        np.testing.assert_allclose(dense.predict(self.X), expected, rtol=1e-12)
+
+    def test_backward(self):
+        """Tests Dense.backward against the gradients of the Tensor graph."""
+
+        model = MLP(3, [5, 4, 2], ['leaky_relu', 'tanh', 'softmax'], dense=True)
+        ((model(Tensor(self.X)) - self.y) ** 2).sum().backward()
+        expected = [p.grad.copy() for p in model.parameters()]
+        for p in model.parameters():
+            p.grad = np.zeros_like(p.data)
+
+        output = model.forward(self.X)
+        model.backward(2 * (output - self.y))
+        for p, grad in zip(model.parameters(), expected):
+            np.testing.assert_allclose(p.grad, grad, rtol=1e-10, atol=1e-12)
+
+    def test_parameters(self):
+        """Tests that parameters() returns the W and b arrays of every layer."""
+
+        model = MLP(3, [5, 1], ['tanh', 'linear'], dense=True)
+        shapes = [p.shape for p in model.parameters()]
+        self.assertEqual(shapes, [(3, 5), (5,), (5, 1), (1,)])
+        self.assertEqual([p.label for p in model.parameters()], ['Layer1_W', 'Layer1_b', 'Layer2_W', 'Layer2_b'])
+        self.assertIsInstance(model.layers['layer_1'], Dense)
+        self.assertEqual(model(Tensor(self.X)).shape, (6,))
+
+    def test_fit(self):
+        """Tests that a fit step updates a Dense and a Neuron MLP alike and that the loss decreases."""
+
+        dense = MLP(3, [5, 1], ['tanh', 'linear'], dense=True)
+        scalar = MLP(3, [5, 1], ['tanh', 'linear'])
+        copy_weights(dense, scalar)
+        y = self.y[:, 0]
+        for model in (dense, scalar):
+            model.fit(self.X, y, loss='sse', optimizer='BGD', epochs=1, learning_rate=0.1, shuffle=False)
+        copy = MLP(3, [5, 1], ['tanh', 'linear'])
+        copy_weights(dense, copy)
+        np.testing.assert_allclose([p.data for p in copy.parameters()], [p.data for p in scalar.parameters()],
+                                   rtol=1e-10)
+
+        grads = [p.grad for p in dense.parameters()]
+        history = dense.fit(self.X, y, loss='sse', batch_size=2, epochs=20, learning_rate=0.05)
+        self.assertLess(history[-1]['loss'], history[0]['loss'])
+        self.assertGreater(history[0]['samples_per_sec'], 0)
+        for p, grad in zip(dense.parameters(), grads):
+            self.assertIs(p.grad, grad)
+            self.assertFalse(p.grad.any())
+
+    def test_fit_multi_output(self):
+        """Tests that both MLPs fit 2-D targets alike, with the summed squared errors per sample."""
+
+        dense = MLP(3, [5, 2], ['tanh', 'linear'], dense=True)
+        scalar = MLP(3, [5, 2], ['tanh', 'linear'])
+        copy_weights(dense, scalar)
+        expected = ((dense.predict(self.X) - self.y) ** 2).sum(axis=1).mean()
+        for model in (dense, scalar):
+            history = model.fit(self.X, self.y, loss='sse', optimizer='BGD', epochs=1, learning_rate=0.1,
+                                shuffle=False)
+            self.assertAlmostEqual(history[0]['loss'], expected)
+        copy = MLP(3, [5, 2], ['tanh', 'linear'])
+        copy_weights(dense, copy)
+        np.testing.assert_allclose([p.data for p in copy.parameters()], [p.data for p in scalar.parameters()],
+                                   rtol=1e-10)
+
+        history = dense.fit(self.X, self.y, loss='sse', batch_size=2, epochs=20, learning_rate=0.05)
+        self.assertLess(history[-1]['loss'], history[0]['loss'])
+
+    def test_unknown_activation(self):
+        """Tests that a misspelled activation is rejected instead of running as linear."""
+
+        with self.assertRaisesRegex(ValueError, "unknown activation 'sigmod'"):
+            MLP(2, [3, 1], ['sigmod', 'linear'], dense=True)
+        MLP(2, [3, 1], ['sigmoid', 'linear'], dense=True)
+
+    def test_categorical_neuron(self):
+        """Tests that fit() with categorical cross-entropy needs the softmax of a Dense MLP."""
+
+        y = np.array([[0], [1], [2], [1], [0], [2]])
+        with self.assertRaisesRegex(ValueError, 'dense=True'):
+            MLP(3, [4, 3], ['tanh', 'linear']).fit(self.X, y, loss='categorical_cross_entropy_loss')
+        history = MLP(3, [4, 3], ['tanh', 'softmax'], dense=True).fit(self.X, y, loss='categorical_cross_entropy_loss',
+                                                                      epochs=2, batch_size=3)
+        self.assertEqual(len(history), 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
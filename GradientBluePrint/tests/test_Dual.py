@@ -0,0 +1,123 @@
+import unittest
+import sys, os
+import numpy as np
+
+# # Get the parent directory
+parent_directory = sys.path[0]  # Assumes the script is in the parent directory
+
+# # Add the parent directory to the Python path
+grandparent_directory = os.path.dirname(parent_directory)
+
+sys.path.append(grandparent_directory)
+
+from src.Gradient.Gradient import Variable
+from src.Gradient.Dual import jvp
+from src.NNS.Activation_Functions import Activations
+from src.NNS.Neural_Network import MLP
+from src.Regression.Linear_Regression import LinearRegression
+from src.Regression.Logistic_Regression import LogisticRegression
+from src.SVM.SVM import SVM
+
+
+def reverse_jacobian(model, x):
+    """Jacobian of a list-valued model with one backward() per output."""
+    rows = []
+    for i in range(len(model(list(x)))):
+        inputs = [Variable(x_i) for x_i in x]
+        model(inputs)[i].backward()
+        rows.append([v.grad for v in inputs])
+    return np.array(rows)
+
+
+class Test_Dual(unittest.TestCase):
+    """Tests the forward-mode Dual class and jvp().
+    1. arithmetic tangents
+    2. activation tangents
+    3. jvp() of an MLP against reverse mode
+    4. several directions in one sweep
+    5. jvp() of the regression models and the SVM
+    6. jvp() of a Dense MLP
+    """
+
+    def setUp(self):
+        """This method recreates the inputs for each new test."""
+
+        self.x = np.array([0.4, -1.2, 0.9])
+        self.v = np.array([1.0, 0.5, -2.0])
+
+    def check_directional(self, f):
+        """Compares jvp() of the scalar f against central finite differences."""
+
+        eps = 1e-6
+        evaluate = lambda x: f([Variable(x_i) for x_i in x]).data
+        value, tangent = jvp(f, self.x, self.v)
+        self.assertAlmostEqual(value, evaluate(self.x))
+        expected = (evaluate(self.x + eps * self.v) - evaluate(self.x - eps * self.v)) / (2 * eps)
+        self.assertAlmostEqual(tangent, expected, places=5)
+
+    #------------------------------TESTS------------------------------
+    def test_arithmetic(self):
+        """Tests +, -, *, / and ** against finite differences."""
+
+        self.check_directional(lambda z: z[0] * z[1] - z[2] / z[1] + 3)
+        self.check_directional(lambda z: (2 - z[0]) ** 3 + 1 / z[2])
+        self.check_directional(lambda z: (z[0] * Variable(2.0) + z[1]).exp().log() - z[2] * z[2])
+
+    def test_activations(self):
+        """Tests Activations on Duals against finite differences."""
+
+        for name in ['sigmoid', 'tanh', 'relu', 'leaky_relu']:
+            self.check_directional(lambda z: getattr(Activations, name)(z[0] * z[1] + z[2]))
+        self.check_directional(lambda z: Activations.softmax(z)[1])
+
+    def test_mlp_jvp(self):
+        """Tests jvp() of an MLP against the reverse-mode Jacobian."""
+
+        model = MLP(3, [6, 4], ['tanh', 'sigmoid'])
+        values, tangents = jvp(model, self.x, self.v)
+        np.testing.assert_allclose(values, [y.data for y in model(list(self.x))])
+        np.testing.assert_allclose(tangents, reverse_jacobian(model, self.x) @ self.v, rtol=1e-10, atol=1e-12)
+
+        model = LogisticRegression(3, multiclass=True, k=4)
+        values, tangents = jvp(model, self.x, self.v)
+        self.assertEqual(tangents.shape, (4,))
+        np.testing.assert_allclose(tangents.sum(), 0.0, atol=1e-12)  # softmax outputs sum to one
+
+    def test_multiple_directions(self):
+        """Tests that an (n, k) direction matrix gives J @ V in one sweep."""
+
+        model = MLP(3, [5, 2], ['relu', 'linear'])
+        _, jacobian = jvp(model, self.x, np.eye(3))
+        np.testing.assert_allclose(jacobian, reverse_jacobian(model, self.x), rtol=1e-10, atol=1e-12)
+
+    def test_model_jvp(self):
+        """Tests jvp() of the models whose __call__ uses x.T against their weights."""
+
+        for model in [LinearRegression(3), SVM(3)]:
+            w = np.array([p.data for p in model.w])
+            value, tangent = jvp(model, self.x, self.v)
+            self.assertAlmostEqual(value, w @ self.x + model.b.data)
+            self.assertAlmostEqual(tangent, w @ self.v)
+            _, gradient = jvp(model, self.x, np.eye(3))
+            np.testing.assert_allclose(gradient, w)
+
+        model = LogisticRegression(3)
+        w = np.array([p.data for p in model.w])
+        value, tangent = jvp(model, self.x, self.v)
+        self.assertAlmostEqual(tangent, value * (1 - value) * (w @ self.v))
+
+    def test_dense_jvp(self):
+        """Tests jvp() of a Dense MLP against finite differences of predict()."""
+
+        eps = 1e-6
+        for layers_dim, activations in [([5, 3], ['tanh', 'softmax']), ([4, 1], ['relu', 'linear'])]:
+            model = MLP(3, layers_dim, activations, dense=True)
+            values, jacobian = jvp(model, self.x, np.eye(3))
+            np.testing.assert_allclose(values, model.predict(self.x).ravel(), rtol=1e-12)
+            expected = [(model.predict(self.x + eps * e) - model.predict(self.x - eps * e)).ravel() / (2 * eps)
+                        for e in np.eye(3)]
+            np.testing.assert_allclose(np.reshape(jacobian, (-1, 3)), np.transpose(expected), rtol=1e-6, atol=1e-8)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,304 @@
+import unittest
+import math
+import sys, os
+import threading
+import numpy as np
+
+# # Get the parent directory
+parent_directory = sys.path[0]  # Assumes the script is in the parent directory
+
+# # Add the parent directory to the Python path
+grandparent_directory = os.path.dirname(parent_directory)
+
+sys.path.append(grandparent_directory)
+
+from src.Gradient.Gradient import Variable, Op, topological_sort, no_grad, enable_grad, is_grad_enabled, hvp
+from src.NNS.Activation_Functions import Activations
+from src.NNS.Neural_Network import MLP
+from src.Cost_functions.Cost_functions import CostFunction
+from src.Regression.Linear_Regression import LinearRegression
+
+
+class Test_Gradient(unittest.TestCase):
+    """Tests the backward pass of Variable class.
+    12. backward() through arithmetic operations
+    13. backward() through exp(), log() and activations
+    14. backward() through softmax
+    15. slotted node layout
+    16. backward() on graphs deeper than the recursion limit
+    17. backward(cache_tape=True)
+    18. no_grad() / enable_grad()
+    19. backward(retain_graph=...)
+    20. fused Variable.sum() / Variable.dot() nodes
+    21. backward(create_graph=True)
+    22. hvp()
+    23. fused softmax cross-entropy
+    24. no_grad() on concurrent threads
+    25. backward() through a freed graph
+    """
+
+    def setUp(self):
+        """This method recreates variables for each new test."""
+
+        self.a = Variable(0.5, label='a')
+        self.b = Variable(-1.5, label='b')
+
+    def numerical_gradient(self, f, x, eps=1e-6):
+        """Central finite difference of the scalar function f at x."""
+
+        return (f(x + eps) - f(x - eps)) / (2 * eps)
+
+    #------------------------------TESTS------------------------------
+    def test_arithmetic_backward(self):
+        """Tests gradients of +, -, *, / and ** against their closed forms."""
+
+        result = (self.a - self.b) * self.a + self.b ** 2 / self.a
+        result.backward()
+        a, b = self.a.data, self.b.data
+        self.assertAlmostEqual(self.a.grad, 2 * a - b - b ** 2 / a ** 2)
+        self.assertAlmostEqual(self.b.grad, -a + 2 * b / a)
+
+    def test_rsub_backward(self):
+        """Tests that the reflected operand of a subtraction gets a negative gradient."""
+
+        result = 1 - self.a
+        result.backward()
+        self.assertEqual(self.a.grad, -1.0)
+
+    def test_unary_backward(self):
+        """Tests exp(), log() and the scalar activations against finite differences."""
+
+        functions = {
+            'exp': lambda v: v.exp(),
+            'log': lambda v: (v * v).log(),
+            'sigmoid': Activations.sigmoid,
+            'tanh': Activations.tanh,
+            'relu': Activations.relu,
+            'leaky_relu': Activations.leaky_relu,
+        }
+        for name, f in functions.items():
+            for x in (self.a, self.b):
+                x.grad = 0.0
+                f(x).backward()
+                expected = self.numerical_gradient(lambda z: f(Variable(z)).data, x.data)
+                self.assertAlmostEqual(x.grad, expected, places=6, msg=name)
+
+    def test_softmax_backward(self):
+        """Tests that each softmax output propagates its own Jacobian row once."""
+
+        logits = [Variable(1.0), Variable(2.0), Variable(0.5)]
+        outputs = Activations.softmax(logits)
+        outputs[1].log().backward()
+        t = [o.data for o in outputs]
+        for j, x in enumerate(logits):
+            self.assertAlmostEqual(x.grad, (j == 1) - t[j])
+
+    def test_slots(self):
+        """Tests the compact node layout."""
+
+        result = self.a * self.b
+        self.assertFalse(hasattr(result, '__dict__'))
+        self.assertEqual(result._children, (self.a, self.b))
+        self.assertEqual(result._code, Op.MUL)
+        self.assertEqual(result._op, '*')
+
+    def test_deep_graph(self):
+        """Tests that a chain much deeper than the recursion limit can be differentiated."""
+
+        depth = 5 * sys.getrecursionlimit()
+        result = sum((self.a * 1.0 for _ in range(depth)), Variable(0.0))
+        result.backward()
+        self.assertEqual(self.a.grad, depth)
+        self.assertIs(topological_sort(result)[-1], result)
+
+    def test_cached_tape(self):
+        """Tests that replaying a cached tape gives the same gradients as the first pass."""
+
+        result = (self.a * self.b + self.a).exp()
+        result.backward(cache_tape=True)
+        grads = (self.a.grad, self.b.grad)
+        self.assertIsNotNone(result._tape)
+
+        self.a.grad, self.b.grad = 0.0, 0.0
+        result.backward()
+        self.assertEqual((self.a.grad, self.b.grad), grads)
+
+    def test_no_grad(self):
+        """Tests that no graph is recorded inside no_grad, as a context manager and as a decorator."""
+
+        with no_grad():
+            result = Activations.sigmoid(self.a * self.b + 1).exp()
+            self.assertFalse(is_grad_enabled())
+            with enable_grad():
+                recorded = self.a * self.b
+        self.assertTrue(is_grad_enabled())
+        self.assertEqual(result._children, ())
+        self.assertEqual(result._op, '')
+        self.assertEqual(result.data, Activations.sigmoid(self.a * self.b + 1).exp().data)
+        self.assertEqual(recorded._children, (self.a, self.b))
+
+        @no_grad()
+        def square(v):
+            return v * v
+        self.assertEqual(square(self.a)._children, ())
+        self.assertEqual((self.a * self.a)._children, (self.a, self.a))
+
+    def test_retain_graph(self):
+        """Tests that backward() unlinks the graph unless asked to keep it."""
+
+        hidden = self.a * self.b
+        result = hidden + self.a
+        result.backward(retain_graph=True)
+        self.assertEqual(result._children, (hidden, self.a))
+
+        result.backward()
+        self.assertEqual((self.a.grad, self.b.grad), (2 * (self.b.data + 1), 2 * self.a.data))
+        self.assertEqual(result._children, ())
+        self.assertEqual(hidden._children, ())
+        self.assertEqual(self.a._children, ())
+
+    def test_sum_dot(self):
+        """Tests that Variable.sum() and Variable.dot() match the chained graph in one node."""
+
+        w = [Variable(0.1 * i - 0.3) for i in range(8)]
+        x = [0.5 * i + 1.0 for i in range(8)]
+        dot = Variable.dot(w, x)
+        self.assertEqual(dot._op, 'dot')
+        self.assertEqual(len(topological_sort(dot)), len(w) + 1)
+        dot.backward()
+        self.assertEqual([v.grad for v in w], x)
+        self.assertAlmostEqual(dot.data, sum(w_i.data * x_i for w_i, x_i in zip(w, x)))
+
+        xs = [Variable(x_i) for x_i in x]
+        (Variable.dot(w, xs) + Variable.dot(w, w)).backward()
+        self.assertEqual([v.grad for v in xs], [w_i.data for w_i in w])
+        for w_i, x_i in zip(w, x):
+            self.assertAlmostEqual(w_i.grad, x_i + x_i + 2 * w_i.data)
+
+        total = Variable.sum([self.a, 2.0, self.b, self.a])
+        self.assertEqual(total.data, 2.0 + 2 * self.a.data + self.b.data)
+        total.backward()
+        self.assertEqual((self.a.grad, self.b.grad), (2.0, 1.0))
+
+    def test_create_graph(self):
+        """Tests that gradients built with create_graph=True can be differentiated again."""
+
+        result = self.a ** 3 * self.b + Activations.tanh(self.a * self.b)
+        result.backward(create_graph=True)
+        da = self.a.grad
+        self.assertIsInstance(da, Variable)
+        a, b = self.a.data, self.b.data
+        self.assertAlmostEqual(da.data, 3 * a ** 2 * b + (1 - math.tanh(a * b) ** 2) * b)
+
+        self.a.grad, self.b.grad = 0.0, 0.0
+        da.backward()
+        t = math.tanh(a * b)
+        self.assertAlmostEqual(self.a.grad, 6 * a * b - 2 * t * (1 - t ** 2) * b ** 2)
+        self.assertAlmostEqual(self.b.grad, 3 * a ** 2 + (1 - t ** 2) - 2 * t * (1 - t ** 2) * a * b)
+
+    def test_hvp(self):
+        """Tests hvp() on an MLP loss against finite differences of the gradient."""
+
+        model = MLP(2, [3, 3], ['tanh', 'sigmoid'])
+        params = model.parameters()
+        x = [0.3, -0.8]
+        loss_fn = lambda: Variable.sum(Activations.softmax(model(x))[0:1]) + Variable.dot(params, params)
+        direction = [((-1) ** i) * 0.1 * i for i in range(len(params))]
+
+        def gradient():
+            for p in params:
+                p.grad = 0.0
+            loss_fn().backward()
+            return [p.grad for p in params]
+
+        eps = 1e-6
+        for p, d in zip(params, direction):
+            p.data += eps * d
+        up = gradient()
+        for p, d in zip(params, direction):
+            p.data -= 2 * eps * d
+        down = gradient()
+        for p, d in zip(params, direction):
+            p.data += eps * d
+
+        for p in params:
+            p.grad = 0.5
+        result = hvp(loss_fn(), params, direction)
+        self.assertEqual([p.grad for p in params], [0.5] * len(params))
+        for actual, u, l in zip(result, up, down):
+            self.assertAlmostEqual(actual, (u - l) / (2 * eps), places=5)
+
+    def test_softmax_cross_entropy(self):
+        """Tests the fused softmax cross-entropy against the unfused graph."""
+
+        values = [0.3, -1.2, 2.0, 0.5]
+        logits = [Variable(v) for v in values]
+        unfused = -Activations.softmax(logits)[2].log()
+        unfused.backward()
+        expected = [x.grad for x in logits]
+
+        logits = [Variable(v) for v in values]
+        fused = CostFunction.categorical_cross_entropy_loss(Activations.softmax(logits), [2])
+        self.assertEqual(fused._op, 'softmax cross entropy')
+        self.assertEqual(len(topological_sort(fused)), len(logits) + 1)  # no softmax nodes
+        fused.backward()
+        self.assertAlmostEqual(fused.data, unfused.data)
+        for actual, grad in zip([x.grad for x in logits], expected):
+            self.assertAlmostEqual(actual, grad)
+
+        # log-sum-exp keeps large logits finite
+        loss = Activations.softmax_cross_entropy([Variable(1000.0), Variable(0.0)], 1)
+        self.assertAlmostEqual(loss.data, 1000.0)
+
+    def test_no_grad_threads(self):
+        """Tests that predicts running on several threads leave graph recording on."""
+
+        model = LinearRegression(3)
+        X = np.random.uniform(-1, 1, (64, 3))
+        barrier = threading.Barrier(8)
+        inside = []
+
+        def run():
+            barrier.wait()
+            for _ in range(50):
+                model.predict(X)
+            with no_grad():
+                barrier.wait()  # every thread is inside no_grad at once
+                inside.append(is_grad_enabled())
+                barrier.wait()
+
+        threads = [threading.Thread(target=run) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(inside, [False] * 8)
+        self.assertTrue(is_grad_enabled())
+        w = Variable(1.0)
+        (w * w).backward()
+        self.assertEqual(w.grad, 2.0)
+
+    def test_freed_graph(self):
+        """Tests that backward() through a node freed by an earlier backward() raises."""
+
+        w = Variable(2.0)
+        hidden = w * 3
+        first, second = hidden * hidden, hidden + 1
+        first.backward()
+        self.assertEqual(w.grad, 36.0)
+        with self.assertRaisesRegex(RuntimeError, "graph already freed"):
+            second.backward()
+        self.assertEqual(w.grad, 36.0)
+        with self.assertRaisesRegex(RuntimeError, "graph already freed"):
+            first.backward(create_graph=True)
+
+        w.grad = 0.0
+        hidden = w * 3
+        first, second = hidden * hidden, hidden + 1
+        first.backward(retain_graph=True)
+        second.backward()
+        self.assertEqual(w.grad, 39.0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,245 @@
+import unittest
+import sys, os
+import numpy as np
+
+# # Get the parent directory
+parent_directory = sys.path[0]  # Assumes the script is in the parent directory
+
+# # Add the parent directory to the Python path
+grandparent_directory = os.path.dirname(parent_directory)
+
+sys.path.append(grandparent_directory)
+
+from src.Gradient.Gradient import Variable
+from src.Gradient.Tensor import Tensor
+from src.Gradient.Parameters import ParameterBuffer
+from src.Optimizers.optimizers import Optimizer, GradientDescent, Momentum, Nesterov, AdaGrad, RMSProp, Adam, LBFGS, make_optimizer
+from src.Optimizers.schedules import Schedule, StepDecay, ExponentialDecay, CosineAnnealing, Warmup, ReduceOnPlateau
+from src.Regression.Linear_Regression import LinearRegression
+from src.Regression.Logistic_Regression import LogisticRegression
+from src.NNS.Neural_Network import MLP
+
+
+class Test_Optimizers(unittest.TestCase):
+    """Tests the stateful optimizers.
+    1. update rules against a direct numpy implementation
+    2. make_optimizer resolves names and instances
+    3. every optimizer decreases the loss through fit
+    4. an Optimizer passed to fit keeps its state across calls
+    5. learning-rate schedules
+    6. gradient clipping inside the step
+    7. schedules and clipping through fit
+    8. L-BFGS on the Rosenbrock function
+    9. fit(optimizer='lbfgs') on the convex models
+    """
+
+    def setUp(self):
+        """This method recreates the data for each new test."""
+
+        rng = np.random.default_rng(0)
+        self.X = rng.normal(size=(64, 3))
+        self.y = self.X @ np.array([1.0, -2.0, 0.5]) + 0.3
+        self.gradients = [rng.normal(size=3) for _ in range(3)]
+
+    def buffer(self):
+        return ParameterBuffer([Variable(1.0), Tensor(np.array([-1.0, 2.0]))])
+
+    #------------------------------TESTS------------------------------
+    def test_updates(self):
+        """Tests every update rule against its formula."""
+
+        lr, w0 = 0.1, np.array([1.0, -1.0, 2.0])
+        for cls in [Momentum, Nesterov, AdaGrad, RMSProp, Adam]:
+            buffer = self.buffer()
+            optimizer = cls(buffer, lr)
+            w, state = w0.copy(), [np.zeros(3), np.zeros(3)]
+            for t, g in enumerate(self.gradients, start=1):
+                buffer.grad[:] = 2 * g  # a sum over 2 samples
+                optimizer.step(2)
+                optimizer.zero_grad()
+                if cls is Momentum:
+                    state[0] = 0.9 * state[0] - lr * g
+                    w = w + state[0]
+                elif cls is Nesterov:
+                    state[0] = 0.9 * state[0] - lr * g
+                    w = w + 0.9 * state[0] - lr * g
+                elif cls is AdaGrad:
+                    state[0] = state[0] + g ** 2
+                    w = w - lr * g / (np.sqrt(state[0]) + 1e-8)
+                elif cls is RMSProp:
+                    state[0] = 0.9 * state[0] + 0.1 * g ** 2
+                    w = w - lr * g / (np.sqrt(state[0]) + 1e-8)
+                else:
+                    state[0] = 0.9 * state[0] + 0.1 * g
+                    state[1] = 0.999 * state[1] + 0.001 * g ** 2
+                    m, v = state[0] / (1 - 0.9 ** t), state[1] / (1 - 0.999 ** t)
+                    w = w - lr * m / (np.sqrt(v) + 1e-8)
+                np.testing.assert_allclose(buffer.data, w, rtol=1e-12, err_msg=cls.__name__)
+                self.assertFalse(buffer.grad.any())
+            self.assertEqual(optimizer.iterations, 3)
+
+    def test_make_optimizer(self):
+        """Tests the names and instances accepted by fit."""
+
+        buffer = self.buffer()
+        self.assertIsInstance(make_optimizer('adam', buffer, 0.1), Adam)
+        self.assertIsInstance(make_optimizer('RMSProp', buffer, 0.1), RMSProp)
+        self.assertEqual(make_optimizer('Nesterov', buffer, 0.1).learning_rate, 0.1)
+        self.assertIsInstance(make_optimizer('SGD', buffer, 0.1), GradientDescent)
+        self.assertIsInstance(make_optimizer('batch_gradient_descent', buffer, 0.1), GradientDescent)
+        self.assertEqual(make_optimizer('BGD', buffer, 0.1, clip_norm=1.0).clip_norm, 1.0)
+        with self.assertRaises(AssertionError):
+            make_optimizer('Adamax', buffer, 0.1)
+        optimizer = Momentum(buffer, 0.1)
+        self.assertIs(make_optimizer(optimizer, buffer, 0.5), optimizer)
+        with self.assertRaises(AssertionError):
+            make_optimizer(optimizer, self.buffer(), 0.1)
+        with self.assertRaises(AssertionError):
+            make_optimizer(optimizer, buffer, 0.1, schedule=StepDecay(10))
+
+        # an optimizer without an update rule cannot be built
+        class Incomplete(Optimizer):
+            pass
+        with self.assertRaises(TypeError):
+            Incomplete(buffer, 0.1)
+
+    def test_fit(self):
+        """Tests that every optimizer trains the linear model and a Dense MLP."""
+
+        for name in ['Momentum', 'Nesterov', 'AdaGrad', 'RMSProp', 'Adam']:
+            np.random.seed(0)
+            model = LinearRegression(3)
+            before = np.mean((model.predict(self.X) - self.y) ** 2)
+            model.fit(self.X, self.y, learning_rate=0.5 if name == 'AdaGrad' else 0.05, num_epochs=100, batch_size=16,
+                      optimizer=name, regularization_term=0.0)
+            self.assertLess(np.mean((model.predict(self.X) - self.y) ** 2), before / 10, name)
+
+            mlp = MLP(3, [8, 1], ['tanh', 'linear'], dense=True)
+            history = mlp.fit(self.X, self.y, optimizer=name, batch_size=16, epochs=20, learning_rate=0.01)
+            self.assertLess(history[-1]['loss'], history[0]['loss'], name)
+
+    def test_state(self):
+        """Tests that an optimizer instance keeps its step count and moments across fit calls."""
+
+        np.random.seed(0)
+        model = LinearRegression(3)
+        optimizer = Adam(model.flat_parameters(), 0.05)
+        model.fit(self.X, self.y, num_epochs=5, batch_size=16, optimizer=optimizer)
+        moment = optimizer.second_moment.copy()
+        self.assertEqual(optimizer.iterations, 5)
+        model.fit(self.X, self.y, num_epochs=5, batch_size=16, optimizer=optimizer)
+        self.assertEqual(optimizer.iterations, 10)
+        self.assertFalse(np.array_equal(optimizer.second_moment, moment))
+
+    def test_schedules(self):
+        """Tests the learning rate of every schedule, step by step."""
+
+        rates = lambda schedule, n: [schedule(1.0, t) for t in range(n)]
+        np.testing.assert_allclose(rates(StepDecay(2, 0.5), 5), [1.0, 1.0, 0.5, 0.5, 0.25])
+        np.testing.assert_allclose(rates(ExponentialDecay(0.5), 3), [1.0, 0.5, 0.25])
+        np.testing.assert_allclose(rates(CosineAnnealing(4, 0.2), 6), [1.0, 0.88284271, 0.6, 0.31715729, 0.2, 0.2])
+        np.testing.assert_allclose(rates(Warmup(4), 6), [0.25, 0.5, 0.75, 1.0, 1.0, 1.0])
+        with self.assertRaises(TypeError):
+            Schedule()  # a schedule must define __call__
+        np.testing.assert_allclose(rates(Warmup(2, ExponentialDecay(0.5)), 4), [0.5, 1.0, 1.0, 0.5])
+
+        plateau = Warmup(1, ReduceOnPlateau(factor=0.5, patience=2, min_learning_rate=0.3))
+        for loss in [3.0, 2.0, 2.0, 2.5]:
+            plateau.observe(loss)
+            self.assertEqual(plateau(1.0, 5), 1.0)
+        plateau.observe(2.0)  # the third epoch without improvement
+        self.assertEqual(plateau(1.0, 5), 0.5)
+        for loss in [2.0, 2.0, 2.0]:
+            plateau.observe(loss)
+        self.assertEqual(plateau(1.0, 5), 0.3)
+
+        buffer = self.buffer()
+        optimizer = GradientDescent(buffer, 1.0, schedule=StepDecay(1, 0.5))
+        for expected in [[0.0, -2.0, 1.0], [-0.5, -2.5, 0.5]]:
+            buffer.grad[:] = 1.0
+            optimizer.step()
+            np.testing.assert_array_equal(buffer.data, expected)
+        self.assertEqual(optimizer.learning_rate, 0.5)
+
+    def test_clipping(self):
+        """Tests that the step clips the mean gradient it applies."""
+
+        buffer = self.buffer()
+        optimizer = GradientDescent(buffer, 1.0, clip_norm=1.0)
+        buffer.grad[:] = [6.0, 0.0, -8.0]  # mean over 2 samples: norm 5
+        optimizer.step(2)
+        np.testing.assert_allclose(buffer.grad, [0.6, 0.0, -0.8])
+        np.testing.assert_allclose(buffer.data, [0.4, -1.0, 2.8])
+
+        optimizer = Adam(buffer, 0.1, clip_value=0.5)
+        buffer.grad[:] = [3.0, 0.2, -4.0]
+        optimizer.step()
+        np.testing.assert_array_equal(buffer.grad, [0.5, 0.2, -0.5])
+        np.testing.assert_allclose(optimizer.first_moment, [0.05, 0.02, -0.05])
+
+    def test_fit_options(self):
+        """Tests that every fit applies the schedule and the clipping of its optimizer."""
+
+        np.random.seed(0)
+        X, y = self.X, self.y * 100.0  # large gradients
+        model = LinearRegression(3)
+        model.fit(X, y, learning_rate=0.1, num_epochs=50, batch_size=None, regularization_term=0.0,
+                  clip_norm=1.0, schedule=CosineAnnealing(50, 0.01))
+        self.assertLess(np.mean((model.predict(X) - y) ** 2), np.mean(y ** 2))
+        # with clip_norm=1.0 no step is longer than the learning rate
+        before = model.flat_parameters().data.copy()
+        model.fit(X, y, learning_rate=0.1, num_epochs=1, batch_size=None, clip_norm=1.0)
+        self.assertLessEqual(np.linalg.norm(model.flat_parameters().data - before), 0.1 + 1e-12)
+
+        mlp = MLP(3, [8, 1], ['tanh', 'linear'], dense=True)
+        optimizer = Adam(mlp.flat_parameters(), 0.01, schedule=StepDecay(4, 0.5), clip_value=1.0)
+        mlp.fit(X, y, optimizer=optimizer, batch_size=16, epochs=2)
+        self.assertEqual(optimizer.iterations, 8)
+        self.assertEqual(optimizer.learning_rate, 0.005)
+
+    def test_lbfgs(self):
+        """Tests L-BFGS and its Wolfe line search on the Rosenbrock function."""
+
+        buffer = ParameterBuffer([Variable(-1.2), Variable(1.0)])
+
+        def rosenbrock():
+            x, y = buffer.data
+            buffer.grad[:] = [-2 * (1 - x) - 400 * x * (y - x * x), 200 * (y - x * x)]
+            return (1 - x) ** 2 + 100 * (y - x * x) ** 2
+
+        optimizer = make_optimizer('LBFGS', buffer, 0.001)
+        self.assertEqual(optimizer.learning_rate, 1.0)
+        losses = [rosenbrock()]
+        while not optimizer.converged and optimizer.iterations < 100:
+            losses.append(optimizer.step(rosenbrock))
+        self.assertLess(optimizer.iterations, 50)
+        np.testing.assert_allclose(buffer.data, [1.0, 1.0], atol=1e-5)
+        # every step satisfies the sufficient-decrease condition
+        self.assertTrue(all(b <= a for a, b in zip(losses, losses[1:])))
+        self.assertLessEqual(len(optimizer.s), optimizer.history_size)
+        with self.assertRaises(AssertionError):
+            make_optimizer('LBFGS', buffer, 0.001, clip_norm=1.0)
+
+    def test_lbfgs_fit(self):
+        """Tests that fit(optimizer='lbfgs') reaches the optimum in tens of iterations."""
+
+        model = LinearRegression(3)
+        model.fit(self.X, self.y, optimizer='lbfgs', num_epochs=50, regularization_term=0.0)
+        A = np.hstack([self.X, np.ones((len(self.X), 1))])
+        expected = np.linalg.lstsq(A, self.y, rcond=None)[0]
+        np.testing.assert_allclose(model.flat_parameters().data, expected, atol=1e-5)
+
+        labels = (self.y > 0).astype(int).reshape(-1, 1)
+        model = LogisticRegression(3)
+        optimizer = LBFGS(model.flat_parameters())
+        model.fit(self.X, labels, optimizer=optimizer, num_epochs=100)
+        self.assertTrue(optimizer.converged)
+        self.assertLess(optimizer.iterations, 100)
+        sgd = LogisticRegression(3)
+        sgd.fit(self.X, labels, learning_rate=0.1, num_epochs=300)
+        cost = lambda m: np.mean([m.costFunction(m(x), t).data for x, t in zip(self.X, labels)])
+        self.assertLess(cost(model), cost(sgd))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,111 @@
+import unittest
+import sys, os
+import copy
+import numpy as np
+
+# # Get the parent directory
+parent_directory = sys.path[0]  # Assumes the script is in the parent directory
+
+# # Add the parent directory to the Python path
+grandparent_directory = os.path.dirname(parent_directory)
+
+sys.path.append(grandparent_directory)
+
+from src.Gradient.Parallel import DataParallel
+from src.Cost_functions.Cost_functions import CostFunction
+from src.Regression.Linear_Regression import LinearRegression
+from src.Regression.Logistic_Regression import LogisticRegression
+from src.SVM.SVM import SVM
+from src.NNS.Neural_Network import MLP
+
+
+class Test_Parallel(unittest.TestCase):
+    """Tests data-parallel training.
+    1. sharded gradients against the single-process program
+    2. fit(n_jobs=N) against fit() for both kinds of MLP and LinearRegression
+    3. chunked predict() on threads and processes against one program call
+    4. predict() on 0 rows
+    5. predict() on a dense MLP leaves no input or output cached on the layers
+    """
+
+    def setUp(self):
+        """This method recreates the data for each new test."""
+
+        rng = np.random.default_rng(0)
+        self.X = rng.normal(size=(64, 4))
+        self.y = self.X @ np.array([1.0, -2.0, 0.5, 3.0]) + 0.25
+
+    #------------------------------TESTS------------------------------
+    def test_gradients(self):
+        """Tests that the reduced worker gradients equal the program's, for uneven shards too."""
+
+        model = MLP(4, [6, 1], ['tanh', 'linear'])
+        rows = np.random.default_rng(1).permutation(64)[:37]
+        with DataParallel(model, self.X, self.y, CostFunction.sse, n_jobs=3) as workers:
+            for reduction in ('sum', 'mean'):
+                losses, gradients = workers.per_sample_gradients(rows, reduction)
+                expected_losses, expected = model.compile().per_sample_gradients(
+                    self.X[rows], self.y[rows], CostFunction.sse, reduction)
+                np.testing.assert_allclose(losses, expected_losses, rtol=1e-12)
+                np.testing.assert_allclose(gradients, expected, rtol=1e-10, atol=1e-12)
+            # the workers see parameter updates made in the parent
+            model.flat_parameters().data += 0.1
+            _, gradients = workers.per_sample_gradients(rows)
+            _, expected = model.compile().per_sample_gradients(self.X[rows], self.y[rows], CostFunction.sse, 'sum')
+            np.testing.assert_allclose(gradients, expected, rtol=1e-10, atol=1e-12)
+
+    def test_fit(self):
+        """Tests that fit(n_jobs=2) trains to the same parameters as fit()."""
+
+        for model in [MLP(4, [6, 1], ['tanh', 'linear']), MLP(4, [6, 1], ['tanh', 'linear'], dense=True)]:
+            replica = copy.deepcopy(model)
+            np.random.seed(0)
+            model.fit(self.X, self.y, batch_size=16, epochs=2, learning_rate=0.01)
+            np.random.seed(0)
+            replica.fit(self.X, self.y, batch_size=16, epochs=2, learning_rate=0.01, n_jobs=2)
+            np.testing.assert_allclose(replica.flat_parameters().data, model.flat_parameters().data, rtol=1e-10)
+
+        model = LinearRegression(4)
+        replica = copy.deepcopy(model)
+        np.random.seed(0)
+        model.fit(self.X, self.y, learning_rate=0.01, num_epochs=3, batch_size=32)
+        np.random.seed(0)
+        replica.fit(self.X, self.y, learning_rate=0.01, num_epochs=3, batch_size=32, n_jobs=2)
+        np.testing.assert_allclose(replica.flat_parameters().data, model.flat_parameters().data, rtol=1e-10)
+
+    def test_predict(self):
+        """Tests that predict() gives the same array for any chunk size, pool and backend."""
+
+        for model in [LinearRegression(4), LogisticRegression(4, multiclass=True, k=3), SVM(4),
+                      MLP(4, [6, 2], ['tanh', 'sigmoid']), MLP(4, [6, 1], ['relu', 'linear'], dense=True)]:
+            expected = model.forward(self.X) if getattr(model, 'dense', False) else model.compile()(self.X)
+            expected = expected.ravel() if expected.shape[1:] == (1,) else expected
+            for chunk_size, n_jobs, backend in [(None, 1, 'thread'), (10, 1, 'thread'), (7, 3, 'thread'),
+                                                (25, 2, 'process')]:
+                predictions = model.predict(self.X, chunk_size=chunk_size, n_jobs=n_jobs, backend=backend)
+                self.assertIsInstance(predictions, np.ndarray)
+                np.testing.assert_allclose(predictions, expected, rtol=1e-12)
+
+    def test_predict_empty(self):
+        """Tests that predict() on 0 rows returns an empty array of the output shape."""
+
+        for model, shape in [(LinearRegression(4), (0,)), (MLP(4, [6, 2], ['tanh', 'sigmoid']), (0, 2)),
+                             (MLP(4, [6, 3], ['relu', 'linear'], dense=True), (0, 3))]:
+            for chunk_size, n_jobs, backend in [(None, 1, 'thread'), (7, 3, 'thread'), (25, 2, 'process')]:
+                predictions = model.predict(self.X[:0], chunk_size=chunk_size, n_jobs=n_jobs, backend=backend)
+                self.assertIsInstance(predictions, np.ndarray)
+                self.assertEqual(predictions.shape, shape)
+
+    def test_predict_stateless(self):
+        """Tests that chunked predicts of a dense MLP cache nothing on its shared layers."""
+
+        model = MLP(4, [6, 3], ['relu', 'linear'], dense=True)
+        for chunk_size, n_jobs in [(None, 1), (7, 3)]:
+            model.predict(self.X, chunk_size=chunk_size, n_jobs=n_jobs, backend='thread')
+            for layer in model.layers.values():
+                self.assertIsNone(layer._input)
+                self.assertIsNone(layer._output)
+
+
+if __name__ == '__main__':
+    unittest.main()
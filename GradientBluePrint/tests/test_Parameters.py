@@ -0,0 +1,136 @@
+import unittest
+import sys, os
+import numpy as np
+
+# # Get the parent directory
+parent_directory = sys.path[0]  # Assumes the script is in the parent directory
+
+# # Add the parent directory to the Python path
+grandparent_directory = os.path.dirname(parent_directory)
+
+sys.path.append(grandparent_directory)
+
+from src.Gradient.Gradient import Variable, hvp
+from src.Gradient.Tensor import Tensor
+from src.Gradient.Parameters import Parameter, ParameterBuffer
+from src.Gradient.Trace import flatten_parameters
+from src.Optimizers.optimizers import Optimizers
+from src.Regression.Linear_Regression import LinearRegression
+from src.Regression.Logistic_Regression import LogisticRegression
+from src.SVM.SVM import SVM
+from src.NNS.Neural_Network import MLP
+
+
+class Test_Parameters(unittest.TestCase):
+    """Tests the contiguous parameter buffer.
+    1. Parameter and Tensor views into the buffer
+    2. flat_parameters() of every model keeps its predictions
+    3. vectorized optimizer steps against the per-parameter loops
+    4. gradient norm and clipping
+    """
+
+    def setUp(self):
+        """This method recreates the data for each new test."""
+
+        rng = np.random.default_rng(0)
+        self.X = rng.normal(size=(8, 3))
+        self.y = rng.normal(size=8)
+
+    #------------------------------TESTS------------------------------
+    def test_views(self):
+        """Tests that Parameters and Tensors read and write the buffer."""
+
+        a, b, W = Variable(1.0, label='a'), Variable(2.0, label='b'), Tensor(np.ones((2, 2)), label='W')
+        buffer = ParameterBuffer([a, [b], W])
+        pa, (pb,), pW = buffer.parameters
+        self.assertIsInstance(pa, Parameter)
+        self.assertIs(pW, W)
+        np.testing.assert_array_equal(buffer.data, [1.0, 2.0, 1.0, 1.0, 1.0, 1.0])
+
+        (pa * pb + pa).backward()
+        ((W * 3.0).sum()).backward()
+        np.testing.assert_array_equal(buffer.grad, [3.0, 1.0, 3.0, 3.0, 3.0, 3.0])
+        buffer.data += 1.0
+        self.assertEqual((pa.data, pb.data), (2.0, 3.0))
+        np.testing.assert_array_equal(W.data, np.full((2, 2), 2.0))
+        buffer.zero_grad()
+        self.assertEqual(pa.grad, 0.0)
+        self.assertFalse(W.grad.any())
+
+        # second-order gradients go through the Parameters too
+        self.assertEqual(hvp(pa * pa * pb, [pa, pb], [1.0, 0.0]), [2 * pb.data, 2 * pa.data])
+        self.assertFalse(buffer.grad.any())
+
+    def test_models(self):
+        """Tests that flattening a model keeps its outputs and ties them to the buffer."""
+
+        for model in [LinearRegression(3), LogisticRegression(3), LogisticRegression(3, multiclass=True, k=4),
+                      SVM(3), MLP(3, [4, 2], ['tanh', 'sigmoid']), MLP(3, [4, 2], ['tanh', 'sigmoid'], dense=True)]:
+            before = model.compile()(self.X) if not getattr(model, 'dense', False) else model.forward(self.X)
+            flat = model.flat_parameters()
+            self.assertIs(model.flat_parameters(), flat)
+            after = model.compile()(self.X) if not getattr(model, 'dense', False) else model.forward(self.X)
+            np.testing.assert_array_equal(after, before)
+            self.assertEqual(len(flat), sum(np.size(p.data) for p in flatten_parameters(model.parameters())))
+
+            flat.data[-1] += 1.0  # the last bias
+            changed = model.compile()(self.X) if not getattr(model, 'dense', False) else model.forward(self.X)
+            self.assertFalse(np.array_equal(changed, before))
+
+    def test_optimizers(self):
+        """Tests that the vectorized optimizer steps match the loops over parameters."""
+
+        model, reference = LinearRegression(3), LinearRegression(3)
+        for w, r in zip(model.parameters(), reference.parameters()):
+            r.data = w.data
+        gradients = np.arange(1.0, 5.0)
+        model.flat_parameters().grad[:] = gradients
+        for p, g in zip(reference.parameters(), gradients):
+            p.grad = g
+        Optimizers.SGD(model.flat_parameters(), 0.1)
+        Optimizers.SGD(reference.parameters(), 0.1)
+        self.assertEqual([p.data for p in model.parameters()], [p.data for p in reference.parameters()])
+        self.assertFalse(model.flat_parameters().grad.any())
+        self.assertEqual([p.grad for p in reference.parameters()], [0.0] * 4)
+
+        model.flat_parameters().grad[:] = gradients
+        for p, g in zip(reference.parameters(), gradients):
+            p.grad = g
+        Optimizers.batch_gradient_descent(model.flat_parameters(), 0.1, 4)
+        Optimizers.batch_gradient_descent(reference.parameters(), 0.1, 4)
+        self.assertEqual([p.data for p in model.parameters()], [p.data for p in reference.parameters()])
+        self.assertFalse(model.flat_parameters().grad.any())
+
+        # nested lists (multiclass models) are updated by position, whatever the labels
+        nested = [[Variable(1.0, label='w'), Variable(2.0, label='w')], [Variable(3.0, label='w')]]
+        for p, g in zip([p for group in nested for p in group], [1.0, 2.0, 3.0]):
+            p.grad = g
+        Optimizers.SGD(nested, 0.5, batch_size=2)
+        self.assertEqual([[p.data for p in group] for group in nested], [[0.75, 1.5], [2.25]])
+        self.assertEqual([[p.grad for p in group] for group in nested], [[0.0, 0.0], [0.0]])
+
+        # the former SGD(parameters, gradients, learning_rate) calls fail instead of misbinding
+        with self.assertRaises(TypeError):
+            Optimizers.SGD(nested, {'w': 1.0}, 0.5)
+        with self.assertRaises(TypeError):
+            Optimizers.SGD(nested, {'w': 1.0})
+        self.assertEqual([[p.data for p in group] for group in nested], [[0.75, 1.5], [2.25]])
+
+    def test_clipping(self):
+        """Tests the global gradient norm and the two kinds of clipping."""
+
+        buffer = ParameterBuffer([Variable(0.0), Tensor(np.zeros(2))])
+        buffer.grad[:] = [3.0, 0.0, -4.0]
+        self.assertEqual(buffer.grad_norm(), 5.0)
+        self.assertEqual(buffer.clip_grad_norm(10.0), 5.0)
+        np.testing.assert_array_equal(buffer.grad, [3.0, 0.0, -4.0])
+        self.assertEqual(buffer.clip_grad_norm(1.0), 5.0)
+        np.testing.assert_allclose(buffer.grad, [0.6, 0.0, -0.8])
+        buffer.grad[:] = [3.0, 0.5, -4.0]
+        buffer.clip_grad_value(1.0)
+        np.testing.assert_array_equal(buffer.grad, [1.0, 0.5, -1.0])
+        np.testing.assert_array_equal(buffer.parameters[1].grad, [0.5, -1.0])
+
+
+if __name__ == '__main__':
+    unittest.main()
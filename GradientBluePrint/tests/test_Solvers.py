@@ -0,0 +1,147 @@
+import unittest
+import sys, os
+import tempfile
+import numpy as np
+
+# # Get the parent directory
+parent_directory = sys.path[0]  # Assumes the script is in the parent directory
+
+# # Add the parent directory to the Python path
+grandparent_directory = os.path.dirname(parent_directory)
+
+sys.path.append(grandparent_directory)
+
+from src.Regression.Linear_Regression import LinearRegression
+from src.Regression.Solvers import solve_ridge, elastic_net, elastic_net_path, SOLVERS
+
+
+def objective_gradient(model, X, y, regularization_term):
+    """Gradient of the objective fit minimizes: mean sse plus model.regularizer."""
+    flat = model.flat_parameters()
+    flat.zero_grad()
+    model.regularizer(regularization_term).backward()
+    model.compile().per_sample_gradients(X, y, model.costFunction, 'mean', out=flat.grad)
+    gradient = flat.grad.copy()
+    flat.zero_grad()
+    return gradient
+
+
+class Test_Solvers(unittest.TestCase):
+    """Tests the closed-form and coordinate-descent solvers of LinearRegression.
+    1. every solver zeroes the gradient of the regularized objective of fit
+    2. streaming over chunks and a memory-mapped file gives the in-memory solution
+    3. 'svd' on rank-deficient data without regularization
+    4. 'lasso' and 'elasticnet' satisfy the optimality conditions, whatever the order and screening
+    5. the elastic net tends to the ridge solution as l1_ratio goes to 0
+    6. the regularization path starts at w = 0 and matches the single fits
+    """
+
+    def setUp(self):
+        """This method recreates the data for each new test."""
+
+        rng = np.random.default_rng(0)
+        self.X = rng.normal(size=(300, 6)) * np.logspace(0, 2, 6) + 5.0  # off-center, uneven scales
+        self.y = self.X @ rng.normal(size=6) + 3.0 + rng.normal(size=300)
+
+    #------------------------------TESTS------------------------------
+    def test_parity(self):
+        """Tests that the solutions are the optimum of the objective fit minimizes."""
+
+        for regularization_term in [0.0, 0.05, 10.0]:
+            solutions = []
+            for solver in SOLVERS:
+                model = LinearRegression(6)
+                model.fit(self.X, self.y, solver=solver, regularization_term=regularization_term)
+                gradient = objective_gradient(model, self.X, self.y, regularization_term)
+                self.assertLess(np.abs(gradient).max(), 1e-8, (solver, regularization_term))
+                solutions.append(model.flat_parameters().data.copy())
+            np.testing.assert_allclose(solutions[1], solutions[0], rtol=1e-8)
+            np.testing.assert_allclose(solutions[2], solutions[0], rtol=1e-8)
+        np.testing.assert_allclose(model.predict(self.X), self.X @ solutions[0][:-1] + solutions[0][-1])
+
+    def test_streaming(self):
+        """Tests that chunked and memory-mapped data give the same solution."""
+
+        expected = solve_ridge(self.X, self.y, 0.05, 'svd')
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'X.dat')
+            stored = np.memmap(path, dtype=float, mode='w+', shape=self.X.shape)
+            stored[:] = self.X
+            stored.flush()
+            X = np.memmap(path, dtype=float, mode='r', shape=self.X.shape)
+            for solver in SOLVERS:
+                for chunk_size in [4, 37, 1000]:  # fewer rows than columns, uneven, one chunk
+                    w, b = solve_ridge(X, self.y, 0.05, solver, chunk_size)
+                    np.testing.assert_allclose(w, expected[0], rtol=1e-8)
+                    self.assertAlmostEqual(b, expected[1], places=8)
+            del X, stored
+
+        chunks = ((self.X[lo:lo + 50], self.y[lo:lo + 50]) for lo in range(0, 300, 50))
+        model = LinearRegression(6)
+        model.fit(chunks, None, solver='qr')
+        np.testing.assert_allclose(model.flat_parameters().data[:-1], expected[0], rtol=1e-8)
+
+    def test_rank_deficient(self):
+        """Tests the minimum-norm least-squares solution of 'svd' for collinear features."""
+
+        X = np.hstack([self.X[:, :3], self.X[:, :3] * 2.0])
+        w, b = solve_ridge(X, self.y, 0.0, 'svd')
+        Xc = X - X.mean(axis=0)
+        expected = np.linalg.lstsq(Xc, self.y - self.y.mean(), rcond=None)[0]
+        np.testing.assert_allclose(w, expected, rtol=1e-6)
+        self.assertAlmostEqual(b, self.y.mean() - X.mean(axis=0) @ w)
+
+    def test_coordinate_descent(self):
+        """Tests the subgradient optimality conditions of the Lasso and the elastic net."""
+
+        regularization_term = 300.0
+        for solver, l1_ratio in [('lasso', 1.0), ('elasticnet', 0.5)]:
+            model = LinearRegression(6)
+            model.fit(self.X, self.y, solver=solver, regularization_term=regularization_term, l1_ratio=l1_ratio)
+            w = model.flat_parameters().data[:-1].copy()
+            self.assertTrue(0 < np.count_nonzero(w) < 6, (solver, w))
+            # the smooth part of the objective: mean sse plus the L2 share of the penalty
+            gradient = objective_gradient(model, self.X, self.y, regularization_term * (1 - l1_ratio))
+            l1 = regularization_term * l1_ratio / 6
+            nonzero = w != 0
+            np.testing.assert_allclose(gradient[:-1][nonzero], -l1 * np.sign(w[nonzero]), atol=1e-5)
+            self.assertTrue(np.all(np.abs(gradient[:-1][~nonzero]) <= l1 * (1 + 1e-6)))
+            self.assertLess(abs(gradient[-1]), 1e-6)
+
+            for selection in ['cyclic', 'random']:
+                for screening in [True, False]:
+                    other, _ = elastic_net(self.X, self.y, regularization_term, l1_ratio, selection, screening, tol=1e-10)
+                    np.testing.assert_allclose(other, w, rtol=1e-5, atol=1e-8)
+
+    def test_ridge_limit(self):
+        """Tests that a vanishing L1 share gives the ridge solution."""
+
+        expected, _ = solve_ridge(self.X, self.y, 50.0, 'cholesky')
+        w, _ = elastic_net(self.X, self.y, 50.0, l1_ratio=1e-9, tol=1e-12, max_sweeps=100000)
+        np.testing.assert_allclose(w, expected, rtol=1e-4)
+
+    def test_path(self):
+        """Tests the warm-started path on sparse data with many features."""
+
+        rng = np.random.default_rng(1)
+        X = rng.normal(size=(100, 200))
+        y = X[:, :5] @ np.array([4.0, -3.0, 2.0, -1.5, 1.0]) + 0.1 * rng.normal(size=100)
+        terms, weights, biases = elastic_net_path(X, y, n_terms=20)
+        self.assertEqual(weights.shape, (20, 200))
+        self.assertTrue(np.all(np.diff(terms) < 0))
+        self.assertLess(np.abs(weights[0]).max(), 1e-12)  # w = 0 up to rounding at the largest term
+        self.assertEqual(set(np.flatnonzero(weights[-1])[:5]), set(range(5)))
+        for k in [5, 12, 19]:
+            w, b = elastic_net(X, y, terms[k], screening=False, tol=1e-10)
+            np.testing.assert_allclose(weights[k], w, atol=1e-5)
+            self.assertAlmostEqual(biases[k], b, places=5)
+
+        model = LinearRegression(200)
+        path = model.fit(X, y, solver='lasso', regularization_term=terms[[19, 5, 12]])
+        np.testing.assert_allclose(path[0], terms[[5, 12, 19]])
+        np.testing.assert_allclose(model.flat_parameters().data[:-1], weights[19], atol=1e-5)
+        self.assertIsNone(model.fit(X, y, solver='lasso', regularization_term=terms[5]))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,178 @@
+import unittest
+import gc
+import weakref
+import sys, os
+import numpy as np
+
+# # Get the parent directory
+parent_directory = sys.path[0]  # Assumes the script is in the parent directory
+
+# # Add the parent directory to the Python path
+grandparent_directory = os.path.dirname(parent_directory)
+
+sys.path.append(grandparent_directory)
+
+from src.Gradient.Gradient import Variable
+from src.Gradient.Tensor import Tensor
+from src.Regression.Linear_Regression import LinearRegression
+from src.Regression.Logistic_Regression import LogisticRegression
+
+
+def numerical_gradient(f, x, eps=1e-6):
+    """Central finite differences of the scalar function f at the array x."""
+    grad = np.zeros_like(x)
+    for i in np.ndindex(x.shape):
+        old = x[i]
+        x[i] = old + eps; up = f(x)
+        x[i] = old - eps; down = f(x)
+        x[i] = old
+        grad[i] = (up - down) / (2 * eps)
+    return grad
+
+
+class Test_Tensor(unittest.TestCase):
+    """Tests the following functions of Tensor class.
+    1. broadcasting arithmetic (+, -, *, /, **)
+    2. __matmul__()
+    3. sum() / mean()
+    4. exp() / log()
+    5. activations
+    6. batched model forward passes
+    7. graph release after backward()
+    8. backward() twice, with retain_graph and after the graph is freed
+    """
+
+    def setUp(self):
+        """This method recreates arrays for each new test."""
+
+        rng = np.random.default_rng(0)
+        self.A = rng.uniform(0.5, 1.5, (4, 3))
+        self.B = rng.uniform(0.5, 1.5, (3,))
+
+    def check_gradient(self, f, *arrays):
+        """Compares Tensor gradients of the scalar f against finite differences."""
+
+        tensors = [Tensor(a.copy()) for a in arrays]
+        f(*tensors).backward()
+        for k, (tensor, array) in enumerate(zip(tensors, arrays)):
+            def f_k(x):
+                args = [Tensor(a) for a in arrays]
+                args[k] = Tensor(x)
+                return float(f(*args).data)
+            np.testing.assert_allclose(tensor.grad, numerical_gradient(f_k, array.copy()), rtol=1e-5, atol=1e-7)
+
+    #------------------------------TESTS------------------------------
+    def test_arithmetic(self):
+        """Tests broadcasting arithmetic gradients."""
+
+        self.check_gradient(lambda a, b: (a + b).sum(), self.A, self.B)
+        self.check_gradient(lambda a, b: (a - b).sum(), self.A, self.B)
+        self.check_gradient(lambda a, b: (a * b).sum(), self.A, self.B)
+        self.check_gradient(lambda a, b: (a / b).sum(), self.A, self.B)
+        self.check_gradient(lambda a: (a ** 3).mean(), self.A)
+        self.check_gradient(lambda a: (2 - a / 3).sum(), self.A)
+
+    def test_matmul(self):
+        """Tests __matmul__() function."""
+
+        C = np.random.default_rng(1).normal(size=(3, 2))
+        self.check_gradient(lambda a, b: (a @ b).sum(), self.A, self.B)
+        self.check_gradient(lambda a, c: ((a @ c) ** 2).sum(), self.A, C)
+        self.check_gradient(lambda b, c: (b @ c).sum(), self.B, C)
+
+    def test_reductions(self):
+        """Tests sum() and mean() over an axis."""
+
+        self.check_gradient(lambda a: (a.sum(axis=0) ** 2).sum(), self.A)
+        self.check_gradient(lambda a: (a.mean(axis=1) ** 2).sum(), self.A)
+
+    def test_exp_log(self):
+        """Tests exp() and log() functions."""
+
+        self.check_gradient(lambda a: a.exp().sum(), self.A)
+        self.check_gradient(lambda a: a.log().sum(), self.A)
+
+    def test_activations(self):
+        """Tests the activation functions against finite differences."""
+
+        for name in ['sigmoid', 'tanh', 'relu', 'leaky_relu']:
+            self.check_gradient(lambda a: (getattr(a, name)() * a).sum(), self.A - 1.0)
+        W = np.random.default_rng(2).normal(size=(4, 3))
+        self.check_gradient(lambda a: (a.softmax() * Tensor(W)).sum(), self.A)
+        np.testing.assert_allclose(Tensor(self.A).softmax().data.sum(axis=1), np.ones(4))
+
+    def test_from_variables(self):
+        """Tests that gradients flow back into packed Variables."""
+
+        w = [Variable(1.0), Variable(-2.0), Variable(0.5)]
+        (Tensor(self.A) @ Tensor.from_variables(w)).sum().backward()
+        np.testing.assert_allclose([v.grad for v in w], self.A.sum(axis=0))
+
+    def test_linear_regression_batch(self):
+        """Tests a batched LinearRegression forward pass against the scalar one."""
+
+        model = LinearRegression(3)
+        batch = model(Tensor(self.A))
+        self.assertEqual(batch.shape, (4,))
+        np.testing.assert_allclose(batch.data, [model(x).data for x in self.A])
+
+        ((batch - 1.0) ** 2).sum().backward()
+        batch_grads = [p.grad for p in model.parameters()]
+        for p in model.parameters():
+            p.grad = 0.0
+        sum(((model(x) - 1.0) ** 2 for x in self.A), Variable(0)).backward()
+        np.testing.assert_allclose(batch_grads, [p.grad for p in model.parameters()])
+
+    def test_logistic_regression_batch(self):
+        """Tests a batched multiclass LogisticRegression forward pass against the scalar one."""
+
+        model = LogisticRegression(3, multiclass=True, k=4)
+        batch = model(Tensor(self.A))
+        self.assertEqual(batch.shape, (4, 4))
+        np.testing.assert_allclose(batch.data, [[v.data for v in model(x)] for x in self.A])
+
+    def test_graph_release(self):
+        """Tests that a graph is freed by reference counting alone."""
+
+        w = Tensor(self.B)
+        gc.disable()
+        try:
+            hidden = Tensor(self.A) @ w
+            hidden_ref = weakref.ref(hidden)
+            loss = (hidden.exp() * 2.0).sum()
+            del hidden
+            loss.backward()
+            self.assertIsNone(hidden_ref())  # unlinked although `loss` is alive
+
+            hidden = Tensor(self.A) @ w
+            hidden_ref = weakref.ref(hidden)
+            loss = hidden.sum()
+            del hidden
+            loss.backward(retain_graph=True)
+            self.assertIsNotNone(hidden_ref())
+            del loss
+            self.assertIsNone(hidden_ref())  # no reference cycle keeps it alive
+        finally:
+            gc.enable()
+
+    def test_backward_twice(self):
+        """Tests that a retained graph gives the same gradients again and a freed one raises."""
+
+        w = Tensor([3.0, 4.0])
+        hidden = w * 2.0
+        loss = (hidden * hidden).sum()
+        loss.backward(retain_graph=True)
+        np.testing.assert_allclose(w.grad, [24.0, 32.0])
+        w.grad = np.zeros(2)
+        loss.backward(retain_graph=True)
+        np.testing.assert_allclose(w.grad, [24.0, 32.0])  # intermediate gradients are not counted twice
+
+        loss.backward()
+        with self.assertRaisesRegex(RuntimeError, "graph already freed"):
+            (hidden + 1.0).sum().backward()
+        with self.assertRaisesRegex(RuntimeError, "graph already freed"):
+            loss.backward()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,185 @@
+import unittest
+import sys, os
+import numpy as np
+
+# # Get the parent directory
+parent_directory = sys.path[0]  # Assumes the script is in the parent directory
+
+# # Add the parent directory to the Python path
+grandparent_directory = os.path.dirname(parent_directory)
+
+sys.path.append(grandparent_directory)
+
+from src.Gradient.Trace import trace, flatten_parameters
+from src.Regression.Linear_Regression import LinearRegression
+from src.Regression.Logistic_Regression import LogisticRegression
+from src.SVM.SVM import SVM
+from src.NNS.Neural_Network import MLP
+
+
+def dynamic_gradients(model, X, y, cost_function, penalty=lambda: 0.0):
+    """Per-sample parameter gradients and losses from the scalar graph, shape (n_params, batch)."""
+    parameters = flatten_parameters(model.parameters())
+    gradients, losses = [], []
+    for x, y_ in zip(X, y):
+        loss = cost_function(model(x), y_) + penalty()
+        loss.backward()
+        losses.append(loss.data)
+        gradients.append([p.grad for p in parameters])
+        for p in parameters:
+            p.grad = 0.0
+    return np.array(gradients).T, np.array(losses)
+
+
+def compiled_gradients(model, X, y, cost_function, penalty=None):
+    """Per-sample parameter gradients and losses from the compiled program."""
+    program = model.compile()
+    program.forward(X)
+    losses, upstream = program.loss(cost_function, y)
+    gradients = program.backward(upstream)
+    if penalty is not None:
+        penalty = penalty()
+        penalty.backward()
+        parameters = flatten_parameters(model.parameters())
+        gradients = gradients + np.array([[p.grad] for p in parameters])
+        losses = losses + penalty.data
+        for p in parameters:
+            p.grad = 0.0
+    return gradients, losses
+
+
+class Test_Trace(unittest.TestCase):
+    """Tests the compiled `Program` against the dynamic Variable graph.
+    1. forward values
+    2. per-sample gradients (bit-for-bit for the regression models)
+    3. fit() and predict() on the compiled path
+    4. per_sample_gradients(), reduced and accumulated in place
+    5. tracing part of a softmax
+    6. a later softmax output used before output 0
+    """
+
+    def setUp(self):
+        """This method recreates the data for each new test."""
+
+        rng = np.random.default_rng(0)
+        self.X = rng.normal(size=(16, 4))
+        self.y = self.X @ np.array([1.0, -2.0, 0.5, 3.0]) + 0.25
+        self.labels = (self.y > 0).astype(int).reshape(-1, 1)
+        self.classes = rng.integers(0, 3, size=(16, 1))
+
+    #------------------------------TESTS------------------------------
+    def test_forward(self):
+        """Tests that the program reproduces the scalar forward pass."""
+
+        model = MLP(4, [5, 3], ['tanh', 'sigmoid'])
+        program = trace(model, 4)
+        expected = [[v.data for v in model(list(x))] for x in self.X]
+        np.testing.assert_allclose(program(self.X), expected, rtol=1e-12)
+
+    def test_linear_regression_parity(self):
+        """Tests bit-for-bit per-sample gradient parity for LinearRegression."""
+
+        model = LinearRegression(4)
+        penalty = lambda: model.regularizer(0.05)
+        expected, expected_losses = dynamic_gradients(model, self.X, self.y, model.costFunction, penalty)
+        actual, losses = compiled_gradients(model, self.X, self.y, model.costFunction, penalty)
+        np.testing.assert_array_equal(actual, expected)
+        np.testing.assert_array_equal(losses, expected_losses)
+
+    def test_logistic_regression_parity(self):
+        """Tests per-sample gradient parity for binary and multiclass LogisticRegression."""
+
+        model = LogisticRegression(4)
+        expected, _ = dynamic_gradients(model, self.X, self.labels, model.costFunction)
+        actual, _ = compiled_gradients(model, self.X, self.labels, model.costFunction)
+        np.testing.assert_allclose(actual, expected, rtol=1e-12, atol=1e-15)
+
+        model = LogisticRegression(4, multiclass=True, k=3)
+        expected, _ = dynamic_gradients(model, self.X, self.classes, model.costFunction)
+        actual, _ = compiled_gradients(model, self.X, self.classes, model.costFunction)
+        np.testing.assert_allclose(actual, expected, rtol=1e-12, atol=1e-15)
+
+    def test_mlp_parity(self):
+        """Tests per-sample gradient parity for an MLP."""
+
+        model = MLP(4, [6, 1], ['relu', 'linear'])
+        cost = lambda y_hat, y_: (y_hat - y_) ** 2
+        expected, _ = dynamic_gradients(model, self.X, self.y, cost)
+        actual, _ = compiled_gradients(model, self.X, self.y, cost)
+        np.testing.assert_allclose(actual, expected, rtol=1e-12, atol=1e-15)
+
+    def test_fit_and_predict(self):
+        """Tests that fit() trains through the compiled program and predict() uses it."""
+
+        model = LinearRegression(4)
+        before = np.mean((model.predict(self.X) - self.y) ** 2)
+        model.fit(self.X, self.y, learning_rate=0.05, num_epochs=50, batch_size=8, regularization_term=0.0)
+        after = np.mean((model.predict(self.X) - self.y) ** 2)
+        self.assertLess(after, before)
+
+        model.fit(self.X, self.y, learning_rate=0.01, num_epochs=2, batch_size=None,
+                  optimizer='batch_gradient_descent')
+        LogisticRegression(4, multiclass=True, k=3).fit(self.X, self.classes, num_epochs=2, optimizer='BGD')
+        SVM(4).fit(self.X, np.sign(self.y), num_epochs=2)
+
+    def test_per_sample_gradients(self):
+        """Tests the (batch, n_params) layout and the reductions of per_sample_gradients()."""
+
+        model = LogisticRegression(4, multiclass=True, k=3)
+        expected, expected_losses = dynamic_gradients(model, self.X, self.classes, model.costFunction)
+        program = model.compile()
+        losses, gradients = program.per_sample_gradients(self.X, self.classes, model.costFunction)
+        self.assertEqual(gradients.shape, (len(self.X), len(program.parameters)))
+        np.testing.assert_allclose(gradients, expected.T, rtol=1e-12, atol=1e-15)
+        np.testing.assert_allclose(losses, expected_losses, rtol=1e-12)
+
+        _, mean = program.per_sample_gradients(self.X, self.classes, model.costFunction, reduction='mean')
+        np.testing.assert_allclose(mean, expected.mean(axis=1), rtol=1e-12, atol=1e-15)
+        _, total = program.per_sample_gradients(self.X, self.classes, model.costFunction, reduction='sum')
+        np.testing.assert_allclose(total, expected.sum(axis=1), rtol=1e-12, atol=1e-15)
+
+        # reduced gradients accumulated in place into the flat gradient buffer
+        flat = model.flat_parameters()
+        flat.grad[:] = 1.0
+        _, out = model.compile().per_sample_gradients(self.X, self.classes, model.costFunction, 'sum', out=flat.grad)
+        self.assertIs(out, flat.grad)
+        np.testing.assert_allclose(flat.grad, 1.0 + expected.sum(axis=1), rtol=1e-12, atol=1e-15)
+
+    def test_partial_softmax(self):
+        """Tests that a model returning only some outputs of a softmax is rejected."""
+
+        class FirstTwo:
+            def __init__(self):
+                self.model = LogisticRegression(4, multiclass=True, k=3)
+
+            def parameters(self):
+                return self.model.parameters()
+
+            def __call__(self, x):
+                return self.model(x)[:2]
+
+        with self.assertRaisesRegex(ValueError, "every output of a traced softmax"):
+            trace(FirstTwo(), 4)
+
+    def test_softmax_order(self):
+        """Tests a model whose graph reaches a later softmax output before output 0."""
+
+        class Scaled:
+            def __init__(self):
+                self.model = LogisticRegression(4, multiclass=True, k=2)
+
+            def parameters(self):
+                return self.model.parameters()
+
+            def __call__(self, x):
+                t = self.model(x)
+                return [t[0], t[1] * 2.0]  # the product runs before the node of t[0]
+
+        model = Scaled()
+        program = trace(model, 4)
+        expected = [[v.data for v in model(x)] for x in self.X]
+        np.testing.assert_allclose(program(self.X), expected, rtol=1e-12)
+
+
+if __name__ == '__main__':
+    unittest.main()